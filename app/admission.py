@@ -0,0 +1,283 @@
+"""Adaptive admission control: shed excess load before it piles up.
+
+When the database slows down, each request holds its thread and connection
+longer. New requests queue behind them and latency grows for everyone.
+``AdmissionControlMiddleware`` caps the requests in flight in this process
+with a limit that adapts to the observed latency (AIMD):
+
+- a request that finishes within ``ADMISSION_LATENCY_TARGET_SECONDS`` while
+  the limit is at least half used adds ``1 / limit`` (about +1 per full
+  window of requests)
+- a slower request or a 5xx multiplies the limit by ``ADMISSION_BACKOFF``, at
+  most once per latency target so one slow burst is not counted many times
+
+Latency is measured to the response headers, so a slow client downloading
+a streamed body is not mistaken for a slow server. Heavy calls (lists,
+exports, bulk writes, imports) are expected to be slow and only back the
+limit off when they fail.
+
+Requests are classified by route. A class may fill only its ``share`` of the
+limit, so heavy list/export/bulk calls are turned away first and auth and
+single-item reads keep some headroom. A request over its share waits up to
+its class's ``max_wait`` for a slot (higher shares are served first) and is
+then answered with 503 and ``Retry-After``. A request holds its slot until
+its response body has been sent, so a streamed export counts for as long as
+it streams. Health, readiness, metrics and version endpoints are never
+queued or shed.
+
+The starting, minimum and maximum limits scale with the threadpool size
+(``app.capacity``) and can be overridden with ``ADMISSION_INITIAL_LIMIT``,
+``ADMISSION_MIN_LIMIT`` and ``ADMISSION_MAX_LIMIT``. ``/api/metrics``
+exports ``admission_limit``, ``admission_in_flight[_<class>]`` and
+``admission_waiting`` gauges, ``admission_shed[_<class>]_total`` and
+``admission_limit_decreases_total`` counters and
+``admission_queue_wait_<class>_seconds`` durations. State is per process.
+Set ``ADMISSION_ENABLED=false`` to turn it off.
+"""
+
+import asyncio
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .capacity import plan_capacity
+from .metrics import metrics
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+ADMISSION_LATENCY_TARGET_SECONDS = float(
+    os.getenv("ADMISSION_LATENCY_TARGET_SECONDS", "0.5")
+)
+ADMISSION_BACKOFF = float(os.getenv("ADMISSION_BACKOFF", "0.9"))
+
+
+@dataclass(frozen=True)
+class RouteClass:
+    name: str
+    # Fraction of the limit requests of this class may fill
+    share: float
+    # Seconds a request may wait for a slot before it is shed
+    max_wait: float
+    # Whether a slow (not failed) request of this class backs the limit off
+    latency_sensitive: bool = True
+
+
+ROUTE_CLASSES = {
+    "auth": RouteClass("auth", share=1.0, max_wait=1.0),
+    "read": RouteClass("read", share=0.9, max_wait=0.5),
+    "write": RouteClass("write", share=0.9, max_wait=0.5),
+    "heavy": RouteClass("heavy", share=0.6, max_wait=0.1, latency_sensitive=False),
+}
+
+EXEMPT_PATHS = {"/api/health", "/api/ready", "/api/metrics", "/api/version"}
+_HEAVY_READS = re.compile(r"^/api/customers(/\d+/notes(/export)?)?/?$")
+_HEAVY_WRITES = re.compile(r"^/api/(customers/bulk|notes/bulk|import/[^/]+)/?$")
+
+
+def classify(method: str, path: str) -> RouteClass | None:
+    """Route class of a request; None for endpoints that are never shed."""
+    if path in EXEMPT_PATHS:
+        return None
+    if path.startswith("/api/auth/"):
+        return ROUTE_CLASSES["auth"]
+    if method in ("GET", "HEAD"):
+        heavy = _HEAVY_READS.match(path)
+        return ROUTE_CLASSES["heavy" if heavy else "read"]
+    heavy = method == "POST" and _HEAVY_WRITES.match(path)
+    return ROUTE_CLASSES["heavy" if heavy else "write"]
+
+
+class _Waiter:
+    def __init__(self, route_class: RouteClass):
+        self.route_class = route_class
+        self.admitted = False
+        self.future = asyncio.get_running_loop().create_future()
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class AdmissionController:
+    """AIMD concurrency limit shared by the requests of one process."""
+
+    def __init__(
+        self,
+        initial_limit: float,
+        min_limit: float,
+        max_limit: float,
+        latency_target: float = ADMISSION_LATENCY_TARGET_SECONDS,
+        backoff: float = ADMISSION_BACKOFF,
+    ):
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        # TestClient may run requests on several event loops at once
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.limit = float(self.initial_limit)
+            self.in_flight = 0
+            self._in_flight_by_class = {name: 0 for name in ROUTE_CLASSES}
+            self._waiters: list[_Waiter] = []
+            self._last_decrease = 0.0
+
+    def _fits(self, route_class: RouteClass) -> bool:
+        return self.in_flight < max(1.0, self.limit * route_class.share)
+
+    def _admit(self, route_class: RouteClass) -> None:
+        self.in_flight += 1
+        self._in_flight_by_class[route_class.name] += 1
+
+    def _publish(self) -> None:
+        metrics.set_gauge("admission_limit", round(self.limit, 2))
+        metrics.set_gauge("admission_in_flight", self.in_flight)
+        metrics.set_gauge("admission_waiting", len(self._waiters))
+        for name, count in self._in_flight_by_class.items():
+            metrics.set_gauge(f"admission_in_flight_{name}", count)
+
+    async def acquire(self, route_class: RouteClass) -> bool:
+        """Take a slot, waiting up to the class's ``max_wait``; False if shed."""
+        with self._lock:
+            if self._fits(route_class):
+                self._admit(route_class)
+                self._publish()
+                return True
+            waiter = _Waiter(route_class)
+            self._waiters.append(waiter)
+            self._publish()
+
+        start = time.perf_counter()
+        try:
+            await asyncio.wait([waiter.future], timeout=route_class.max_wait)
+        except asyncio.CancelledError:
+            # Client went away while queued: give back a slot handed to us
+            with self._lock:
+                if waiter.admitted:
+                    self._free(route_class)
+                else:
+                    self._waiters.remove(waiter)
+                self._publish()
+            raise
+        with self._lock:
+            # A slot handed over right at the timeout still counts
+            if not waiter.admitted:
+                self._waiters.remove(waiter)
+                self._publish()
+        metrics.record_duration(
+            f"admission_queue_wait_{route_class.name}_seconds",
+            time.perf_counter() - start,
+        )
+        if not waiter.admitted:
+            metrics.increment("admission_shed_total")
+            metrics.increment(f"admission_shed_{route_class.name}_total")
+        return waiter.admitted
+
+    def _free(self, route_class: RouteClass) -> None:
+        self.in_flight -= 1
+        self._in_flight_by_class[route_class.name] -= 1
+        # Hand free slots to waiters, highest share first, FIFO within one
+        self._waiters.sort(key=lambda w: -w.route_class.share)
+        while self._waiters and self._fits(self._waiters[0].route_class):
+            waiter = self._waiters.pop(0)
+            waiter.admitted = True
+            self._admit(waiter.route_class)
+            waiter.future.get_loop().call_soon_threadsafe(_wake, waiter.future)
+
+    def release(self, route_class: RouteClass, latency: float, failed: bool) -> None:
+        """Free a slot and adapt the limit to how the request went."""
+        slow = route_class.latency_sensitive and latency > self.latency_target
+        with self._lock:
+            now = time.monotonic()
+            if failed or slow:
+                if now - self._last_decrease >= self.latency_target:
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self._last_decrease = now
+                    metrics.increment("admission_limit_decreases_total")
+            elif self.in_flight >= self.limit / 2:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._free(route_class)
+            self._publish()
+
+
+def _default_controller() -> AdmissionController:
+    # Requests past the threadpool size queue for a thread; allow some of
+    # that queue, but not an unbounded one
+    tokens = plan_capacity().threadpool_tokens
+    return AdmissionController(
+        initial_limit=float(os.getenv("ADMISSION_INITIAL_LIMIT", str(2 * tokens))),
+        min_limit=float(os.getenv("ADMISSION_MIN_LIMIT", str(max(2, tokens // 2)))),
+        max_limit=float(os.getenv("ADMISSION_MAX_LIMIT", str(4 * tokens))),
+    )
+
+
+controller = _default_controller()
+
+
+class AdmissionControlMiddleware:
+    """Admit requests through an ``AdmissionController``; 503 when shed."""
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController = controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route_class = classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.controller.acquire(route_class):
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={
+                    "error": "Service Overloaded",
+                    "message": "The server is busy. Please retry shortly.",
+                    "retry_after": 1,
+                },
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        latency = None
+        failed = True
+        client_gone = False
+
+        async def send_timed(message: Message) -> None:
+            nonlocal latency, failed, client_gone
+            if message["type"] == "http.response.start":
+                # Time to headers: the body's download speed is the client's
+                latency = time.perf_counter() - start
+                failed = message["status"] >= 500
+            try:
+                await send(message)
+            except Exception:
+                client_gone = True
+                raise
+
+        # The slot is held until the body has been sent, and released
+        # however the app or the client stopped
+        try:
+            await self.app(scope, receive, send_timed)
+        except Exception:
+            failed = failed or not client_gone
+            raise
+        finally:
+            if latency is None:
+                latency = time.perf_counter() - start
+            self.controller.release(route_class, latency, failed)
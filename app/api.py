@@ -1,9 +1,13 @@
 # app/api.py
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 
 from .routers.customers import router as customers_router
 from .routers.notes import router as notes_router
 from .routers.auth import router as auth_router
+from .routers.imports import router as imports_router
+from .capacity import current_capacity
+from .warmup import is_ready
 
 router = APIRouter()
 
@@ -13,11 +17,24 @@ def health():
     return {"status": "ok"}
 
 
+@router.get("/ready")
+def ready():
+    """200 once this worker has warmed up, 503 while starting or stopping."""
+    if not is_ready():
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready"}
+
+
 @router.get("/version")
 def version():
-    return {"version": "0.1.15", "features": ["customers", "notes", "auth"]}
+    return {
+        "version": "0.1.15",
+        "features": ["customers", "notes", "auth"],
+        "capacity": current_capacity().as_dict(),
+    }
 
 
 router.include_router(customers_router)  # -> /api/customers/...
 router.include_router(notes_router)  # -> /api/customers/{id}/notes, /api/notes/{id}
 router.include_router(auth_router)  # -> /api/auth/...
+router.include_router(imports_router)  # -> /api/import/{kind}
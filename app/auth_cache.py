@@ -0,0 +1,105 @@
+"""Per-process caches for authenticated-user resolution.
+
+Every authenticated request used to verify the JWT signature and load the
+user row. Both results are cached here:
+
+- verified token payloads, keyed by the raw token, until the token's ``exp``
+- resolved users (``UserOut``), keyed by user id, for ``USER_CACHE_TTL_SECONDS``
+
+Writes to a user go through ``invalidate_user`` (see ``user_repo``). The caches
+are per worker process, so a change made in another process is seen here
+after at most the TTL.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+from .metrics import metrics
+from .schemas.user import UserOut
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe LRU cache whose entries also expire after a per-entry TTL."""
+
+    def __init__(self, name: str, max_size: int):
+        self.name = name
+        self.max_size = max_size
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                value = entry[1]
+            else:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                value = None
+            hit_rate = self.hits / (self.hits + self.misses)
+        metrics.increment(f"{self.name}_{'hits' if value is not None else 'misses'}")
+        metrics.set_gauge(f"{self.name}_hit_rate", hit_rate)
+        return value
+
+    def set(self, key: K, value: V, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_users: TTLCache[int, UserOut] = TTLCache("auth_user_cache", USER_CACHE_MAX_SIZE)
+_tokens: TTLCache[str, dict] = TTLCache("auth_token_cache", TOKEN_CACHE_MAX_SIZE)
+
+
+def get_cached_user(user_id: int) -> UserOut | None:
+    return _users.get(user_id)
+
+
+def cache_user(user: UserOut) -> None:
+    _users.set(user.id, user, USER_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop a user after it changed (e.g. deactivated) so the next request reloads it."""
+    _users.pop(user_id)
+
+
+def get_cached_token_payload(token: str) -> dict | None:
+    return _tokens.get(token)
+
+
+def cache_token_payload(token: str, payload: dict) -> None:
+    # Never serve a payload past the token's own expiry
+    _tokens.set(token, payload, payload.get("exp", 0) - time.time())
+
+
+def clear_auth_caches() -> None:
+    _users.clear()
+    _tokens.clear()
@@ -0,0 +1,169 @@
+"""Per-process concurrency: API workers, threadpool tokens and DB connections.
+
+Sync endpoints (and every ``run_in_threadpool`` call) run on AnyIO's default
+threadpool, which allows 40 threads per process. The SQLAlchemy pool allows
+``DB_POOL_SIZE + DB_MAX_OVERFLOW`` connections (5 + 10). With the defaults, up
+to 25 threads can hold a threadpool slot while they wait on a pool checkout
+and then fail with a checkout timeout. Meanwhile requests that need no
+database wait behind them for a slot.
+
+Here both limits come from one plan. The threadpool gets as many tokens as
+the pool has connections, minus the connections reserved for other users in
+the process: the in-process job worker, when ``RUN_JOB_WORKER`` is on. Past
+that point requests queue for a thread, which is cheap, instead of
+for a connection, which times out.
+
+Settings (environment):
+
+- ``DB_POOL_SIZE`` / ``DB_MAX_OVERFLOW``: connections kept open / opened on
+  demand, per process (5 / 10)
+- ``DB_POOL_TIMEOUT``: seconds a checkout may wait before failing (30)
+- ``THREADPOOL_TOKENS``: override the derived threadpool size
+- ``WEB_CONCURRENCY``: API worker processes (see ``app.server``); the CPUs
+  this container may use by default
+- ``PASSWORD_HASH_WORKERS``: bcrypt processes per API worker (see
+  ``app.password_pool``); by default the container's CPUs divided among the
+  API workers, at least 1, so all workers together spawn about one per CPU
+
+The plan is applied by the app lifespan. It is logged at startup and
+reported under ``capacity`` in ``/api/version`` and as ``capacity_*`` gauges
+in ``/api/metrics``.
+``total_db_connections`` is what all workers of one container may open
+together: keep it below Postgres' ``max_connections`` divided by the number
+of containers.
+"""
+
+import logging
+import math
+import os
+from dataclasses import asdict, dataclass
+
+import anyio.to_thread
+
+from .metrics import metrics
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+THREADPOOL_TOKENS = os.getenv("THREADPOOL_TOKENS")
+PASSWORD_HASH_WORKERS = os.getenv("PASSWORD_HASH_WORKERS")
+
+logger = logging.getLogger(__name__)
+
+
+def _cgroup_cpu_quota() -> float | None:
+    """CPUs allowed by the cgroup CPU quota (v2, then v1), if one is set."""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_cpus() -> int:
+    """CPUs this process can actually use: affinity capped by cgroup quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
+
+
+def default_workers() -> int:
+    value = os.getenv("WEB_CONCURRENCY")
+    return int(value) if value else available_cpus()
+
+
+@dataclass(frozen=True)
+class Capacity:
+    """The concurrency envelope of one API worker process, and of all of them."""
+
+    workers: int
+    threadpool_tokens: int
+    db_pool_size: int
+    db_max_overflow: int
+    db_pool_timeout: float
+    reserved_db_connections: int
+    password_hash_workers: int
+
+    @property
+    def db_connections_per_worker(self) -> int:
+        return self.db_pool_size + self.db_max_overflow
+
+    @property
+    def total_db_connections(self) -> int:
+        return self.workers * self.db_connections_per_worker
+
+    def as_dict(self) -> dict:
+        return dict(
+            asdict(self),
+            db_connections_per_worker=self.db_connections_per_worker,
+            total_db_connections=self.total_db_connections,
+        )
+
+
+def plan_capacity(reserved_db_connections: int = 0) -> Capacity:
+    """Size the threadpool to the connections request threads can get."""
+    if THREADPOOL_TOKENS:
+        tokens = int(THREADPOOL_TOKENS)
+    else:
+        tokens = DB_POOL_SIZE + DB_MAX_OVERFLOW - reserved_db_connections
+    workers = default_workers()
+    if PASSWORD_HASH_WORKERS:
+        hash_workers = int(PASSWORD_HASH_WORKERS)
+    else:
+        # Every API worker has its own pool: share the CPUs out between them
+        hash_workers = max(1, available_cpus() // workers)
+    return Capacity(
+        workers=workers,
+        threadpool_tokens=max(1, tokens),
+        db_pool_size=DB_POOL_SIZE,
+        db_max_overflow=DB_MAX_OVERFLOW,
+        db_pool_timeout=DB_POOL_TIMEOUT,
+        reserved_db_connections=reserved_db_connections,
+        password_hash_workers=hash_workers,
+    )
+
+
+_current: Capacity | None = None
+
+
+def apply_capacity(capacity: Capacity) -> None:
+    """
+    Resize the running event loop's default threadpool to ``capacity``.
+
+    Must be called from the event loop (the app lifespan): the limiter is
+    per loop.
+    """
+    global _current
+    anyio.to_thread.current_default_thread_limiter().total_tokens = (
+        capacity.threadpool_tokens
+    )
+    _current = capacity
+    envelope = capacity.as_dict()
+    for name, value in envelope.items():
+        metrics.set_gauge(f"capacity_{name}", value)
+    logger.info(
+        "Capacity: " + ", ".join(f"{name}={value}" for name, value in envelope.items())
+    )
+
+
+def current_capacity() -> Capacity:
+    """The applied plan, or the default one before the lifespan has run."""
+    return _current or plan_capacity()
@@ -0,0 +1,40 @@
+"""Hooks fired by the repositories after a write has committed.
+
+The data layer announces what changed; it does not know who cares. Caches
+of the API process connect their invalidation to these hooks when they are
+imported (see ``response_cache``). In the job worker and in scripts nothing
+is connected and firing a hook does nothing: those processes hold no cached
+responses, and the caches of API processes expire after their TTL.
+
+    change_hooks.customer_changed.connect(invalidate_customer)
+    change_hooks.customer_changed(customer_id)  # in a repository
+"""
+
+from typing import Callable
+
+
+class Hook:
+    """A named event that calls every connected listener in order."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._listeners: list[Callable[..., None]] = []
+
+    def connect(self, listener: Callable[..., None]) -> None:
+        self._listeners.append(listener)
+
+    def __call__(self, *args: int) -> None:
+        for listener in self._listeners:
+            listener(*args)
+
+
+# A customer was created or changed in a way list pages can show
+customer_list_changed = Hook("customer_list_changed")
+# A customer changed or disappeared (its notes included): (customer_id)
+customer_changed = Hook("customer_changed")
+# Notes were added for these customers: (*customer_ids)
+customer_notes_changed = Hook("customer_notes_changed")
+# A note was changed or deleted: (note_id, customer_id)
+note_changed = Hook("note_changed")
+# Too many rows changed to name them (e.g. an import renamed customers)
+everything_changed = Hook("everything_changed")
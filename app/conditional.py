@@ -0,0 +1,70 @@
+"""Conditional GET support: ETag / Last-Modified validators and 304s.
+
+Endpoints derive a validator from a cheap version lookup (a timestamp on
+the row, or a count + ``max(updated_at)`` aggregate), compare it with the
+request's ``If-None-Match`` / ``If-Modified-Since`` *before* running the
+page query, and answer 304 with no body when nothing changed.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response
+
+from .metrics import metrics
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from the values that determine a representation."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything is stored in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def validator_headers(etag: str, last_modified: datetime | None = None) -> dict:
+    """ETag/Last-Modified headers; clients must revalidate before reuse."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            _utc(last_modified).replace(microsecond=0), usegmt=True
+        )
+    return headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None = None
+) -> bool:
+    """
+    Whether the client's cached copy is current (RFC 9110 evaluation order).
+
+    ``If-None-Match`` wins when present. ``If-Modified-Since`` is only
+    checked when ``last_modified`` is given, i.e. when the timestamp alone
+    changes on every modification of the resource.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # GET uses weak comparison: W/"x" matches "x"
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = _utc(parsedate_to_datetime(if_modified_since))
+        except (TypeError, ValueError):
+            return False
+        return _utc(last_modified).replace(microsecond=0) <= since
+    return False
+
+
+def not_modified(headers: dict) -> Response:
+    metrics.increment("http_not_modified_total")
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,66 @@
+"""Chunked background deletion of customers with many notes.
+
+``DELETE /api/customers/{id}?mode=async`` hides the customer immediately and
+enqueues a ``customer_purge`` job (see ``app.worker``) that runs
+``purge_customer``: notes are removed in bounded batches,
+each in its own short transaction with a pause in between, so no single
+statement holds locks for long or produces a large WAL burst. The customer
+row itself is deleted once it has no notes left. Progress is recorded in
+``customer_deletions`` and exposed by ``GET /api/customers/{id}/deletion``.
+"""
+
+import logging
+import os
+import time
+
+from .database import SessionLocal
+from .jobs import job_handler
+from .metrics import metrics
+from .repositories.customer_deletion_repo import (
+    delete_notes_batch,
+    finish_customer_deletion,
+    set_customer_deletion_status,
+)
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = int(os.getenv("CUSTOMER_PURGE_BATCH_SIZE", "1000"))
+PURGE_PAUSE_SECONDS = float(os.getenv("CUSTOMER_PURGE_PAUSE_SECONDS", "0.05"))
+
+
+def purge_customer(
+    customer_id: int,
+    batch_size: int | None = None,
+    pause: float | None = None,
+) -> None:
+    """Delete a customer's notes in batches, then the customer itself."""
+    batch_size = batch_size or PURGE_BATCH_SIZE
+    pause = PURGE_PAUSE_SECONDS if pause is None else pause
+    with SessionLocal() as db:
+        try:
+            set_customer_deletion_status(db, customer_id, "running")
+            while True:
+                deleted = delete_notes_batch(db, customer_id, batch_size)
+                metrics.increment("customer_purge_notes_deleted_total", deleted)
+                if deleted < batch_size:
+                    break
+                if pause:
+                    time.sleep(pause)
+            finish_customer_deletion(db, customer_id)
+            metrics.increment("customer_purges_completed_total")
+        except Exception as exc:
+            db.rollback()
+            logger.error(
+                f"Customer {customer_id} purge failed: {exc}",
+                exc_info=True,
+                extra={"customer_id": customer_id},
+            )
+            set_customer_deletion_status(db, customer_id, "failed", error=str(exc))
+            metrics.increment("customer_purges_failed_total")
+            # Batches are idempotent; the job queue retries from where we stopped
+            raise
+
+
+@job_handler("customer_purge", concurrency=2)
+def run_customer_purge(payload: dict) -> None:
+    purge_customer(payload["customer_id"])
@@ -6,6 +6,8 @@ from typing import Generator
 from sqlalchemy import create_engine, MetaData
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+from .capacity import DB_MAX_OVERFLOW, DB_POOL_SIZE, DB_POOL_TIMEOUT
+
 # Read from env. In docker compose, this is already set.
 # Use file-based SQLite for testing to avoid database pollution
 _testing = os.getenv("TESTING", "false").lower() == "true"
@@ -24,6 +26,10 @@ connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite")
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
+    # Sized together with the threadpool, see app.capacity
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
     future=True,
     connect_args=connect_args,
 )
@@ -0,0 +1,149 @@
+"""Streaming bulk import of customers and notes from CSV or NDJSON.
+
+Input is read incrementally from a text stream, validated row by row with the
+API's Pydantic schemas and handed to the set-based loaders in
+``app.repositories.import_repo`` one chunk at a time, so memory use depends
+on the chunk size rather than on the size of the input. Each chunk is
+committed on its own.
+"""
+
+import csv
+import json
+from itertools import islice
+from typing import Iterator, TextIO
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from .repositories.import_repo import insert_notes, upsert_customers
+from .schemas.customer import CustomerCreate
+from .schemas.imports import ImportResult, ImportRowError
+from .schemas.note import NoteBulkItem
+
+IMPORT_KINDS = ("customers", "notes")
+IMPORT_FORMATS = ("csv", "ndjson")
+DEFAULT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportFormatError(ValueError):
+    """Raised when an import format or kind cannot be handled."""
+
+
+def detect_format(filename: str | None) -> str:
+    """Guess the import format from a file name."""
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    raise ImportFormatError(
+        "Cannot detect format from file name; pass format=csv or format=ndjson"
+    )
+
+
+def iter_records(stream: TextIO, fmt: str) -> Iterator[tuple[int, dict | None, str]]:
+    """
+    Yield ``(line, record, error)`` for each input row.
+
+    ``record`` is None when the row could not be parsed, in which case
+    ``error`` says why.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record, ""
+    elif fmt == "ndjson":
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield line_no, None, f"Invalid JSON: {exc}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, None, "Expected a JSON object"
+                continue
+            yield line_no, record, ""
+    else:
+        raise ImportFormatError(f"Unsupported format: {fmt}")
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    err = exc.errors()[0]
+    loc = ".".join(str(part) for part in err["loc"])
+    return f"{loc}: {err['msg']}" if loc else err["msg"]
+
+
+def run_import(
+    db: Session,
+    kind: str,
+    stream: TextIO,
+    fmt: str,
+    user_id: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> ImportResult:
+    """
+    Import ``kind`` ("customers" or "notes") rows from ``stream``.
+
+    Customers are upserted by email; rows for customers being deleted are
+    reported as errors. Notes are owned by ``user_id`` and rows referencing
+    unknown customers are reported as errors.
+    """
+    if kind not in IMPORT_KINDS:
+        raise ImportFormatError(f"Unsupported import kind: {kind}")
+    if kind == "notes" and user_id is None:
+        raise ImportFormatError("user_id is required to import notes")
+
+    processed = 0
+    imported = 0
+    error_count = 0
+    errors: list[ImportRowError] = []
+
+    def add_error(line: int, detail: str):
+        nonlocal error_count
+        error_count += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append(ImportRowError(line=line, detail=detail))
+
+    records = iter_records(stream, fmt)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        processed += len(chunk)
+
+        rows = []
+        for line, record, error in chunk:
+            if record is None:
+                add_error(line, error)
+                continue
+            try:
+                if kind == "customers":
+                    item = CustomerCreate.model_validate(record)
+                    rows.append((line, item.name, str(item.email)))
+                else:
+                    item = NoteBulkItem.model_validate(record)
+                    rows.append((line, item.customer_id, item.content))
+            except ValidationError as exc:
+                add_error(line, _validation_detail(exc))
+
+        if kind == "customers":
+            written, skipped = upsert_customers(db, rows)
+            imported += written
+            for line, email in skipped:
+                add_error(line, f"Customer {email} is being deleted")
+        else:
+            inserted, missing = insert_notes(db, user_id, rows)
+            imported += inserted
+            for line, customer_id in missing:
+                add_error(line, f"Customer {customer_id} not found")
+
+    return ImportResult(
+        kind=kind,
+        processed=processed,
+        imported=imported,
+        error_count=error_count,
+        errors=errors,
+    )
@@ -0,0 +1,40 @@
+"""Registry of background job types run by ``app.worker``.
+
+A job type is a plain function taking the job's JSON payload, registered
+with ``@job_handler``. Handlers must be idempotent: a job is retried after
+a failure and re-run if its worker dies mid-way. Both count against the
+job's attempts, so a job that keeps crashing its worker ends up failed.
+
+    @job_handler("customer_purge", concurrency=2)
+    def run_customer_purge(payload: dict) -> None:
+        ...
+
+Enqueue with ``repositories.job_repo.enqueue_job(db, "customer_purge", {...})``;
+the number of attempts is set per job when it is enqueued.
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class JobType:
+    name: str
+    handler: Callable[[dict], None]
+    # Jobs of this type one worker process runs at the same time
+    concurrency: int = 1
+    # Retry n waits backoff * 2**(n-1) seconds
+    backoff: float = 30.0
+
+
+JOB_TYPES: dict[str, JobType] = {}
+
+
+def job_handler(name: str, concurrency: int = 1, backoff: float = 30.0):
+    """Register the decorated function as the handler for job type ``name``."""
+
+    def register(func: Callable[[dict], None]) -> Callable[[dict], None]:
+        JOB_TYPES[name] = JobType(name, func, concurrency, backoff)
+        return func
+
+    return register
@@ -1,10 +1,17 @@
 import logging
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from .admission import ADMISSION_ENABLED, AdmissionControlMiddleware
 from .api import router as api
+from .capacity import apply_capacity, plan_capacity
 from .middleware import RequestLoggingMiddleware, ErrorFormattingMiddleware
 from .rate_limit import RateLimitMiddleware
 from .metrics import router as metrics_router
+from .password_pool import shutdown_password_pool
+from .warmup import WARMUP_ENABLED, mark_not_ready, mark_ready, warm_up
 
 # Configure logging
 logging.basicConfig(
@@ -12,16 +19,53 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Optionally run the background job worker in-process (small deployments);
+    # otherwise run `python -m app.worker` as a separate process
+    worker = None
+    if os.getenv("RUN_JOB_WORKER", "false").lower() == "true":
+        from .worker import Worker
+
+        worker = Worker()
+
+    # Size the threadpool to the DB connections left for request threads
+    apply_capacity(plan_capacity(worker.max_connections if worker else 0))
+
+    # Pay connection, compilation and process-spawn costs before serving
+    if WARMUP_ENABLED:
+        await run_in_threadpool(warm_up)
+    mark_ready()
+
+    if worker is not None:
+        worker.start()
+    yield
+    mark_not_ready()
+    if worker is not None:
+        worker.stop(timeout=30)
+    shutdown_password_pool()
+
+
 app = FastAPI(
     title="AI Project API",
     version="0.1.20",
     description="API with request logging, rate limiting, and metrics",
+    lifespan=lifespan,
+    # orjson encodes responses built from response_model data much faster
+    # than the stdlib json encoder
+    default_response_class=ORJSONResponse,
 )
 
 # Add middleware (order matters - first added is outermost)
 app.add_middleware(ErrorFormattingMiddleware)
 app.add_middleware(RequestLoggingMiddleware)
 
+# Shed load once the database slows down; runs inside the rate limiter so
+# rate-limited clients never take a slot
+if ADMISSION_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
 # Use higher rate limit for testing
 is_testing = os.getenv("TESTING", "false").lower() == "true"
 rate_limit = 1000 if is_testing else 60
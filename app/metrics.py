@@ -9,6 +9,7 @@ router = APIRouter(tags=["Monitoring"])
 # In-memory metrics storage (for production, use Redis or similar)
 _metrics: Dict[str, int] = defaultdict(int)
 _request_durations: Dict[str, list] = defaultdict(list)
+_gauges: Dict[str, float] = {}
 
 
 class MetricsCollector:
@@ -27,6 +28,11 @@ class MetricsCollector:
         if len(_request_durations[metric_name]) > 1000:
             _request_durations[metric_name] = _request_durations[metric_name][-1000:]
 
+    @staticmethod
+    def set_gauge(metric_name: str, value: float):
+        """Set a point-in-time metric (e.g. a queue depth)."""
+        _gauges[metric_name] = value
+
     @staticmethod
     def get_metrics() -> Dict:
         """Get all metrics."""
@@ -42,6 +48,7 @@ class MetricsCollector:
         return {
             "counters": metrics,
             "durations": durations,
+            "gauges": dict(_gauges),
         }
 
 
@@ -8,3 +8,5 @@ in different environments (e.g., CI images with conflicting packages).
 from .user import User  # noqa: F401
 from .customer import Customer  # noqa: F401
 from .note import Note  # noqa: F401
+from .customer_deletion import CustomerDeletion  # noqa: F401
+from .job import Job  # noqa: F401
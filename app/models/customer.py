@@ -2,16 +2,43 @@
 from __future__ import annotations
 
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Integer, String, DateTime, text
+from sqlalchemy import Integer, String, DateTime, Index, func, text
 from app.database import Base
 
 
 class Customer(Base):
     __tablename__ = "customers"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     created_at: Mapped["DateTime"] = mapped_column(
         DateTime(timezone=True), server_default=text("now()"), nullable=False
     )
+    # Bumped on every change; drives ETag / Last-Modified on customer reads
+    updated_at: Mapped["DateTime"] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("now()"),
+        onupdate=text("now()"),
+        nullable=False,
+    )
+    # Set while an asynchronous delete is purging the customer's notes; such
+    # customers are hidden from every read
+    delete_requested_at: Mapped["DateTime | None"] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+# Case-insensitive prefix filters on the customer listing. text_pattern_ops
+# lets Postgres serve LIKE 'prefix%' from the index; SQLite cannot use
+# expression indexes for LIKE, so they are only created on Postgres.
+Index(
+    "ix_customers_name_lower",
+    func.lower(Customer.__table__.c.name).label("name_lower"),
+    postgresql_ops={"name_lower": "text_pattern_ops"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_customers_email_lower",
+    func.lower(Customer.__table__.c.email).label("email_lower"),
+    postgresql_ops={"email_lower": "text_pattern_ops"},
+).ddl_if(dialect="postgresql")
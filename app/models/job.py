@@ -0,0 +1,45 @@
+# app/models/job.py
+from __future__ import annotations
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, Index, Integer, String, Text, DateTime, text
+from app.database import Base
+
+
+class Job(Base):
+    """A unit of background work, claimed and run by ``app.worker``."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Serves the worker's claim query: queued jobs of a type, oldest first
+        Index("ix_jobs_status_type_run_at", "status", "type", "run_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    type: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    # queued -> running -> done | failed (queued again between retries)
+    status: Mapped[str] = mapped_column(
+        String(16), nullable=False, server_default=text("'queued'")
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("0")
+    )
+    max_attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("5")
+    )
+    # Not runnable before this time; pushed forward by retry backoff
+    run_at: Mapped["DateTime"] = mapped_column(
+        DateTime(timezone=True), server_default=text("now()"), nullable=False
+    )
+    locked_at: Mapped["DateTime | None"] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    locked_by: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped["DateTime"] = mapped_column(
+        DateTime(timezone=True), server_default=text("now()"), nullable=False
+    )
+    finished_at: Mapped["DateTime | None"] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
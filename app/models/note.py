@@ -2,14 +2,33 @@
 from __future__ import annotations
 
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Integer, Text, DateTime, ForeignKey, text
+from sqlalchemy import Integer, Text, DateTime, ForeignKey, Index, text
 from app.database import Base
 
 
 class Note(Base):
+    # With the optional notes_partitioning migrations applied, notes is HASH
+    # partitioned on customer_id and its primary key is (id, customer_id).
+    # ids still come from one sequence, so id alone remains the ORM identity;
+    # customer-scoped queries must keep filtering on customer_id to prune.
     __tablename__ = "notes"
+    __table_args__ = (
+        # Serves the per-customer listing (ORDER BY created_at DESC, id DESC),
+        # counts and ON DELETE CASCADE from customers. On Postgres it also
+        # carries updated_at so the list's count + max(updated_at) version
+        # query is index-only
+        Index(
+            "ix_notes_customer_created_id",
+            "customer_id",
+            "created_at",
+            "id",
+            postgresql_include=["updated_at"],
+        ),
+        # Serves ON DELETE CASCADE from users
+        Index("ix_notes_user_id", "user_id"),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     customer_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("customers.id", ondelete="CASCADE"), nullable=False
     )
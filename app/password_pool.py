@@ -0,0 +1,117 @@
+"""Offload bcrypt hashing to a dedicated process pool.
+
+bcrypt is deliberately CPU-expensive. Run inline in sync endpoints it holds
+the shared AnyIO threadpool tokens and the GIL, so a burst of logins starves
+cheap reads. Here hashing runs in a bounded pool of worker processes, which
+scales across cores. The awaiting endpoint holds no thread while it waits.
+
+Admission is bounded: once ``PASSWORD_HASH_MAX_PENDING`` hashes are queued
+or running, new ones fail fast with ``PasswordHashingBusy`` (mapped to 503)
+instead of growing an unbounded backlog.
+
+Each API worker process has its own pool. ``PASSWORD_HASH_WORKERS`` sizes
+it; by default the CPUs are shared out between the API workers (see
+``app.capacity``). Set ``PASSWORD_HASH_WORKERS=0`` to hash on the default
+thread executor instead (useful for tests and constrained environments).
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Callable, TypeVar
+
+from .capacity import plan_capacity
+from .metrics import metrics
+from .security import hash_password, verify_and_update_password
+
+T = TypeVar("T")
+
+PASSWORD_HASH_WORKERS = plan_capacity().password_hash_workers
+PASSWORD_HASH_MAX_PENDING = int(
+    os.getenv("PASSWORD_HASH_MAX_PENDING", str(max(PASSWORD_HASH_WORKERS, 1) * 8))
+)
+
+
+class PasswordHashingBusy(Exception):
+    """Too many password hashes are already queued; retry later."""
+
+
+_pool: Executor | None = None
+_pool_lock = threading.Lock()
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+def _get_pool() -> Executor | None:
+    global _pool
+    if PASSWORD_HASH_WORKERS <= 0:
+        return None  # loop's default thread executor
+    with _pool_lock:
+        if _pool is None:
+            # Imported on first use: scripts, alembic and the job worker never
+            # need the process-pool machinery
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # spawn: never fork a process that is running threads
+            _pool = ProcessPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def start_password_pool() -> None:
+    """Spawn the worker processes now instead of on the first login."""
+    pool = _get_pool()
+    if pool is not None:
+        # One trivial task per worker: each submit without an idle worker
+        # spawns a process
+        list(pool.map(abs, range(PASSWORD_HASH_WORKERS)))
+
+
+def shutdown_password_pool() -> None:
+    """Stop the worker processes (they are started again on next use)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def _call_timed(func: Callable[..., T], *args) -> tuple[float, T]:
+    # Runs in the worker; the start time measures how long the task queued
+    return time.time(), func(*args)
+
+
+async def _offload(func: Callable[..., T], *args) -> T:
+    global _pending
+    with _pending_lock:
+        if _pending >= PASSWORD_HASH_MAX_PENDING:
+            metrics.increment("password_hash_rejected_total")
+            raise PasswordHashingBusy()
+        _pending += 1
+
+    submitted = time.time()
+    try:
+        loop = asyncio.get_running_loop()
+        started, result = await loop.run_in_executor(
+            _get_pool(), _call_timed, func, *args
+        )
+    finally:
+        with _pending_lock:
+            _pending -= 1
+    metrics.record_duration("password_hash_queue_seconds", started - submitted)
+    metrics.record_duration("password_hash_seconds", time.time() - started)
+    return result
+
+
+async def hash_password_async(plain: str) -> str:
+    return await _offload(hash_password, plain)
+
+
+async def verify_password_async(plain: str, hashed: str) -> tuple[bool, str | None]:
+    """Verify off the event loop; returns ``(valid, new_hash_or_None)``."""
+    return await _offload(verify_and_update_password, plain, hashed)
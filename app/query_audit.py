@@ -0,0 +1,201 @@
+"""Index and query-plan audit for the repository layer.
+
+``REPOSITORY_QUERIES`` is a catalog of the read query shapes the
+repositories issue (writes all address rows by primary key, except the
+job claim, which is catalogued by its candidate query). Each entry is
+run against a session while its SQL is captured, and the captured
+statements are EXPLAINed on the current dialect. The helpers here are used
+by ``scripts/index_advisor.py`` and by the plan regression tests.
+"""
+
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Iterator
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .models.note import Note
+from .repositories import customer_repo, job_repo, note_repo, user_repo
+
+SAMPLE_ID = 1
+
+REPOSITORY_QUERIES: dict[str, Callable[[Session], object]] = {
+    "customer_repo.get_customer_by_id": lambda db: customer_repo.get_customer_by_id(
+        db, SAMPLE_ID
+    ),
+    "customer_repo.get_existing_customer_ids": lambda db: (
+        customer_repo.get_existing_customer_ids(db, {SAMPLE_ID, SAMPLE_ID + 1})
+    ),
+    "customer_repo.get_customers": lambda db: customer_repo.get_customers(db),
+    "customer_repo.get_customers[prefix]": lambda db: customer_repo.get_customers(
+        db, after_id=SAMPLE_ID, name_prefix="a", email_prefix="a"
+    ),
+    "note_repo.get_note_by_id": lambda db: note_repo.get_note_by_id(db, SAMPLE_ID),
+    "note_repo.note_exists": lambda db: note_repo.note_exists(db, SAMPLE_ID),
+    "note_repo.get_notes_by_customer": lambda db: note_repo.get_notes_by_customer(
+        db, SAMPLE_ID
+    ),
+    "note_repo.get_notes_by_customer[search]": lambda db: (
+        note_repo.get_notes_by_customer(db, SAMPLE_ID, search="x")
+    ),
+    "note_repo.get_notes_version": lambda db: (
+        note_repo.get_notes_version(db, SAMPLE_ID)
+    ),
+    "note_repo.get_notes_batch": lambda db: note_repo.get_notes_batch(db, SAMPLE_ID),
+    "note_repo.get_notes_batch[before]": lambda db: note_repo.get_notes_batch(
+        db, SAMPLE_ID, before=(datetime(2024, 1, 1), SAMPLE_ID)
+    ),
+    "user_repo.get_user_by_email": lambda db: user_repo.get_user_by_email(
+        db, "audit@example.com"
+    ),
+    "job_repo.due_jobs_query": lambda db: db.execute(
+        job_repo.due_jobs_query("audit", 1, job_repo.utcnow())
+    ).all(),
+    "job_repo.queue_depths": lambda db: job_repo.queue_depths(db),
+    # ON DELETE CASCADE from users looks notes up by user_id
+    "cascade.notes_by_user_id": lambda db: db.execute(
+        select(Note.id).where(Note.user_id == SAMPLE_ID)
+    ).all(),
+}
+
+# Queries that legitimately read a whole table, with the reason
+ALLOWED_FULL_SCANS: dict[str, str] = {}
+
+# Note queries that cannot be pruned to one partition once notes is hash
+# partitioned on customer_id (optional notes_partitioning branch), with the
+# reason. They probe every partition's index instead of one.
+UNPRUNED_NOTE_QUERIES: dict[str, str] = {
+    "note_repo.get_note_by_id": "GET /api/notes/{id} only knows the note id",
+    "note_repo.note_exists": "404/403 check after an owner update/delete miss",
+    "cascade.notes_by_user_id": "ON DELETE CASCADE from users, by user_id",
+}
+
+
+@contextmanager
+def capture_statements(engine: Engine) -> Iterator[list[tuple[str, object]]]:
+    """Collect ``(statement, parameters)`` for SQL executed on ``engine``."""
+    captured: list[tuple[str, object]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def explain(db: Session, statement: str, parameters: object) -> list[str]:
+    """Return the query plan for a driver-level statement as text lines."""
+    conn = db.connection()
+    if conn.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[3] for row in rows]
+    # COSTS OFF keeps the output stable enough to snapshot
+    rows = conn.exec_driver_sql(f"EXPLAIN (COSTS OFF) {statement}", parameters)
+    return [row[0] for row in rows]
+
+
+def collect_plans(db: Session) -> dict[str, list[str]]:
+    """Run every catalog query and return its EXPLAIN output, keyed by name."""
+    engine = db.get_bind()
+    plans: dict[str, list[str]] = {}
+    for name, run in REPOSITORY_QUERIES.items():
+        db.expunge_all()  # make sure db.get() really hits the database
+        with capture_statements(engine) as captured:
+            run(db)
+        plans[name] = [
+            line
+            for statement, parameters in captured
+            for line in explain(db, statement, parameters)
+        ]
+    db.rollback()
+    return plans
+
+
+def notes_partitions(engine: Engine) -> set[str]:
+    """Names of the partitions of ``notes``; empty unless it is partitioned."""
+    if engine.dialect.name != "postgresql":
+        return set()
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(
+            "SELECT inhrelid::regclass::text FROM pg_inherits "
+            "WHERE inhparent = 'notes'::regclass"
+        )
+        return {row[0] for row in rows}
+
+
+def scanned_relations(plan: list[str], relations: set[str]) -> set[str]:
+    """Return which of ``relations`` the plan reads."""
+    pattern = re.compile(r" on (\w+)")
+    return {
+        match.group(1)
+        for line in plan
+        for match in pattern.finditer(line)
+        if match.group(1) in relations
+    }
+
+
+def full_scans(plan: list[str], tables: set[str]) -> list[str]:
+    """Return the plan lines that read one of ``tables`` sequentially."""
+    pattern = re.compile(r"^\s*(?:->\s*)?(?:Parallel )?Seq Scan on (\w+)|^SCAN (\w+)")
+    hits = []
+    for line in plan:
+        match = pattern.search(line)
+        if match and (match.group(1) or match.group(2)) in tables:
+            hits.append(line.strip())
+    return hits
+
+
+def find_redundant_indexes(engine: Engine) -> list[tuple[str, str, str]]:
+    """
+    Find non-unique indexes made redundant by another index or constraint.
+
+    An index is redundant when its columns are a leading prefix of (or equal
+    to) the primary key, a unique constraint or another index on the same
+    table. Returns ``(table, index, covered_by)`` tuples.
+    """
+    insp = inspect(engine)
+    redundant = []
+    for table in insp.get_table_names():
+        covering: list[tuple[str, list[str]]] = []
+        pk = insp.get_pk_constraint(table)
+        if pk.get("constrained_columns"):
+            covering.append(
+                (pk.get("name") or "primary key", pk["constrained_columns"])
+            )
+        for uq in insp.get_unique_constraints(table):
+            covering.append((uq["name"], uq["column_names"]))
+        indexes = insp.get_indexes(table)
+        for ix in indexes:
+            covering.append((ix["name"], ix["column_names"]))
+
+        for ix in indexes:
+            if ix.get("unique"):
+                continue
+            cols = ix["column_names"]
+            for name, other in covering:
+                if name == ix["name"]:
+                    continue
+                if other[: len(cols)] == cols:
+                    redundant.append((table, ix["name"], name))
+                    break
+    return redundant
+
+
+def unused_indexes(engine: Engine, plans: dict[str, list[str]]) -> list[str]:
+    """Return non-unique indexes not referenced by any collected plan."""
+    insp = inspect(engine)
+    text = "\n".join(line for plan in plans.values() for line in plan)
+    return [
+        ix["name"]
+        for table in insp.get_table_names()
+        for ix in insp.get_indexes(table)
+        if not ix.get("unique") and ix["name"] not in text
+    ]
@@ -73,7 +73,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next) -> Response:
         """Process request with rate limiting."""
         # Skip rate limiting for health and metrics endpoints
-        skip_paths = ["/api/health", "/api/metrics", "/api/version"]
+        skip_paths = ["/api/health", "/api/ready", "/api/metrics", "/api/version"]
         if request.url.path in skip_paths:
             response = await call_next(request)
             # Still add headers for consistency
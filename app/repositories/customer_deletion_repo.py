@@ -0,0 +1,100 @@
+# app/repositories/customer_deletion_repo.py
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.orm import Session
+
+from ..models.customer import Customer
+from ..models.customer_deletion import CustomerDeletion
+from ..models.note import Note
+from .. import change_hooks
+from .job_repo import enqueue_job
+
+
+def request_customer_deletion(db: Session, customer_id: int) -> CustomerDeletion | None:
+    """
+    Hide a customer from reads, record a pending chunked delete and enqueue
+    the ``customer_purge`` job that performs it, all in one transaction.
+
+    Returns the existing record if a delete was already requested, or None
+    if the customer does not exist.
+    """
+    marked = db.scalar(
+        update(Customer)
+        .where(Customer.id == customer_id, Customer.delete_requested_at.is_(None))
+        .values(delete_requested_at=text("now()"))
+        .returning(Customer.id)
+    )
+    if marked is None:
+        db.rollback()
+        return get_customer_deletion(db, customer_id)
+
+    notes_total = db.scalar(
+        select(func.count()).select_from(Note).where(Note.customer_id == customer_id)
+    )
+    # Drop a finished record left behind by a previous customer with this id
+    db.execute(
+        delete(CustomerDeletion).where(CustomerDeletion.customer_id == customer_id)
+    )
+    deletion = CustomerDeletion(customer_id=customer_id, notes_total=notes_total)
+    db.add(deletion)
+    enqueue_job(db, "customer_purge", {"customer_id": customer_id}, commit=False)
+    db.commit()
+    change_hooks.customer_changed(customer_id)
+    db.refresh(deletion)
+    return deletion
+
+
+def get_customer_deletion(db: Session, customer_id: int) -> CustomerDeletion | None:
+    return db.scalar(
+        select(CustomerDeletion).where(CustomerDeletion.customer_id == customer_id)
+    )
+
+
+def set_customer_deletion_status(
+    db: Session, customer_id: int, status: str, error: str | None = None
+) -> None:
+    db.execute(
+        update(CustomerDeletion)
+        .where(CustomerDeletion.customer_id == customer_id)
+        .values(status=status, error=error, updated_at=text("now()"))
+    )
+    db.commit()
+
+
+def delete_notes_batch(db: Session, customer_id: int, batch_size: int) -> int:
+    """
+    Delete up to ``batch_size`` of a customer's notes and record progress.
+
+    Each batch is its own short transaction. Returns the number deleted.
+    """
+    batch = select(Note.id).where(Note.customer_id == customer_id).limit(batch_size)
+    deleted = db.execute(
+        delete(Note)
+        .where(Note.customer_id == customer_id, Note.id.in_(batch))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if deleted:
+        db.execute(
+            update(CustomerDeletion)
+            .where(CustomerDeletion.customer_id == customer_id)
+            .values(
+                notes_deleted=CustomerDeletion.notes_deleted + deleted,
+                updated_at=text("now()"),
+            )
+        )
+    db.commit()
+    return deleted
+
+
+def finish_customer_deletion(db: Session, customer_id: int) -> None:
+    """Delete the (now note-less) customer row and mark the delete done."""
+    db.execute(
+        delete(Customer)
+        .where(Customer.id == customer_id)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(CustomerDeletion)
+        .where(CustomerDeletion.customer_id == customer_id)
+        .values(status="done", updated_at=text("now()"))
+    )
+    db.commit()
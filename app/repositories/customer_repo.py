@@ -1,45 +1,172 @@
+from typing import Sequence
+
+from sqlalchemy import Row, case, func, select, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
 from ..models.customer import Customer
+from .. import change_hooks
+
+
+def _upsert_insert(db: Session):
+    """Return the dialect's INSERT construct (with ON CONFLICT support)."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
 
 
 def create_customer(db: Session, name: str, email: str) -> Customer | None:
-    row = Customer(name=name, email=email)
-    db.add(row)
-    try:
-        db.commit()
-    except IntegrityError:
+    """
+    Create a customer, or return the existing one with the same email.
+
+    A single INSERT ... ON CONFLICT (email) DO UPDATE ... RETURNING: the
+    no-op update makes the existing row come back without a second query
+    or an aborted transaction. Returns None when the email belongs to a
+    customer that is being deleted.
+    """
+    insert = _upsert_insert(db)
+    stmt = insert(Customer).values(name=name, email=email)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Customer.email],
+        set_={"email": stmt.excluded.email},
+        # A customer being deleted is not returned (and not revived)
+        where=Customer.delete_requested_at.is_(None),
+    ).returning(Customer)
+    row = db.scalars(stmt).one_or_none()
+    if row is None:
         db.rollback()
-        # Return existing by email if unique violation
-        return db.query(Customer).filter_by(email=email).first()
-    db.refresh(row)
+        return None
+    # Keep the RETURNING values loaded instead of expiring them on commit
+    db.expunge(row)
+    db.commit()
+    change_hooks.customer_list_changed()
     return row
 
 
-def get_customer_by_id(db: Session, customer_id: int) -> Customer | None:
-    return db.get(Customer, customer_id)
+def upsert_customers_bulk(db: Session, items: list[tuple[str, str]]) -> list[Row]:
+    """
+    Insert or update many customers by email in one statement.
 
+    ``items`` are ``(name, email)`` pairs; existing customers get the new
+    name. When an email is repeated the last pair wins. Returns
+    ``(id, name, email)`` rows in the order emails first appear in ``items``;
+    emails of customers being deleted are skipped.
+    """
+    latest = {email: name for name, email in items}
+    if not latest:
+        return []
 
-def get_customers(db: Session, limit: int = 100, offset: int = 0) -> list[Customer]:
-    return db.query(Customer).offset(offset).limit(limit).all()
+    insert = _upsert_insert(db)
+    stmt = insert(Customer).values(
+        [{"name": name, "email": email} for email, name in latest.items()]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Customer.email],
+        set_={
+            "name": stmt.excluded.name,
+            # ON CONFLICT updates skip column onupdate defaults
+            "updated_at": case(
+                (Customer.name != stmt.excluded.name, text("now()")),
+                else_=Customer.updated_at,
+            ),
+        },
+        where=Customer.delete_requested_at.is_(None),
+    ).returning(Customer.id, Customer.name, Customer.email)
+    rows = {row.email: row for row in db.execute(stmt)}
+    db.commit()
+    change_hooks.customer_list_changed()
+    for row in rows.values():
+        change_hooks.customer_changed(row.id)
+    return [rows[email] for email in latest if email in rows]
+
+
+def get_customer_by_id(
+    db: Session, customer_id: int, columns: Sequence[str] | None = None
+) -> Customer | Row | None:
+    """
+    Get a customer unless it is being deleted.
+
+    With ``columns`` (Customer column names) a row of just those columns is
+    read instead of the entity.
+    """
+    if columns is not None:
+        stmt = select(*(getattr(Customer, name) for name in columns)).where(
+            Customer.id == customer_id, Customer.delete_requested_at.is_(None)
+        )
+        return db.execute(stmt).one_or_none()
+    row = db.get(Customer, customer_id)
+    if row is None or row.delete_requested_at is not None:
+        return None
+    return row
+
+
+def get_existing_customer_ids(db: Session, customer_ids: set[int]) -> set[int]:
+    """Return the subset of ``customer_ids`` that exist, in a single query."""
+    if not customer_ids:
+        return set()
+    stmt = select(Customer.id).where(
+        Customer.id.in_(customer_ids), Customer.delete_requested_at.is_(None)
+    )
+    return set(db.scalars(stmt))
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def get_customers(
+    db: Session,
+    limit: int = 100,
+    after_id: int = 0,
+    name_prefix: str | None = None,
+    email_prefix: str | None = None,
+    fields: Sequence[str] | None = None,
+) -> list[Row]:
+    """
+    List customers ordered by id, as lightweight (id, name, email) rows.
+
+    Keyset pagination: returns customers with id greater than ``after_id``.
+    The ``id > :after_id`` predicate is always present so every page
+    (including the first) is a primary-key range scan with the same shape.
+    Prefix filters are case-insensitive. With ``fields`` only those columns
+    are read, plus ``id`` for the cursor.
+    """
+    columns = [Customer.id, Customer.name, Customer.email]
+    if fields is not None:
+        columns = [c for c in columns if c.key in fields or c is Customer.id]
+    stmt = (
+        select(*columns)
+        .where(Customer.id > after_id, Customer.delete_requested_at.is_(None))
+        .order_by(Customer.id)
+    )
+
+    if name_prefix:
+        pattern = _escape_like(name_prefix.lower()) + "%"
+        stmt = stmt.where(func.lower(Customer.name).like(pattern, escape="\\"))
+    if email_prefix:
+        pattern = _escape_like(email_prefix.lower()) + "%"
+        stmt = stmt.where(func.lower(Customer.email).like(pattern, escape="\\"))
+
+    return db.execute(stmt.limit(limit)).all()
 
 
 def update_customer_email(
     db: Session, customer_id: int, new_email: str
 ) -> Customer | None:
-    row = db.get(Customer, customer_id)
+    row = get_customer_by_id(db, customer_id)
     if not row:
         return None
     row.email = new_email
     db.commit()
+    change_hooks.customer_changed(customer_id)
     db.refresh(row)
     return row
 
 
 def delete_customer(db: Session, customer_id: int) -> bool:
-    row = db.get(Customer, customer_id)
+    row = get_customer_by_id(db, customer_id)
     if not row:
         return False
     db.delete(row)
     db.commit()
+    change_hooks.customer_changed(customer_id)
     return True
@@ -0,0 +1,154 @@
+# app/repositories/import_repo.py
+"""
+Set-based loaders used by the bulk import pipeline (see app/importer.py).
+
+On Postgres each chunk is streamed with COPY into a temporary staging table
+(dropped on commit) and merged into the real table with a single
+INSERT ... SELECT. Other dialects (SQLite in tests) fall back to a chunked
+executemany.
+"""
+from sqlalchemy import case, insert, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..models.customer import Customer
+from ..models.note import Note
+from .. import change_hooks
+from .customer_repo import get_existing_customer_ids
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _copy_rows(db: Session, table: str, columns: list[str], rows: list[tuple]):
+    """Stream ``rows`` into ``table`` with COPY on the session's connection."""
+    raw = db.connection().connection.driver_connection
+    with raw.cursor() as cur:
+        with cur.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+
+
+def upsert_customers(
+    db: Session, rows: list[tuple[int, str, str]]
+) -> tuple[int, list[tuple[int, str]]]:
+    """
+    Insert or update customers by email and commit.
+
+    ``rows`` are ``(line, name, email)`` tuples. When an email appears more
+    than once the last row wins. Emails of customers being deleted are not
+    written. Returns the number of customers written (counted from RETURNING)
+    and the ``(line, email)`` pairs that were skipped.
+    """
+    if not rows:
+        return 0, []
+
+    if _is_postgres(db):
+        db.execute(
+            text(
+                "CREATE TEMP TABLE import_customers "
+                "(line integer, name text, email text) ON COMMIT DROP"
+            )
+        )
+        _copy_rows(db, "import_customers", ["line", "name", "email"], rows)
+        written = set(
+            db.scalars(
+                text(
+                    "INSERT INTO customers (name, email) "
+                    "SELECT DISTINCT ON (email) name, email FROM import_customers "
+                    "ORDER BY email, line DESC "
+                    "ON CONFLICT (email) DO UPDATE SET name = EXCLUDED.name, "
+                    "updated_at = CASE WHEN customers.name <> EXCLUDED.name "
+                    "THEN now() ELSE customers.updated_at END "
+                    "WHERE customers.delete_requested_at IS NULL "
+                    "RETURNING email"
+                )
+            )
+        )
+    else:
+        latest = {email: name for _, name, email in rows}
+        stmt = sqlite_insert(Customer.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["email"],
+            set_={
+                "name": stmt.excluded.name,
+                "updated_at": case(
+                    (Customer.name != stmt.excluded.name, text("now()")),
+                    else_=Customer.updated_at,
+                ),
+            },
+            where=Customer.delete_requested_at.is_(None),
+        ).returning(Customer.email)
+        written = set(
+            db.scalars(
+                stmt, [{"name": name, "email": email} for email, name in latest.items()]
+            )
+        )
+
+    db.commit()
+    # Any cached customer may have been renamed
+    change_hooks.everything_changed()
+    skipped = [(line, email) for line, _, email in rows if email not in written]
+    return len(written), skipped
+
+
+def insert_notes(
+    db: Session, user_id: int, rows: list[tuple[int, int, str]]
+) -> tuple[int, list[tuple[int, int]]]:
+    """
+    Insert notes owned by ``user_id`` and commit.
+
+    ``rows`` are ``(line, customer_id, content)`` tuples. Rows referencing a
+    missing customer are skipped. Returns the number of notes inserted and
+    the ``(line, customer_id)`` pairs that were skipped.
+    """
+    if not rows:
+        return 0, []
+
+    if _is_postgres(db):
+        db.execute(
+            text(
+                "CREATE TEMP TABLE import_notes "
+                "(line integer, customer_id integer, content text) ON COMMIT DROP"
+            )
+        )
+        _copy_rows(db, "import_notes", ["line", "customer_id", "content"], rows)
+        missing = [
+            (line, customer_id)
+            for line, customer_id in db.execute(
+                text(
+                    "SELECT s.line, s.customer_id FROM import_notes s "
+                    "WHERE NOT EXISTS "
+                    "(SELECT 1 FROM customers c WHERE c.id = s.customer_id "
+                    "AND c.delete_requested_at IS NULL) "
+                    "ORDER BY s.line"
+                )
+            )
+        ]
+        result = db.execute(
+            text(
+                "INSERT INTO notes (customer_id, user_id, content) "
+                "SELECT s.customer_id, :user_id, s.content FROM import_notes s "
+                "JOIN customers c ON c.id = s.customer_id "
+                "AND c.delete_requested_at IS NULL "
+                "ORDER BY s.line"
+            ),
+            {"user_id": user_id},
+        )
+        inserted = result.rowcount
+    else:
+        existing = get_existing_customer_ids(db, {row[1] for row in rows})
+        missing = [(line, cid) for line, cid, _ in rows if cid not in existing]
+        params = [
+            {"customer_id": cid, "user_id": user_id, "content": content}
+            for _, cid, content in rows
+            if cid in existing
+        ]
+        if params:
+            db.execute(insert(Note.__table__), params)
+        inserted = len(params)
+
+    db.commit()
+    change_hooks.customer_notes_changed(*{cid for _, cid, _ in rows})
+    return inserted, missing
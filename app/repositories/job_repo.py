@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Select, func, select, update
+from sqlalchemy.orm import Session
+
+from ..models.job import Job
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def enqueue_job(
+    db: Session,
+    job_type: str,
+    payload: dict | None = None,
+    run_at: datetime | None = None,
+    max_attempts: int | None = None,
+    commit: bool = True,
+) -> Job:
+    """
+    Add a job to the queue.
+
+    Pass ``commit=False`` to enqueue inside the caller's transaction, so the
+    job exists if and only if the surrounding write commits.
+    """
+    job = Job(type=job_type, payload=payload or {}, run_at=run_at or utcnow())
+    if max_attempts is not None:
+        job.max_attempts = max_attempts
+    db.add(job)
+    if commit:
+        db.commit()
+        db.refresh(job)
+    return job
+
+
+def due_jobs_query(job_type: str, limit: int, now: datetime) -> Select:
+    """Ids of the oldest due jobs of a type, locked and skipping locked rows."""
+    return (
+        select(Job.id)
+        .where(Job.status == "queued", Job.type == job_type, Job.run_at <= now)
+        .order_by(Job.run_at, Job.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+
+
+def claim_jobs(db: Session, job_type: str, limit: int, worker_id: str) -> list[Job]:
+    """
+    Atomically mark up to ``limit`` due jobs of a type as running.
+
+    On Postgres the candidate rows are picked with ``FOR UPDATE SKIP LOCKED``,
+    so concurrent workers never claim the same job or wait on each other.
+    SQLite ignores the locking clause; its single writer lock makes the
+    UPDATE atomic instead.
+    """
+    now = utcnow()
+    candidates = due_jobs_query(job_type, limit, now)
+    jobs = list(
+        db.scalars(
+            update(Job)
+            .where(Job.id.in_(candidates), Job.status == "queued")
+            .values(
+                status="running",
+                attempts=Job.attempts + 1,
+                locked_at=now,
+                locked_by=worker_id,
+            )
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+    )
+    for job in jobs:
+        db.expunge(job)
+    db.commit()
+    return jobs
+
+
+def _owned(job: Job):
+    """WHERE clause matching ``job`` only while this claim of it is held."""
+    return (
+        Job.id == job.id,
+        Job.status == "running",
+        Job.locked_by == job.locked_by,
+        # A later claim by the same worker is a different lease
+        Job.attempts == job.attempts,
+    )
+
+
+def complete_job(db: Session, job: Job) -> bool:
+    """
+    Mark a claimed job done.
+
+    Returns False if the lease was lost: the job went stale, was re-queued
+    and possibly claimed by another worker, whose state is left alone.
+    """
+    done = db.execute(
+        update(Job)
+        .where(*_owned(job))
+        .values(status="done", locked_at=None, finished_at=utcnow())
+    ).rowcount
+    db.commit()
+    return bool(done)
+
+
+def fail_job(db: Session, job: Job, error: str, backoff_base: float) -> str | None:
+    """
+    Record a failed attempt of a claimed job.
+
+    The job is re-queued with exponential backoff (``backoff_base * 2**n``
+    seconds after attempt ``n``) until it runs out of attempts, then marked
+    failed. Returns the new status (``"queued"`` or ``"failed"``), or None
+    if the lease was lost (see ``complete_job``).
+    """
+    retry = job.attempts < job.max_attempts
+    values = {"locked_at": None, "locked_by": None, "last_error": error}
+    if retry:
+        delay = backoff_base * 2 ** (job.attempts - 1)
+        values.update(status="queued", run_at=utcnow() + timedelta(seconds=delay))
+    else:
+        values.update(status="failed", finished_at=utcnow())
+    updated = db.execute(update(Job).where(*_owned(job)).values(**values)).rowcount
+    db.commit()
+    return values["status"] if updated else None
+
+
+def requeue_stale_jobs(db: Session, timeout: float) -> tuple[int, int]:
+    """
+    Release running jobs whose worker stopped heartbeating (e.g. crashed).
+
+    A job that still has attempts left is re-queued. One that has used them
+    all is marked failed, so a job whose handler takes the worker down is
+    not retried forever. Returns the number of jobs requeued and failed.
+    """
+    now = utcnow()
+    stale = (Job.status == "running", Job.locked_at < now - timedelta(seconds=timeout))
+    failed = db.execute(
+        update(Job)
+        .where(*stale, Job.attempts >= Job.max_attempts)
+        .values(
+            status="failed",
+            locked_at=None,
+            locked_by=None,
+            last_error="Worker lease expired",
+            finished_at=now,
+        )
+    ).rowcount
+    requeued = db.execute(
+        update(Job)
+        .where(*stale)
+        .values(status="queued", locked_at=None, locked_by=None)
+    ).rowcount
+    db.commit()
+    return requeued, failed
+
+
+def touch_jobs(db: Session, job_ids: list[int], worker_id: str) -> None:
+    """Refresh the locks of jobs this worker still holds, so they are not stale."""
+    db.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids), Job.status == "running", Job.locked_by == worker_id)
+        .values(locked_at=utcnow())
+    )
+    db.commit()
+
+
+def queue_depths(db: Session) -> dict[str, int]:
+    """Number of queued jobs per type."""
+    rows = db.execute(
+        select(Job.type, func.count()).where(Job.status == "queued").group_by(Job.type)
+    )
+    return {job_type: count for job_type, count in rows}
@@ -1,76 +1,283 @@
 # app/repositories/note_repo.py
+from datetime import datetime
+from typing import Sequence
+
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import Row, delete, func, insert, literal, select, text, tuple_, update
+from ..models.customer import Customer
+from .. import change_hooks
 from ..models.note import Note
 
+# Columns needed to build a NoteOut; list reads select these instead of
+# entities so rows skip ORM hydration and identity-map bookkeeping
+NOTE_COLUMNS = (
+    Note.id,
+    Note.customer_id,
+    Note.user_id,
+    Note.content,
+    Note.created_at,
+    Note.updated_at,
+)
+
+
+# Notes of a customer being deleted disappear with it, like its list
+_CUSTOMER_LIVE = (
+    select(Customer.id)
+    .where(Customer.id == Note.customer_id, Customer.delete_requested_at.is_(None))
+    .exists()
+)
+
+
+def create_note(
+    db: Session, customer_id: int, user_id: int, content: str
+) -> Note | None:
+    """
+    Create a new note for a customer with a single INSERT ... SELECT ...
+    RETURNING.
 
-def create_note(db: Session, customer_id: int, user_id: int, content: str) -> Note:
-    """Create a new note for a customer."""
-    note = Note(customer_id=customer_id, user_id=user_id, content=content)
-    db.add(note)
+    The row is selected from the customer, so nothing is written (and None
+    is returned) when the customer does not exist or is being deleted; no
+    separate lookup is needed.
+    """
+    stmt = (
+        insert(Note)
+        .from_select(
+            ["customer_id", "user_id", "content"],
+            select(Customer.id, literal(user_id), literal(content)).where(
+                Customer.id == customer_id, Customer.delete_requested_at.is_(None)
+            ),
+        )
+        .returning(Note)
+    )
+    try:
+        note = db.scalars(stmt).one_or_none()
+    except IntegrityError:
+        db.rollback()
+        # The customer was hard-deleted while the note was being written
+        if db.get(Customer, customer_id) is None:
+            return None
+        raise
+    if note is None:
+        db.rollback()
+        return None
+    # Keep the RETURNING values loaded instead of expiring them on commit
+    db.expunge(note)
     db.commit()
-    db.refresh(note)
+    change_hooks.customer_notes_changed(customer_id)
     return note
 
 
+def create_notes_bulk(db: Session, user_id: int, items: list[dict]) -> list[Note]:
+    """
+    Create many notes in one transaction.
+
+    ``items`` are dicts with ``customer_id`` and ``content``. Rows are written
+    with a multi-row INSERT ... RETURNING so server defaults come back without
+    a refresh per note. Returned notes are in the same order as ``items``.
+    """
+    if not items:
+        return []
+    rows = [
+        {
+            "customer_id": item["customer_id"],
+            "user_id": user_id,
+            "content": item["content"],
+        }
+        for item in items
+    ]
+    notes = list(
+        db.scalars(
+            insert(Note).returning(Note, sort_by_parameter_order=True),
+            rows,
+        )
+    )
+    # Detach before commit so the RETURNING values are not expired (which
+    # would cost one SELECT per note when the response is serialized).
+    for note in notes:
+        db.expunge(note)
+    db.commit()
+    change_hooks.customer_notes_changed(*{note.customer_id for note in notes})
+    return notes
+
+
 def get_notes_by_customer(
     db: Session,
     customer_id: int,
     limit: int = 100,
     offset: int = 0,
     search: str | None = None,
-) -> list[Note]:
-    """Get all notes for a specific customer with optional search."""
-    query = (
-        db.query(Note)
-        .filter(Note.customer_id == customer_id)
-        .order_by(Note.created_at.desc())
+    preview_length: int | None = None,
+    fields: Sequence[str] | None = None,
+) -> list[Row]:
+    """
+    Get notes for a specific customer with optional search.
+
+    Returns lightweight rows (attribute access like a Note) rather than ORM
+    entities. With ``preview_length`` only the first characters of each
+    note's content are read, and rows carry a ``truncated`` flag. With
+    ``fields`` (NoteOut field names) only those columns are read; ``id`` is
+    always included.
+    """
+    columns = tuple(
+        c for c in NOTE_COLUMNS if fields is None or c.key in fields or c is Note.id
+    )
+    if preview_length is not None:
+        # Only a prefix is sliced out in SQL, so the full body is never
+        # shipped; reading one extra character tells whether it was cut
+        head = func.substr(Note.content, 1, preview_length + 1)
+        preview = []
+        if fields is None or "content" in fields:
+            preview.append(
+                func.substr(Note.content, 1, preview_length).label("content")
+            )
+        if fields is None or "truncated" in fields:
+            preview.append((func.length(head) > preview_length).label("truncated"))
+        columns = tuple(c for c in columns if c is not Note.content) + tuple(preview)
+
+    stmt = (
+        select(*columns).where(Note.customer_id == customer_id)
+        # id breaks ties between notes created in the same transaction
+        .order_by(Note.created_at.desc(), Note.id.desc())
     )
 
     # Add search filter if provided
     if search:
         search_pattern = f"%{search}%"
-        query = query.filter(Note.content.ilike(search_pattern))
+        stmt = stmt.where(Note.content.ilike(search_pattern))
+
+    return db.execute(stmt.offset(offset).limit(limit)).all()
+
+
+def get_notes_batch(
+    db: Session,
+    customer_id: int,
+    search: str | None = None,
+    limit: int = 1000,
+    before: tuple[datetime, int] | None = None,
+) -> Sequence[Row]:
+    """
+    Get a batch of a customer's notes as plain rows (newest first).
+
+    Keyset pagination on ``(created_at, id)``: pass the last row's pair as
+    ``before`` to continue after it. Each batch is one index range read, so
+    callers can page through any number of notes in short transactions.
+    """
+    stmt = (
+        select(*NOTE_COLUMNS)
+        .where(Note.customer_id == customer_id)
+        .order_by(Note.created_at.desc(), Note.id.desc())
+        .limit(limit)
+    )
+
+    if before is not None:
+        stmt = stmt.where(tuple_(Note.created_at, Note.id) < before)
+
+    if search:
+        search_pattern = f"%{search}%"
+        stmt = stmt.where(Note.content.ilike(search_pattern))
 
-    return query.offset(offset).limit(limit).all()
+    return db.execute(stmt).all()
 
 
-def count_notes_by_customer(
+def get_notes_version(
     db: Session, customer_id: int, search: str | None = None
-) -> int:
-    """Count total notes for a customer with optional search filter."""
-    query = db.query(Note).filter(Note.customer_id == customer_id)
+) -> tuple[int, datetime | None]:
+    """
+    Count a customer's notes (optionally filtered) and get their latest
+    ``updated_at``, in one aggregate over the customer's index range.
+
+    Any insert, update or delete changes the pair, so it doubles as the
+    list's total and as a cheap version for conditional GETs.
+    """
+    stmt = select(func.count(), func.max(Note.updated_at)).where(
+        Note.customer_id == customer_id
+    )
 
     if search:
         search_pattern = f"%{search}%"
-        query = query.filter(Note.content.ilike(search_pattern))
+        stmt = stmt.where(Note.content.ilike(search_pattern))
 
-    return query.count()
+    total, last_updated_at = db.execute(stmt).one()
+    return total, last_updated_at
 
 
-def get_note_by_id(db: Session, note_id: int) -> Note | None:
-    """Get a single note by ID."""
-    return db.get(Note, note_id)
+def get_note_by_id(
+    db: Session, note_id: int, columns: Sequence[str] | None = None
+) -> Note | Row | None:
+    """
+    Get a single note by ID, unless its customer is being deleted.
 
+    With ``columns`` (Note column names) a row of just those columns is read
+    instead of the entity.
+    """
+    if columns is None:
+        stmt = select(Note)
+    else:
+        stmt = select(*(c for c in NOTE_COLUMNS if c.key in columns))
+    stmt = stmt.where(Note.id == note_id, _CUSTOMER_LIVE)
+    if columns is None:
+        return db.scalars(stmt).one_or_none()
+    return db.execute(stmt).one_or_none()
 
-def update_note_content(db: Session, note_id: int, new_content: str) -> Note | None:
-    """Update the content of an existing note."""
-    note = db.get(Note, note_id)
-    if not note:
+
+def note_exists(db: Session, note_id: int) -> bool:
+    """Check whether a note exists and its customer is not being deleted."""
+    stmt = select(Note.id).where(Note.id == note_id, _CUSTOMER_LIVE)
+    return db.scalar(stmt) is not None
+
+
+def update_note_content(
+    db: Session, note_id: int, new_content: str, user_id: int | None = None
+) -> Note | None:
+    """
+    Update the content of an existing note in a single statement.
+
+    When ``user_id`` is given the note is only updated if that user owns it.
+    Notes of a customer being deleted are not updated. Returns None when no
+    row matched; use ``note_exists`` to tell a missing note apart from one
+    owned by someone else.
+    """
+    stmt = (
+        update(Note)
+        .where(Note.id == note_id, _CUSTOMER_LIVE)
+        # Set updated_at explicitly (server-side), as onupdate is not applied here
+        .values(content=new_content, updated_at=text("now()"))
+        .returning(Note)
+    )
+    if user_id is not None:
+        stmt = stmt.where(Note.user_id == user_id)
+
+    note = db.scalars(stmt).one_or_none()
+    if note is None:
+        db.rollback()
         return None
-    note.content = new_content
-    # Manually trigger updated_at (in case onupdate doesn't fire)
-    note.updated_at = text("now()")
+    # Keep the RETURNING values loaded instead of expiring them on commit
+    db.expunge(note)
     db.commit()
-    db.refresh(note)
+    change_hooks.note_changed(note_id, note.customer_id)
     return note
 
 
-def delete_note(db: Session, note_id: int) -> bool:
-    """Delete a note by ID."""
-    note = db.get(Note, note_id)
-    if not note:
+def delete_note(db: Session, note_id: int, user_id: int | None = None) -> bool:
+    """
+    Delete a note by ID in a single statement.
+
+    When ``user_id`` is given the note is only deleted if that user owns it.
+    Notes of a customer being deleted are left to the purge job.
+    """
+    stmt = (
+        delete(Note)
+        .where(Note.id == note_id, _CUSTOMER_LIVE)
+        .returning(Note.customer_id)
+    )
+    if user_id is not None:
+        stmt = stmt.where(Note.user_id == user_id)
+
+    customer_id = db.scalar(stmt)
+    if customer_id is None:
+        db.rollback()
         return False
-    db.delete(note)
     db.commit()
+    change_hooks.note_changed(note_id, customer_id)
     return True
@@ -1,4 +1,6 @@
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from ..auth_cache import invalidate_user
 from ..models.user import User
 
 
@@ -12,3 +14,21 @@ def create_user(db: Session, email: str, password_hash: str) -> User:
     db.commit()
     db.refresh(u)
     return u
+
+
+def update_password_hash(db: Session, user_id: int, password_hash: str) -> None:
+    db.execute(
+        update(User).where(User.id == user_id).values(password_hash=password_hash)
+    )
+    db.commit()
+    invalidate_user(user_id)
+
+
+def set_user_active(db: Session, user_id: int, is_active: bool) -> bool:
+    """Activate or deactivate a user. Returns False if the user does not exist."""
+    updated = db.execute(
+        update(User).where(User.id == user_id).values(is_active=is_active)
+    ).rowcount
+    db.commit()
+    invalidate_user(user_id)
+    return bool(updated)
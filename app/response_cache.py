@@ -0,0 +1,261 @@
+"""Per-process cache of rendered GET responses.
+
+The public read endpoints in ``routers/customers.py`` and ``routers/notes.py``
+cache their rendered 200 responses. The key is the route path plus the
+sorted query string. Each entry is tagged with the data it was built from,
+e.g. ``customer:7`` or ``customer_notes:7``. The ``invalidate_*`` functions
+are connected to ``change_hooks``, which the repositories fire after they
+commit; each drops every entry carrying an affected tag.
+
+The cache is bounded by total bytes (LRU eviction) and every entry expires
+after ``RESPONSE_CACHE_TTL_SECONDS``. Invalidation only reaches the process
+that made the write, so the TTL bounds how stale other worker processes can
+be. Set ``RESPONSE_CACHE_MAX_BYTES=0`` to disable the cache.
+
+A read racing a write must not cache data the write has just invalidated:
+a lookup snapshots a generation counter that every invalidation bumps, and
+the response is only stored if no invalidation happened while it was being
+built.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable
+
+from fastapi import Request, Response
+
+from . import change_hooks
+from .conditional import is_not_modified, not_modified
+from .metrics import metrics
+
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "10"))
+RESPONSE_CACHE_MAX_BYTES = int(
+    os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+
+
+@dataclass
+class _Entry:
+    body: bytes
+    headers: dict[str, str]
+    media_type: str | None
+    last_modified: datetime | None
+    tags: tuple[str, ...]
+    expires_at: float
+    size: int
+
+
+class ResponseCache:
+    """Byte-bounded LRU of rendered responses with TTLs and tag invalidation."""
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._tag_keys: dict[str, set[str]] = {}
+        self._generation = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> _Entry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        metrics.increment(
+            "response_cache_hits" if entry is not None else "response_cache_misses"
+        )
+        return entry
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def put(self, key: str, entry: _Entry, generation: int) -> None:
+        if entry.size > self.max_bytes:
+            return
+        evicted = 0
+        with self._lock:
+            # Skip storing if a write invalidated anything meanwhile
+            if generation != self._generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            for tag in entry.tags:
+                self._tag_keys.setdefault(tag, set()).add(key)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                evicted += 1
+            size, count = self._bytes, len(self._entries)
+        if evicted:
+            metrics.increment("response_cache_evictions", evicted)
+        metrics.set_gauge("response_cache_bytes", size)
+        metrics.set_gauge("response_cache_entries", count)
+
+    def invalidate(self, *tags: str) -> None:
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in list(self._tag_keys.get(tag, ())):
+                    self._remove(key)
+        metrics.increment("response_cache_invalidations", len(tags))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tag_keys.clear()
+            self._generation += 1
+            self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL_SECONDS)
+
+
+class CachedLookup:
+    """Result of ``lookup``: a ready response on a hit, else a way to store one."""
+
+    def __init__(self, key: str, tags: tuple[str, ...]):
+        self.key = key
+        self.tags = tags
+        self.hit: Response | None = None
+        self._generation = response_cache.generation
+
+    def store(
+        self,
+        response: Response,
+        last_modified: datetime | None = None,
+        extra_tags: Iterable[str] = (),
+    ) -> Response:
+        """
+        Cache a rendered 200 response and return it unchanged.
+
+        ``extra_tags`` are tags only known once the data is loaded (e.g. the
+        customer a note belongs to).
+        """
+        if response.status_code == 200 and response_cache.max_bytes > 0:
+            headers = {
+                k: v for k, v in response.headers.items() if k != "content-length"
+            }
+            size = (
+                len(response.body)
+                + len(self.key)
+                + sum(len(k) + len(v) for k, v in headers.items())
+            )
+            entry = _Entry(
+                body=bytes(response.body),
+                headers=headers,
+                media_type=response.media_type,
+                last_modified=last_modified,
+                tags=(*self.tags, *extra_tags),
+                expires_at=time.monotonic() + response_cache.ttl,
+                size=size,
+            )
+            response_cache.put(self.key, entry, self._generation)
+        return response
+
+
+def cache_key(request: Request) -> str:
+    """The route path plus the sorted query string."""
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+def lookup(request: Request, *tags: str) -> CachedLookup:
+    """
+    Look up a cached response for this GET.
+
+    On a hit ``.hit`` is the response (a 304 when the client's validators
+    match). On a miss, build the response and pass it to ``.store()``.
+    """
+    key = cache_key(request)
+    result = CachedLookup(key, tags)
+    if response_cache.max_bytes <= 0:
+        return result
+
+    entry = response_cache.get(key)
+    if entry is None:
+        return result
+
+    etag = entry.headers.get("etag")
+    if etag and is_not_modified(request, etag, entry.last_modified):
+        result.hit = not_modified(
+            {k: v for k, v in entry.headers.items() if k != "content-type"}
+        )
+    else:
+        result.hit = Response(
+            content=entry.body, headers=entry.headers, media_type=entry.media_type
+        )
+    return result
+
+
+# Tags
+
+
+def customer_tag(customer_id: int) -> str:
+    return f"customer:{customer_id}"
+
+
+def customer_notes_tag(customer_id: int) -> str:
+    return f"customer_notes:{customer_id}"
+
+
+def note_tag(note_id: int) -> str:
+    return f"note:{note_id}"
+
+
+CUSTOMER_LIST_TAG = "customers"
+
+
+# Invalidation, connected to the repositories' change hooks
+
+
+def invalidate_customer_list() -> None:
+    """A customer was created or changed in a way list pages can show."""
+    response_cache.invalidate(CUSTOMER_LIST_TAG)
+
+
+def invalidate_customer(customer_id: int) -> None:
+    """A customer changed or disappeared (its notes included)."""
+    response_cache.invalidate(
+        CUSTOMER_LIST_TAG, customer_tag(customer_id), customer_notes_tag(customer_id)
+    )
+
+
+def invalidate_customer_notes(*customer_ids: int) -> None:
+    """Notes were added for these customers."""
+    response_cache.invalidate(*(customer_notes_tag(cid) for cid in customer_ids))
+
+
+def invalidate_note(note_id: int, customer_id: int) -> None:
+    """A note was changed or deleted."""
+    response_cache.invalidate(note_tag(note_id), customer_notes_tag(customer_id))
+
+
+def clear_response_cache() -> None:
+    response_cache.clear()
+
+
+change_hooks.customer_list_changed.connect(invalidate_customer_list)
+change_hooks.customer_changed.connect(invalidate_customer)
+change_hooks.customer_notes_changed.connect(invalidate_customer_notes)
+change_hooks.note_changed.connect(invalidate_note)
+change_hooks.everything_changed.connect(clear_response_cache)
@@ -1,15 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
 
+from ..auth_cache import (
+    cache_token_payload,
+    cache_user,
+    get_cached_token_payload,
+    get_cached_user,
+)
 from ..deps import get_db
+from ..metrics import metrics
+from ..models.user import User
 from ..schemas.user import SignupIn, UserOut
-from ..repositories.user_repo import get_user_by_email, create_user
-from ..security import (
-    hash_password,
-    verify_password,
-    create_access_token,
-    decode_token,
+from ..repositories.user_repo import (
+    get_user_by_email,
+    create_user,
+    update_password_hash,
+)
+from ..security import create_access_token, decode_token
+from ..password_pool import (
+    PasswordHashingBusy,
+    hash_password_async,
+    verify_password_async,
 )
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
@@ -17,19 +30,55 @@ router = APIRouter(prefix="/auth", tags=["Auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many concurrent sign-ins, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _find_user(db: Session, email: str) -> User | None:
+    user = get_user_by_email(db, email)
+    # Detach the user and end the read transaction: its connection goes back
+    # to the pool instead of being held while bcrypt runs (see app.capacity)
+    if user is not None:
+        db.expunge(user)
+    db.rollback()
+    return user
+
+
+# signup/login are async so that, while bcrypt runs in the password pool,
+# they hold no threadpool token; their DB calls still go to the threadpool.
 @router.post("/signup", response_model=UserOut, status_code=201)
-def signup(payload: SignupIn, db: Session = Depends(get_db)):
-    if get_user_by_email(db, payload.email):
+async def signup(payload: SignupIn, db: Session = Depends(get_db)):
+    if await run_in_threadpool(_find_user, db, payload.email):
         raise HTTPException(status_code=400, detail="Email already registered")
-    user = create_user(db, payload.email, hash_password(payload.password))
+    try:
+        password_hash = await hash_password_async(payload.password)
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+    user = await run_in_threadpool(create_user, db, payload.email, password_hash)
     return UserOut.model_validate(user)
 
 
 @router.post("/login")
-def login(form: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = get_user_by_email(db, form.username)
-    if not user or not verify_password(form.password, user.password_hash):
+async def login(
+    form: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+):
+    user = await run_in_threadpool(_find_user, db, form.username)
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    try:
+        valid, new_hash = await verify_password_async(form.password, user.password_hash)
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        # Stored hash predates the current BCRYPT_ROUNDS: upgrade it
+        await run_in_threadpool(update_password_hash, db, user.id, new_hash)
+        metrics.increment("password_rehash_total")
     token = create_access_token(sub=str(user.id))
     return {"access_token": token, "token_type": "bearer"}
 
@@ -37,15 +86,26 @@ def login(form: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get
 def get_current_user(
     token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
 ) -> UserOut:
-    data = decode_token(token)
-    if not data:
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
-    from ..models.user import User
+    data = get_cached_token_payload(token)
+    if data is None:
+        data = decode_token(token)
+        if not data:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        cache_token_payload(token, data)
+
+    user_id = int(data["sub"])
+    cached = get_cached_user(user_id)
+    if cached is not None:
+        return cached
 
-    u = db.get(User, int(data["sub"]))
+    u = db.get(User, user_id)
     if not u:
         raise HTTPException(status_code=401, detail="User not found")
-    return UserOut.model_validate(u)
+    if not u.is_active:
+        raise HTTPException(status_code=401, detail="User is inactive")
+    user = UserOut.model_validate(u)
+    cache_user(user)
+    return user
 
 
 @router.get("/me", response_model=UserOut)
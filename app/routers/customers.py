@@ -1,16 +1,51 @@
 # app/routers/customers.py
-from fastapi import APIRouter, Depends, HTTPException
+import base64
+import binascii
+
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import Response
 from sqlalchemy.orm import Session
 
 from ..deps import get_db
-from ..schemas.customer import CustomerCreate, CustomerOut, CustomerUpdateEmail
+from ..schemas.customer import (
+    CustomerCreate,
+    CustomerOut,
+    CustomerUpdateEmail,
+    CustomerListResponse,
+    CustomerBulkUpsert,
+    CustomerBulkResponse,
+    CustomerDeletionOut,
+)
 from ..repositories.customer_repo import (
     create_customer,
+    upsert_customers_bulk,
     get_customer_by_id,
     get_customers,
     update_customer_email,
     delete_customer,
 )
+from ..conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified,
+    validator_headers,
+)
+from ..response_cache import CUSTOMER_LIST_TAG, customer_tag, lookup
+from ..single_flight import coalesce_requests
+from ..serializers import (
+    CUSTOMER_LIST,
+    CUSTOMER_OUT,
+    FIELDS_QUERY,
+    as_dict,
+    json_response,
+    parse_fields,
+)
+from ..repositories.customer_deletion_repo import (
+    request_customer_deletion,
+    get_customer_deletion,
+)
 
 router = APIRouter()
 
@@ -22,24 +57,131 @@ def health():
 
 @router.post("/customers", response_model=CustomerOut, status_code=201)
 def create_customer_ep(payload: CustomerCreate, db: Session = Depends(get_db)):
+    # Returns the existing customer when the email is already registered
     row = create_customer(db, payload.name, payload.email)
     if row is None:
-        # email already exists
-        raise HTTPException(status_code=409, detail="Email already exists")
+        raise HTTPException(
+            status_code=409, detail="Email belongs to a customer being deleted"
+        )
     return row
 
 
-@router.get("/customers", response_model=list[CustomerOut])
-def list_customers_ep(db: Session = Depends(get_db)):
-    return get_customers(db)
+@router.post("/customers/bulk", response_model=CustomerBulkResponse)
+def upsert_customers_bulk_ep(
+    payload: CustomerBulkUpsert, db: Session = Depends(get_db)
+):
+    """
+    Create or update up to 5000 customers in one statement, matched by email.
+
+    Existing customers get the submitted name. Repeated emails collapse to
+    the last occurrence; one row per distinct email is returned.
+    """
+    rows = upsert_customers_bulk(
+        db, [(item.name, str(item.email)) for item in payload.items]
+    )
+    return CustomerBulkResponse(items=rows, count=len(rows))
+
+
+def _encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        kind, _, value = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().partition(":")
+        )
+        if kind != "id":
+            raise ValueError(kind)
+        return int(value)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/customers", response_model=CustomerListResponse)
+@coalesce_requests()
+def list_customers_ep(
+    request: Request,
+    limit: int = Query(
+        default=100, ge=1, le=1000, description="Number of customers per page"
+    ),
+    cursor: str | None = Query(
+        default=None, description="Cursor from a previous page's next_cursor"
+    ),
+    name: str | None = Query(
+        default=None, description="Filter by name prefix (case-insensitive)"
+    ),
+    email: str | None = Query(
+        default=None, description="Filter by email prefix (case-insensitive)"
+    ),
+    fields: str | None = FIELDS_QUERY,
+    db: Session = Depends(get_db),
+):
+    """
+    List customers ordered by id, with keyset (cursor) pagination.
+
+    - **limit**: Maximum number of customers to return (1-1000, default 100)
+    - **cursor**: `next_cursor` from the previous page (omit for the first page)
+    - **name** / **email**: Case-insensitive prefix filters
+    - **fields**: Only return these customer fields (e.g. `id,name`)
+    """
+    after_id = _decode_cursor(cursor) if cursor else 0
+    selected = parse_fields(CustomerOut, fields)
+
+    cached = lookup(request, CUSTOMER_LIST_TAG)
+    if cached.hit:
+        return cached.hit
+
+    # Fetch one extra row to know whether another page exists
+    rows = get_customers(db, limit + 1, after_id, name, email, fields=selected)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    page = dict(
+        items=[as_dict(CustomerOut, row, selected) for row in rows],
+        limit=limit,
+        next_cursor=_encode_cursor(rows[-1].id) if has_more else None,
+        has_more=has_more,
+    )
+    return cached.store(json_response(CUSTOMER_LIST, page))
 
 
 @router.get("/customers/{customer_id}", response_model=CustomerOut)
-def get_customer_ep(customer_id: int, db: Session = Depends(get_db)):
-    row = get_customer_by_id(db, customer_id)
+@coalesce_requests()
+def get_customer_ep(
+    customer_id: int,
+    request: Request,
+    fields: str | None = FIELDS_QUERY,
+    db: Session = Depends(get_db),
+):
+    """
+    Get a customer. Supports conditional requests: send the `ETag` back as
+    `If-None-Match` (or `Last-Modified` as `If-Modified-Since`) to get an
+    empty 304 when the customer has not changed.
+
+    - **fields**: Only return these customer fields (e.g. `id,name`)
+    """
+    selected = parse_fields(CustomerOut, fields)
+    cached = lookup(request, customer_tag(customer_id))
+    if cached.hit:
+        return cached.hit
+
+    # updated_at versions the response even when it is not returned
+    columns = None if selected is None else ("id", *selected, "updated_at")
+    row = get_customer_by_id(db, customer_id, columns)
     if not row:
         raise HTTPException(status_code=404, detail="Not found")
-    return row
+
+    etag = make_etag("customer", row.id, row.updated_at, selected)
+    headers = validator_headers(etag, row.updated_at)
+    if is_not_modified(request, etag, row.updated_at):
+        return not_modified(headers)
+    return cached.store(
+        json_response(
+            CUSTOMER_OUT, as_dict(CustomerOut, row, selected), headers=headers
+        ),
+        last_modified=row.updated_at,
+    )
 
 
 @router.patch("/customers/{customer_id}", response_model=CustomerOut)
@@ -52,9 +194,48 @@ def update_email_ep(
     return row
 
 
-@router.delete("/customers/{customer_id}", status_code=204)
-def delete_customer_ep(customer_id: int, db: Session = Depends(get_db)):
+@router.delete(
+    "/customers/{customer_id}",
+    status_code=204,
+    responses={202: {"model": CustomerDeletionOut}},
+)
+def delete_customer_ep(
+    customer_id: int,
+    mode: Literal["sync", "async"] = Query(
+        default="sync",
+        description="`async` hides the customer now and deletes its notes in batches",
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Delete a customer and all of its notes.
+
+    - **mode=sync** (default): one transaction, 204 when done
+    - **mode=async**: the customer and its notes disappear from reads and
+      writes immediately; notes are removed by the job worker in small
+      batches. Returns 202 with the progress record, also available at
+      `GET /customers/{id}/deletion`.
+    """
+    if mode == "async":
+        deletion = request_customer_deletion(db, customer_id)
+        if deletion is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        return Response(
+            status_code=202,
+            media_type="application/json",
+            content=CustomerDeletionOut.model_validate(deletion).model_dump_json(),
+        )
+
     ok = delete_customer(db, customer_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Not found")
     return
+
+
+@router.get("/customers/{customer_id}/deletion", response_model=CustomerDeletionOut)
+def get_customer_deletion_ep(customer_id: int, db: Session = Depends(get_db)):
+    """Progress of an asynchronous delete of this customer."""
+    deletion = get_customer_deletion(db, customer_id)
+    if deletion is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return deletion
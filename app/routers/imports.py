@@ -0,0 +1,65 @@
+# app/routers/imports.py
+import io
+from typing import Literal
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from sqlalchemy.orm import Session
+
+from ..deps import get_db
+from ..importer import (
+    DEFAULT_CHUNK_SIZE,
+    ImportFormatError,
+    detect_format,
+    run_import,
+)
+from ..metrics import metrics
+from ..schemas.imports import ImportResult
+from ..schemas.user import UserOut
+from .auth import get_current_user
+
+router = APIRouter(prefix="/import", tags=["Import"])
+
+
+@router.post("/{kind}", response_model=ImportResult)
+def import_endpoint(
+    kind: Literal["customers", "notes"],
+    file: UploadFile = File(..., description="CSV or NDJSON file"),
+    format: Literal["csv", "ndjson"] | None = Query(
+        default=None, description="Input format (detected from file name if omitted)"
+    ),
+    chunk_size: int = Query(
+        default=DEFAULT_CHUNK_SIZE, ge=1, le=50000, description="Rows per chunk"
+    ),
+    db: Session = Depends(get_db),
+    current_user: UserOut = Depends(get_current_user),
+):
+    """
+    Bulk import customers or notes from an uploaded file. Requires authentication.
+
+    - **customers**: columns `name`, `email` (upserted by email)
+    - **notes**: columns `customer_id`, `content` (owned by the current user)
+
+    The upload is streamed and loaded in chunks; each chunk is committed
+    separately. Invalid rows are reported in `errors` by line number.
+    """
+    try:
+        fmt = format or detect_format(file.filename)
+    except ImportFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    try:
+        result = run_import(
+            db, kind, stream, fmt, user_id=current_user.id, chunk_size=chunk_size
+        )
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+    finally:
+        # Leave closing the underlying upload to FastAPI
+        stream.detach()
+
+    # Track metrics
+    metrics.increment(f"import_{kind}_rows_total", result.imported)
+    metrics.increment(f"import_{kind}_errors_total", result.error_count)
+
+    return result
@@ -1,24 +1,55 @@
 # app/routers/notes.py
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from ..conditional import is_not_modified, make_etag, not_modified, validator_headers
 from ..deps import get_db
+from ..exporter import EXPORT_MEDIA_TYPES, iter_notes_csv, iter_notes_ndjson
 from ..metrics import metrics
-from ..schemas.note import NoteCreate, NoteUpdate, NoteOut, NoteListResponse
+from ..response_cache import customer_notes_tag, lookup, note_tag
+from ..single_flight import coalesce_requests
+from ..serializers import (
+    FIELDS_QUERY,
+    NOTE_LIST,
+    NOTE_OUT,
+    as_dict,
+    json_response,
+    parse_fields,
+)
+from ..schemas.note import (
+    NoteCreate,
+    NoteUpdate,
+    NoteOut,
+    NoteListResponse,
+    NoteBulkCreate,
+    NoteBulkError,
+    NoteBulkResponse,
+)
 from ..schemas.user import UserOut
 from ..repositories.note_repo import (
     create_note,
+    create_notes_bulk,
     get_notes_by_customer,
-    count_notes_by_customer,
+    get_notes_version,
     get_note_by_id,
+    note_exists,
     update_note_content,
     delete_note,
 )
-from ..repositories.customer_repo import get_customer_by_id
+from ..repositories.customer_repo import (
+    get_customer_by_id,
+    get_existing_customer_ids,
+)
 from .auth import get_current_user
 
 router = APIRouter(tags=["Notes"])
 
+# Default number of content characters returned by ?view=preview
+PREVIEW_LENGTH = 200
+
 
 @router.post("/customers/{customer_id}/notes", response_model=NoteOut, status_code=201)
 def create_note_endpoint(
@@ -28,13 +59,11 @@ def create_note_endpoint(
     current_user: UserOut = Depends(get_current_user),
 ):
     """Create a new note for a customer. Requires authentication."""
-    # Check if customer exists
-    customer = get_customer_by_id(db, customer_id)
-    if not customer:
-        raise HTTPException(status_code=404, detail="Customer not found")
-
-    # Create note with current user as owner
+    # Create note with current user as owner; a missing customer (or one
+    # being deleted) makes the INSERT ... SELECT write nothing
     note = create_note(db, customer_id, current_user.id, payload.content)
+    if note is None:
+        raise HTTPException(status_code=404, detail="Customer not found")
 
     # Track metric
     metrics.increment("notes_created_total")
@@ -42,9 +71,52 @@ def create_note_endpoint(
     return note
 
 
+@router.post("/notes/bulk", response_model=NoteBulkResponse, status_code=201)
+def create_notes_bulk_endpoint(
+    payload: NoteBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: UserOut = Depends(get_current_user),
+):
+    """
+    Create many notes in a single request. Requires authentication.
+
+    Customers are validated with one query and all valid notes are inserted
+    with one multi-row INSERT in a single transaction. Items referencing a
+    missing customer are reported in `errors` (by their index in the request)
+    and do not prevent the others from being created.
+    """
+    existing = get_existing_customer_ids(
+        db, {item.customer_id for item in payload.items}
+    )
+
+    valid = []
+    errors = []
+    for index, item in enumerate(payload.items):
+        if item.customer_id in existing:
+            valid.append({"customer_id": item.customer_id, "content": item.content})
+        else:
+            errors.append(
+                NoteBulkError(
+                    index=index,
+                    customer_id=item.customer_id,
+                    detail="Customer not found",
+                )
+            )
+
+    notes = create_notes_bulk(db, current_user.id, valid)
+
+    # Track metrics
+    metrics.increment("notes_created_total", len(notes))
+    metrics.increment("notes_bulk_requests_total")
+
+    return NoteBulkResponse(created=notes, errors=errors)
+
+
 @router.get("/customers/{customer_id}/notes", response_model=NoteListResponse)
+@coalesce_requests()
 def list_notes_endpoint(
     customer_id: int,
+    request: Request,
     limit: int = Query(
         default=100, ge=1, le=1000, description="Number of notes per page"
     ),
@@ -52,6 +124,16 @@ def list_notes_endpoint(
     search: str | None = Query(
         default=None, description="Search notes by content (case-insensitive)"
     ),
+    view: Literal["full", "preview"] = Query(
+        default="full", description="`preview` returns only the start of content"
+    ),
+    preview_length: int = Query(
+        default=PREVIEW_LENGTH,
+        ge=1,
+        le=10000,
+        description="Characters of content returned in preview view",
+    ),
+    fields: str | None = FIELDS_QUERY,
     db: Session = Depends(get_db),
 ):
     """
@@ -60,27 +142,134 @@ def list_notes_endpoint(
     - **limit**: Maximum number of notes to return (1-1000, default 100)
     - **offset**: Number of notes to skip (default 0)
     - **search**: Filter notes by content (case-insensitive partial match)
+    - **view**: `full` (default) or `preview`, which returns only the first
+      `preview_length` characters of each note and sets `truncated` when the
+      content was cut; fetch `GET /api/notes/{id}` for the full body
+    - **fields**: Only return these note fields (e.g. `id,created_at`); only
+      the matching columns are read
 
     Returns notes ordered by created_at DESC (newest first).
+
+    Supports `If-None-Match`: polling with the previous `ETag` returns an
+    empty 304 without running the page query when nothing changed.
     """
+    selected = parse_fields(NoteOut, fields)
+    cached = lookup(request, customer_notes_tag(customer_id))
+    if cached.hit:
+        return cached.hit
+
     # Check if customer exists
     customer = get_customer_by_id(db, customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
 
-    # Get total count
-    total = count_notes_by_customer(db, customer_id, search)
+    # Total and latest update in one aggregate; it versions the page too
+    total, last_updated_at = get_notes_version(db, customer_id, search)
+    etag = make_etag(
+        "notes",
+        customer_id,
+        total,
+        last_updated_at,
+        limit,
+        offset,
+        search,
+        view,
+        preview_length if view == "preview" else None,
+        selected,
+    )
+    headers = validator_headers(etag, last_updated_at)
+    # Only the ETag is checked: deleting a note changes the count but not
+    # max(updated_at), so If-Modified-Since could miss it
+    if is_not_modified(request, etag):
+        return not_modified(headers)
 
     # Get notes for current page
-    notes = get_notes_by_customer(db, customer_id, limit, offset, search)
+    notes = get_notes_by_customer(
+        db,
+        customer_id,
+        limit,
+        offset,
+        search,
+        preview_length=preview_length if view == "preview" else None,
+        fields=selected,
+    )
 
-    return NoteListResponse(
-        items=notes,
+    page = dict(
+        items=[as_dict(NoteOut, note, selected) for note in notes],
         total=total,
         limit=limit,
         offset=offset,
         has_more=(offset + len(notes)) < total,
     )
+    return cached.store(json_response(NOTE_LIST, page, headers=headers))
+
+
+@router.get("/customers/{customer_id}/notes/export")
+def export_notes_endpoint(
+    customer_id: int,
+    format: Literal["ndjson", "csv"] = Query(
+        default="ndjson", description="Export format"
+    ),
+    search: str | None = Query(
+        default=None, description="Search notes by content (case-insensitive)"
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Export all notes for a customer as a stream (newest first).
+
+    - **format**: `ndjson` (one note per line) or `csv` (with header row)
+    - **search**: Filter notes by content (case-insensitive partial match)
+
+    Notes are read in keyset batches and streamed one batch at a time, so
+    memory use is constant regardless of how many notes the customer has and
+    no database connection is held while the client downloads.
+    """
+    # Check if customer exists
+    customer = get_customer_by_id(db, customer_id)
+    if not customer:
+        raise HTTPException(status_code=404, detail="Customer not found")
+
+    if format == "csv":
+        body = iter_notes_csv(customer_id, search)
+    else:
+        body = iter_notes_ndjson(customer_id, search)
+
+    filename = f"customer-{customer_id}-notes.{format}"
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/notes/{note_id}", response_model=NoteOut)
+@coalesce_requests()
+def get_note_endpoint(
+    note_id: int,
+    request: Request,
+    fields: str | None = FIELDS_QUERY,
+    db: Session = Depends(get_db),
+):
+    """
+    Get a single note with its full content.
+
+    - **fields**: Only return these note fields (e.g. `id,created_at`)
+    """
+    selected = parse_fields(NoteOut, fields)
+    cached = lookup(request, note_tag(note_id))
+    if cached.hit:
+        return cached.hit
+
+    # customer_id is needed to tag the cached response
+    columns = None if selected is None else (*selected, "customer_id")
+    note = get_note_by_id(db, note_id, columns)
+    if not note:
+        raise HTTPException(status_code=404, detail="Note not found")
+    return cached.store(
+        json_response(NOTE_OUT, as_dict(NoteOut, note, selected)),
+        extra_tags=(customer_notes_tag(note.customer_id),),
+    )
 
 
 @router.put("/notes/{note_id}", response_model=NoteOut)
@@ -91,18 +280,17 @@ def update_note_endpoint(
     current_user: UserOut = Depends(get_current_user),
 ):
     """Update a note. Only the note owner can update it."""
-    note = get_note_by_id(db, note_id)
-    if not note:
-        raise HTTPException(status_code=404, detail="Note not found")
-
-    # Check ownership
-    if note.user_id != current_user.id:
+    # Ownership is enforced by the UPDATE itself; only a miss needs a lookup
+    updated_note = update_note_content(
+        db, note_id, payload.content, user_id=current_user.id
+    )
+    if updated_note is None:
+        if not note_exists(db, note_id):
+            raise HTTPException(status_code=404, detail="Note not found")
         raise HTTPException(
             status_code=403, detail="You can only update your own notes"
         )
 
-    updated_note = update_note_content(db, note_id, payload.content)
-
     # Track metric
     metrics.increment("notes_updated_total")
 
@@ -116,18 +304,14 @@ def delete_note_endpoint(
     current_user: UserOut = Depends(get_current_user),
 ):
     """Delete a note. Only the note owner can delete it."""
-    note = get_note_by_id(db, note_id)
-    if not note:
-        raise HTTPException(status_code=404, detail="Note not found")
-
-    # Check ownership
-    if note.user_id != current_user.id:
+    # Ownership is enforced by the DELETE itself; only a miss needs a lookup
+    if not delete_note(db, note_id, user_id=current_user.id):
+        if not note_exists(db, note_id):
+            raise HTTPException(status_code=404, detail="Note not found")
         raise HTTPException(
             status_code=403, detail="You can only delete your own notes"
         )
 
-    delete_note(db, note_id)
-
     # Track metric
     metrics.increment("notes_deleted_total")
 
@@ -1,6 +1,8 @@
 # app/schemas/customer.py
+from datetime import datetime
+
 from pydantic import BaseModel, EmailStr
-from pydantic import ConfigDict
+from pydantic import ConfigDict, Field
 
 
 class CustomerCreate(BaseModel):
@@ -17,3 +19,40 @@ class CustomerOut(BaseModel):
     id: int
     name: str
     email: EmailStr
+
+
+class CustomerListResponse(BaseModel):
+    """Schema for keyset-paginated customer list responses."""
+
+    items: list[CustomerOut]
+    limit: int
+    # Pass as ?cursor= to fetch the next page; None on the last page
+    next_cursor: str | None
+    has_more: bool
+
+
+class CustomerBulkUpsert(BaseModel):
+    """Schema for upserting many customers (matched by email) at once."""
+
+    items: list[CustomerCreate] = Field(min_length=1, max_length=5000)
+
+
+class CustomerBulkResponse(BaseModel):
+    """Schema for bulk customer upsert responses."""
+
+    items: list[CustomerOut]
+    count: int
+
+
+class CustomerDeletionOut(BaseModel):
+    """Schema for the progress of an asynchronous customer delete."""
+
+    model_config = ConfigDict(from_attributes=True)
+    customer_id: int
+    # pending -> running -> done | failed
+    status: str
+    notes_total: int
+    notes_deleted: int
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,20 @@
+# app/schemas/imports.py
+from pydantic import BaseModel
+
+
+class ImportRowError(BaseModel):
+    """Schema for a rejected row in a bulk import."""
+
+    line: int
+    detail: str
+
+
+class ImportResult(BaseModel):
+    """Schema for bulk import results."""
+
+    kind: str
+    processed: int
+    imported: int
+    error_count: int
+    # Only the first errors are reported to keep the response bounded
+    errors: list[ImportRowError]
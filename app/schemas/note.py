@@ -1,6 +1,6 @@
 # app/schemas/note.py
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class NoteCreate(BaseModel):
@@ -26,6 +26,8 @@ class NoteOut(BaseModel):
     content: str
     created_at: datetime
     updated_at: datetime
+    # True when content is a preview cut short of the full note
+    truncated: bool = False
 
 
 class NoteListResponse(BaseModel):
@@ -36,3 +38,31 @@ class NoteListResponse(BaseModel):
     limit: int
     offset: int
     has_more: bool
+
+
+class NoteBulkItem(BaseModel):
+    """Schema for a single note inside a bulk create request."""
+
+    customer_id: int
+    content: str
+
+
+class NoteBulkCreate(BaseModel):
+    """Schema for creating many notes (possibly for several customers) at once."""
+
+    items: list[NoteBulkItem] = Field(min_length=1, max_length=1000)
+
+
+class NoteBulkError(BaseModel):
+    """Schema for a rejected item in a bulk create request."""
+
+    index: int
+    customer_id: int
+    detail: str
+
+
+class NoteBulkResponse(BaseModel):
+    """Schema for bulk note create responses."""
+
+    created: list[NoteOut]
+    errors: list[NoteBulkError]
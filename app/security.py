@@ -2,10 +2,24 @@ import os
 import time
 import jwt
 
-from passlib.context import CryptContext
+from functools import cache
 from typing import Optional
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt cost factor. Changing it rehashes each user's password on their
+# next successful login (see verify_and_update_password).
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+
+@cache
+def _pwd_context():
+    # passlib is only needed to hash and verify, which mostly happens in the
+    # password pool's processes; keep it off the app's import path
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+    )
+
 
 JWT_SECRET = os.getenv("JWT_SECRET", "dev-secret-change-me")
 JWT_ALG = "HS256"
@@ -13,11 +27,16 @@ JWT_EXP_SECONDS = 60 * 60 * 24  # 24h
 
 
 def hash_password(plain: str) -> str:
-    return pwd_context.hash(plain)
+    return _pwd_context().hash(plain)
 
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    return _pwd_context().verify(plain, hashed)
+
+
+def verify_and_update_password(plain: str, hashed: str) -> tuple[bool, str | None]:
+    """Verify a password; also return a new hash if ``hashed`` uses old settings."""
+    return _pwd_context().verify_and_update(plain, hashed)
 
 
 def create_access_token(sub: str, expires_in: int = JWT_EXP_SECONDS) -> str:
@@ -0,0 +1,123 @@
+"""Fast JSON responses for hot read endpoints.
+
+Returning rows from an endpoint with ``response_model`` makes FastAPI
+validate every field through Pydantic and then encode the result. Rows read
+by the repositories are already well-typed, so the hot GET endpoints skip
+validation: rows become plain dicts and are dumped straight to JSON bytes
+by ``TypeAdapter`` serializers compiled once at import.
+
+The serializers are built over TypedDicts derived from the response models'
+fields, so they always produce the same document as the models. (Building
+model instances with ``model_construct`` costs more than validating.) The
+endpoints keep ``response_model`` so the OpenAPI schema is unchanged. Only
+use this for data read from our own database, never for user input.
+
+Sparse fieldsets (``?fields=id,created_at``) are validated by
+``parse_fields`` and passed to ``as_dict``; the serializers only write the
+keys present, so one adapter covers every subset.
+"""
+
+from functools import cache
+from typing import Any
+
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Row
+from typing_extensions import TypedDict
+
+from .schemas.customer import CustomerListResponse, CustomerOut
+from .schemas.note import NoteListResponse, NoteOut
+
+
+def _row_type(model: type[BaseModel], **overrides: Any) -> type:
+    """A TypedDict with ``model``'s fields (optionally re-typed)."""
+    fields = {name: field.annotation for name, field in model.model_fields.items()}
+    fields.update(overrides)
+    return TypedDict(f"{model.__name__}Row", fields)
+
+
+_NoteRow = _row_type(NoteOut)
+_CustomerRow = _row_type(CustomerOut)
+
+NOTE_OUT = TypeAdapter(_NoteRow)
+NOTE_LIST = TypeAdapter(_row_type(NoteListResponse, items=list[_NoteRow]))
+CUSTOMER_OUT = TypeAdapter(_CustomerRow)
+CUSTOMER_LIST = TypeAdapter(_row_type(CustomerListResponse, items=list[_CustomerRow]))
+
+
+@cache
+def _defaults(model: type[BaseModel]) -> dict[str, Any]:
+    return {
+        name: field.default
+        for name, field in model.model_fields.items()
+        if not field.is_required()
+    }
+
+
+FIELDS_QUERY = Query(
+    default=None,
+    description="Comma-separated fields to return (e.g. `id,created_at`); "
+    "defaults to all",
+)
+
+
+def parse_fields(model: type[BaseModel], fields: str | None) -> tuple[str, ...] | None:
+    """
+    Validate a comma-separated ``?fields=`` value against ``model``.
+
+    Returns the requested field names in schema order, or None for all
+    fields. Unknown or empty selections are a 400.
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",")} - {""}
+    unknown = sorted(requested - model.model_fields.keys())
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid fields: {', '.join(unknown) or '(none)'}. "
+            f"Allowed: {', '.join(model.model_fields)}",
+        )
+    return tuple(name for name in model.model_fields if name in requested)
+
+
+def as_dict(
+    model: type[BaseModel], obj: Any, fields: tuple[str, ...] | None = None
+) -> dict[str, Any]:
+    """
+    ``model``'s fields from a trusted ``Row`` or ORM object, unvalidated.
+
+    With ``fields`` only those keys are returned (see ``parse_fields``).
+    """
+    if fields is not None:
+        defaults = _defaults(model)
+        return {
+            name: getattr(obj, name) if hasattr(obj, name) else defaults[name]
+            for name in fields
+        }
+    if isinstance(obj, Row):
+        data = obj._asdict()
+    else:
+        data = {
+            name: getattr(obj, name)
+            for name in model.model_fields
+            if hasattr(obj, name)
+        }
+    for name, default in _defaults(model).items():
+        data.setdefault(name, default)
+    return data
+
+
+def json_response(
+    adapter: TypeAdapter,
+    value: Any,
+    status_code: int = 200,
+    headers: dict | None = None,
+) -> Response:
+    """Serialize ``value`` with a precompiled adapter into a JSON response."""
+    return Response(
+        content=adapter.dump_json(value),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
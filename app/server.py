@@ -0,0 +1,211 @@
+"""Production server launcher: a pre-forking supervisor around uvicorn.
+
+    python -m app.server
+
+The parent imports the app once, binds the listening socket and forks
+``WEB_CONCURRENCY`` workers that all accept on it. Forking after the import
+shares the already-loaded modules between workers (copy-on-write) and makes
+a broken build fail once, in the parent, rather than in every worker. The
+lifespan (job worker, password pool, ...) runs in each worker after the
+fork, so no connection, thread or pool is shared across processes.
+
+Settings (environment):
+
+- ``WEB_CONCURRENCY``: number of workers; defaults to the CPUs this
+  container may use (cgroup CPU quota, then CPU affinity; see
+  ``app.capacity``)
+- ``HOST`` / ``PORT``: bind address (``0.0.0.0:8000``)
+- ``SERVER_MAX_REQUESTS``: recycle a worker after this many requests to
+  contain slow leaks (0 disables); ``SERVER_MAX_REQUESTS_JITTER`` spreads
+  the restarts so workers do not all recycle at once
+- ``SERVER_GRACEFUL_TIMEOUT``: seconds in-flight requests get to finish on
+  shutdown before workers are killed
+
+uvloop and httptools are used when installed (uvicorn's ``auto`` choice).
+On SIGTERM/SIGINT the supervisor stops respawning, asks every worker to
+finish its in-flight requests and exits once they are gone. Platforms
+without ``fork`` (Windows) run a single in-process server instead.
+"""
+
+import importlib.util
+import logging
+import os
+import random
+import signal
+import socket
+import time
+
+import uvicorn
+
+from .capacity import default_workers
+
+logger = logging.getLogger("app.server")
+
+# In a container the server must listen on all interfaces
+HOST = os.getenv("HOST", "0.0.0.0")  # nosec B104
+PORT = int(os.getenv("PORT", "8000"))
+MAX_REQUESTS = int(os.getenv("SERVER_MAX_REQUESTS", "10000"))
+MAX_REQUESTS_JITTER = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", "1000"))
+GRACEFUL_TIMEOUT = float(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+
+# uvicorn exits with this code when the app fails to start
+STARTUP_FAILURE = 3
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    """
+    Bind the shared listening socket.
+
+    ``uvicorn.Config.bind_socket`` creates it with ``proto=0``, which the
+    accepted connections inherit; asyncio only enables TCP_NODELAY on
+    sockets whose proto is IPPROTO_TCP, so every keep-alive response would
+    wait ~40ms on a delayed ACK.
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Supervisor:
+    """Forks uvicorn workers sharing one socket and keeps ``workers`` alive."""
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        workers: int,
+        max_requests: int = MAX_REQUESTS,
+        max_requests_jitter: int = MAX_REQUESTS_JITTER,
+        graceful_timeout: float = GRACEFUL_TIMEOUT,
+    ):
+        self.config = config
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.children: set[int] = set()
+        self._stopping = False
+        self._exit_code = 0
+
+    def run(self) -> int:
+        # Import the app (and fail fast on errors) before forking
+        self.config.load()
+        sock = bind_socket(self.config.host, self.config.port, self.config.backlog)
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+        http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+        logger.info(
+            f"Starting {self.workers} workers on {self.config.host}:{self.config.port}"
+            f" (loop={loop}, http={http})"
+        )
+        for _ in range(self.workers):
+            self._spawn(sock)
+        while not self._stopping:
+            self._reap(sock)
+            time.sleep(0.5)
+        self._shutdown()
+        sock.close()
+        return self._exit_code
+
+    def _handle_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def _spawn(self, sock) -> None:
+        pid = os.fork()
+        if pid:
+            self.children.add(pid)
+            return
+        # Worker: default signal handling until uvicorn installs its own
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        code = 1
+        try:
+            code = self._serve(sock)
+        finally:
+            os._exit(code)
+
+    def _serve(self, sock) -> int:
+        from .database import engine
+
+        # Never reuse connections opened before the fork
+        engine.dispose(close=False)
+        if self.max_requests > 0:
+            # Only spreads worker restarts; not used for anything secret
+            jitter = random.randint(0, self.max_requests_jitter)  # nosec B311
+            self.config.limit_max_requests = self.max_requests + jitter
+        server = uvicorn.Server(self.config)
+        server.run(sockets=[sock])
+        return 0 if server.started else STARTUP_FAILURE
+
+    def _reap(self, sock) -> None:
+        while self.children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if not pid:
+                return
+            self.children.discard(pid)
+            code = os.waitstatus_to_exitcode(status)
+            if code == STARTUP_FAILURE:
+                logger.error(f"Worker {pid} failed to start; shutting down")
+                self._stopping = True
+                self._exit_code = STARTUP_FAILURE
+                return
+            if code == 0:
+                logger.info(f"Worker {pid} recycled")
+            else:
+                logger.warning(f"Worker {pid} exited with {code}; restarting")
+            if not self._stopping:
+                self._spawn(sock)
+
+    def _shutdown(self) -> None:
+        logger.info(f"Stopping {len(self.children)} workers")
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + self.graceful_timeout
+        while self.children and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid:
+                self.children.discard(pid)
+            else:
+                time.sleep(0.1)
+        for pid in self.children:
+            logger.warning(f"Worker {pid} did not stop in time; killing it")
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except ProcessLookupError:
+                pass
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    config = uvicorn.Config(
+        "app.main:app",
+        host=HOST,
+        port=PORT,
+        loop="auto",
+        http="auto",
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+        # Ours is the only access log (RequestLoggingMiddleware)
+        access_log=False,
+    )
+    if not hasattr(os, "fork"):
+        uvicorn.Server(config).run()
+        return
+    raise SystemExit(Supervisor(config, default_workers()).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Coalescing of identical concurrent GET requests ("single flight").
+
+When many clients open the same page at once, the first request (the
+leader) runs the handler; identical requests arriving while it is in flight
+wait for its response instead of repeating the same queries. Requests are
+identical when they share the method, path, query string, conditional
+headers (``If-None-Match`` / ``If-Modified-Since``) and auth scope.
+
+Followers wait at most ``SINGLE_FLIGHT_WAIT_SECONDS`` and then run the
+handler themselves, so a slow leader never holds them longer than that.
+Set it to 0 to disable coalescing. Exceptions raised by the leader (e.g. a
+404 ``HTTPException``) are raised to its followers as well.
+
+Coalescing happens on the event loop, before the threadpool: only the
+leader takes a threadpool token (and a database connection) to run the sync
+endpoint. Followers wait on a future and hold neither, so one hot key
+cannot use up the threadpool (see ``app.capacity``) and stall unrelated
+requests.
+
+This sits in front of the response cache: it covers the window where a hot
+entry is missing and every concurrent request would otherwise rebuild it.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+from .metrics import metrics
+from .response_cache import cache_key
+
+SINGLE_FLIGHT_WAIT_SECONDS = float(os.getenv("SINGLE_FLIGHT_WAIT_SECONDS", "5"))
+
+
+class _Call:
+    def __init__(self):
+        self.result: Any = None
+        self.error: BaseException | None = None
+        # Followers' futures, each bound to its own event loop
+        self.waiters: list[asyncio.Future] = []
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class SingleFlight:
+    """Runs one call per key at a time and shares its outcome with waiters."""
+
+    def __init__(self, wait_timeout: float):
+        self.wait_timeout = wait_timeout
+        self._calls: dict[str, _Call] = {}
+        # TestClient may run requests on several event loops at once
+        self._lock = threading.Lock()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """
+        Return ``(await fn(), shared)``.
+
+        ``shared`` is True when the result came from another request's call.
+        """
+        if self.wait_timeout <= 0:
+            return await fn(), False
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                waiter = asyncio.get_running_loop().create_future()
+                call.waiters.append(waiter)
+
+        if leader:
+            metrics.increment("single_flight_leaders_total")
+            try:
+                call.result = await fn()
+                return call.result, False
+            except BaseException as exc:
+                call.error = exc
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                for waiter in call.waiters:
+                    waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+
+        start = time.perf_counter()
+        finished, _ = await asyncio.wait([waiter], timeout=self.wait_timeout)
+        metrics.record_duration(
+            "single_flight_wait_seconds", time.perf_counter() - start
+        )
+        if not finished:
+            with self._lock:
+                if waiter in call.waiters:
+                    call.waiters.remove(waiter)
+            metrics.increment("single_flight_wait_timeouts_total")
+            return await fn(), False
+        if isinstance(call.error, asyncio.CancelledError):
+            # The leader's client went away; that is not our outcome
+            return await fn(), False
+        metrics.increment("single_flight_coalesced_total")
+        if call.error is not None:
+            raise call.error
+        return call.result, True
+
+
+flight = SingleFlight(SINGLE_FLIGHT_WAIT_SECONDS)
+
+
+def _request_key(request: Request, scope: str) -> str:
+    return "|".join(
+        (
+            request.method,
+            cache_key(request),
+            request.headers.get("if-none-match", ""),
+            request.headers.get("if-modified-since", ""),
+            scope,
+        )
+    )
+
+
+def _copy(response: Response) -> Response:
+    # Every request gets its own response object
+    return Response(
+        content=response.body,
+        status_code=response.status_code,
+        headers={k: v for k, v in response.headers.items() if k != "content-length"},
+        media_type=response.media_type,
+    )
+
+
+def coalesce_requests(scope: Callable[[Request], str] | None = None):
+    """
+    Decorate a sync GET endpoint so identical concurrent requests share one run.
+
+    The decorated endpoint becomes async: requests are coalesced on the event
+    loop and only the leader runs the endpoint, in the threadpool. The
+    endpoint must take a ``request: Request`` parameter. Leave ``scope``
+    unset only when the response does not depend on who is asking;
+    otherwise pass a function returning the caller's scope (e.g. user id),
+    which becomes part of the key.
+    """
+
+    def decorator(endpoint: Callable[..., Response]) -> Callable[..., Any]:
+        @functools.wraps(endpoint)
+        async def wrapper(*args: Any, **kwargs: Any) -> Response:
+            request: Request = kwargs["request"]
+            key = _request_key(request, scope(request) if scope else "")
+            response, shared = await flight.do(
+                key, lambda: run_in_threadpool(endpoint, *args, **kwargs)
+            )
+            return _copy(response) if shared else response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,136 @@
+"""Startup warm-up and the readiness flag.
+
+A fresh process pays several one-off costs on its first requests: opening
+database connections, SQLAlchemy compiling each statement shape, the first
+pass through the serializers and spawning the password-hashing processes.
+``warm_up`` pays them during the app lifespan, before the worker accepts
+traffic, so the first user after a deploy gets a warm process.
+
+Every step is best-effort. A failing step is logged and skipped; startup
+never fails because of warm-up. Steps are timed as ``warmup_<step>_seconds``
+durations in ``/api/metrics``.
+
+``/api/ready`` reports the readiness flag. It is set once warm-up finishes
+and cleared when shutdown starts, so load balancers and health checks can
+route only to warm, live workers. Set ``WARMUP_ENABLED=false`` to skip
+warm-up (the flag is still set).
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import text
+
+from .database import SessionLocal, engine
+from .metrics import metrics
+from .models.user import User
+from .password_pool import start_password_pool
+from .repositories import customer_repo, note_repo, user_repo
+from .schemas.customer import CustomerOut
+from .schemas.note import NoteOut
+from .serializers import CUSTOMER_LIST, NOTE_LIST, as_dict
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+# Connections opened up front (at most the pool size)
+WARMUP_POOL_CONNECTIONS = int(os.getenv("WARMUP_POOL_CONNECTIONS", "4"))
+
+_ready = threading.Event()
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def mark_ready() -> None:
+    _ready.set()
+
+
+def mark_not_ready() -> None:
+    _ready.clear()
+
+
+def _connect_pool() -> None:
+    size = engine.pool.size() if hasattr(engine.pool, "size") else 1
+    connections = []
+    try:
+        for _ in range(max(1, min(WARMUP_POOL_CONNECTIONS, size))):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        # Returned to the pool, which keeps them open
+        for connection in connections:
+            connection.close()
+
+
+def _compile_statements() -> None:
+    # Run the hot read shapes once against an id that matches nothing;
+    # SQLAlchemy caches each compiled statement for later requests
+    with SessionLocal() as db:
+        customer_repo.get_customer_by_id(db, 0)
+        customer_repo.get_customers(db, limit=1, after_id=0)
+        customer_repo.get_existing_customer_ids(db, {0})
+        note_repo.get_notes_version(db, 0, None)
+        note_repo.get_notes_by_customer(db, 0, limit=1)
+        note_repo.get_notes_by_customer(db, 0, limit=1, preview_length=1)
+        note_repo.get_note_by_id(db, 0)
+        user_repo.get_user_by_email(db, "warmup@invalid")
+        db.get(User, 0)
+
+
+def _prime_serializers() -> None:
+    now = datetime.now(timezone.utc)
+    note = dict(
+        id=0, customer_id=0, user_id=0, content="", created_at=now, updated_at=now
+    )
+    customer = dict(id=0, name="", email="warmup@example.com")
+    NOTE_LIST.dump_json(
+        dict(
+            items=[as_dict(NoteOut, note)],
+            total=1,
+            limit=1,
+            offset=0,
+            has_more=False,
+        )
+    )
+    CUSTOMER_LIST.dump_json(
+        dict(
+            items=[as_dict(CustomerOut, customer)],
+            limit=1,
+            next_cursor=None,
+            has_more=False,
+        )
+    )
+
+
+WARMUP_STEPS: dict[str, Callable[[], None]] = {
+    "pool": _connect_pool,
+    "statements": _compile_statements,
+    "serializers": _prime_serializers,
+    "password_pool": start_password_pool,
+}
+
+
+def warm_up() -> float:
+    """Run every warm-up step; returns the total seconds spent."""
+    start = time.perf_counter()
+    for name, step in WARMUP_STEPS.items():
+        step_start = time.perf_counter()
+        try:
+            step()
+        except Exception as exc:
+            logger.warning(f"Warm-up step {name} failed: {exc}")
+            continue
+        metrics.record_duration(
+            f"warmup_{name}_seconds", time.perf_counter() - step_start
+        )
+    total = time.perf_counter() - start
+    metrics.record_duration("warmup_total_seconds", total)
+    logger.info(f"Warm-up finished in {total:.3f}s")
+    return total
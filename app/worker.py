@@ -0,0 +1,230 @@
+"""Background job worker.
+
+Polls the ``jobs`` table and runs due jobs on a thread pool, at most
+``JobType.concurrency`` of each type at a time per worker process. Failed
+jobs are retried with exponential backoff; jobs held by a worker that
+stopped heartbeating are returned to the queue.
+
+Run it as its own process::
+
+    python -m app.worker
+
+or inside the API process by setting ``RUN_JOB_WORKER=true`` (see the app
+lifespan in ``app.main``). Several workers can share one database: on
+Postgres jobs are claimed with ``FOR UPDATE SKIP LOCKED``.
+"""
+
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+
+from . import customer_purge  # noqa: F401  (registers job handlers)
+from .database import SessionLocal
+from .jobs import JOB_TYPES, JobType
+from .metrics import metrics
+from .models.job import Job
+from .repositories.job_repo import (
+    claim_jobs,
+    complete_job,
+    fail_job,
+    queue_depths,
+    requeue_stale_jobs,
+    touch_jobs,
+    utcnow,
+)
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1.0"))
+# A running job whose lock is older than this is assumed orphaned
+STALE_JOB_TIMEOUT_SECONDS = float(os.getenv("JOB_STALE_TIMEOUT_SECONDS", "300"))
+# How often to heartbeat running jobs, requeue stale ones and sample depths
+HOUSEKEEPING_INTERVAL_SECONDS = 15.0
+
+
+class Worker:
+    """Claims due jobs and runs them, honouring per-type concurrency limits."""
+
+    def __init__(
+        self,
+        worker_id: str | None = None,
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+        stale_timeout: float = STALE_JOB_TIMEOUT_SECONDS,
+    ):
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        )
+        self.poll_interval = poll_interval
+        self.stale_timeout = stale_timeout
+        self._running: dict[str, set[int]] = {name: set() for name in JOB_TYPES}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def max_connections(self) -> int:
+        """Database connections this worker may hold at once."""
+        # One per job thread plus the poll loop's
+        return sum(t.concurrency for t in JOB_TYPES.values()) + 1
+
+    def run_pending(self) -> int:
+        """
+        Run due jobs inline until none are left; returns how many ran.
+
+        Used by tests and one-off maintenance commands.
+        """
+        ran = 0
+        while True:
+            claimed = 0
+            for job_type in JOB_TYPES.values():
+                with SessionLocal() as db:
+                    jobs = claim_jobs(db, job_type.name, 1, self.worker_id)
+                for job in jobs:
+                    self._run(job_type, job)
+                claimed += len(jobs)
+            if not claimed:
+                return ran
+            ran += claimed
+
+    def poll_once(self) -> int:
+        """Claim due jobs into free slots and submit them to the pool."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=sum(t.concurrency for t in JOB_TYPES.values()) or 1,
+                thread_name_prefix="job-worker",
+            )
+        submitted = 0
+        for job_type in JOB_TYPES.values():
+            with self._lock:
+                running = self._running.setdefault(job_type.name, set())
+                free = job_type.concurrency - len(running)
+            if free <= 0:
+                continue
+            with SessionLocal() as db:
+                jobs = claim_jobs(db, job_type.name, free, self.worker_id)
+            for job in jobs:
+                with self._lock:
+                    running.add(job.id)
+                self._executor.submit(self._run, job_type, job)
+            submitted += len(jobs)
+        return submitted
+
+    def wait_idle(self) -> None:
+        """Block until every job submitted by ``poll_once`` has finished."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _run(self, job_type: JobType, job: Job) -> None:
+        run_at = job.run_at
+        if run_at.tzinfo is None:  # SQLite drops the offset
+            run_at = run_at.replace(tzinfo=timezone.utc)
+        metrics.record_duration(
+            f"job_queue_latency_{job_type.name}",
+            (utcnow() - run_at).total_seconds(),
+        )
+        start = time.perf_counter()
+        try:
+            job_type.handler(job.payload)
+        except Exception as exc:
+            logger.error(
+                f"Job {job.id} ({job_type.name}) attempt {job.attempts} failed: {exc}",
+                exc_info=True,
+                extra={"job_id": job.id, "job_type": job_type.name},
+            )
+            with SessionLocal() as db:
+                status = fail_job(db, job, str(exc), job_type.backoff)
+            if status is None:
+                self._lease_lost(job_type, job)
+            else:
+                outcome = "retried" if status == "queued" else "failed"
+                metrics.increment(f"jobs_{outcome}_total_{job_type.name}")
+        else:
+            with SessionLocal() as db:
+                done = complete_job(db, job)
+            if done:
+                metrics.increment(f"jobs_completed_total_{job_type.name}")
+            else:
+                self._lease_lost(job_type, job)
+        finally:
+            metrics.record_duration(
+                f"job_duration_{job_type.name}", time.perf_counter() - start
+            )
+            with self._lock:
+                self._running.get(job_type.name, set()).discard(job.id)
+
+    def _lease_lost(self, job_type: JobType, job: Job) -> None:
+        # The job went stale and was re-queued; its current owner records it
+        logger.warning(
+            f"Job {job.id} ({job_type.name}) finished after its lease was lost",
+            extra={"job_id": job.id, "job_type": job_type.name},
+        )
+        metrics.increment(f"jobs_lease_lost_total_{job_type.name}")
+
+    def _housekeeping(self) -> None:
+        with self._lock:
+            running = [job_id for ids in self._running.values() for job_id in ids]
+        with SessionLocal() as db:
+            # Heartbeat first so our own long-running jobs are never requeued
+            if running:
+                touch_jobs(db, running, self.worker_id)
+            requeued, failed = requeue_stale_jobs(db, self.stale_timeout)
+            depths = queue_depths(db)
+        if requeued:
+            metrics.increment("jobs_requeued_stale_total", requeued)
+        if failed:
+            logger.error(f"Failed {failed} stale job(s) that ran out of attempts")
+            metrics.increment("jobs_failed_stale_total", failed)
+        for name in JOB_TYPES:
+            metrics.set_gauge(f"job_queue_depth_{name}", depths.get(name, 0))
+
+    def run_forever(self) -> None:
+        """Poll until ``stop()`` is called, then wait for running jobs."""
+        logger.info(f"Job worker {self.worker_id} started: {sorted(JOB_TYPES)}")
+        next_housekeeping = 0.0
+        while not self._stop.is_set():
+            try:
+                if time.monotonic() >= next_housekeeping:
+                    self._housekeeping()
+                    next_housekeeping = time.monotonic() + HOUSEKEEPING_INTERVAL_SECONDS
+                self.poll_once()
+            except Exception as exc:
+                # Keep polling through transient database errors
+                logger.error(f"Job worker poll failed: {exc}", exc_info=True)
+            self._stop.wait(self.poll_interval)
+        self.wait_idle()
+        logger.info(f"Job worker {self.worker_id} stopped")
+
+    def start(self) -> None:
+        """Run the poll loop on a daemon thread (used by the app lifespan)."""
+        self._thread = threading.Thread(
+            target=self.run_forever, name="job-worker", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    worker = Worker()
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    signal.signal(signal.SIGINT, lambda *_: worker.stop())
+    worker.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,23 @@
-# Ensure our local 'app' package is imported instead of any third-party package
-# named 'app' that may be present in the environment (e.g., on CI images).
 from __future__ import annotations
 
-import sys
 import os
-from pathlib import Path
-import importlib.util
+import uuid
+from contextlib import contextmanager
+
 import pytest
 
 # Set testing environment variable BEFORE any imports
 os.environ["TESTING"] = "true"
+# Minimum bcrypt cost keeps auth-heavy tests fast
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+# Keep admission control in the stack with a fixed, generous limit; its
+# adaptive behaviour is tested with dedicated controllers
+os.environ.setdefault("ADMISSION_INITIAL_LIMIT", "1000")
+os.environ.setdefault("ADMISSION_MIN_LIMIT", "1000")
+os.environ.setdefault("ADMISSION_MAX_LIMIT", "1000")
 
-PROJECT_ROOT = Path(__file__).resolve().parent
-if str(PROJECT_ROOT) not in sys.path:
-    sys.path.insert(0, str(PROJECT_ROOT))
-
-# If some foreign 'app' is already imported, drop it to avoid shadowing
-if "app" in sys.modules:
-    try:
-        mod = sys.modules["app"]
-        mod_file = getattr(mod, "__file__", "") or ""
-        if str(PROJECT_ROOT).replace("\\", "/") not in mod_file.replace("\\", "/"):
-            del sys.modules["app"]
-    except Exception:
-        del sys.modules["app"]
-
-# Explicitly load our local 'app' package from path to guarantee resolution
-app_init_path = PROJECT_ROOT / "app" / "__init__.py"
-if app_init_path.exists():
-    spec = importlib.util.spec_from_file_location(
-        "app",
-        str(app_init_path),
-        submodule_search_locations=[str(app_init_path.parent)],
-    )
-    if spec and spec.loader:
-        app_module = importlib.util.module_from_spec(spec)
-        sys.modules["app"] = app_module
-        spec.loader.exec_module(app_module)
+# pytest.ini's `pythonpath = .` puts the repo root first on sys.path, so the
+# local 'app' package wins over any third-party package of the same name
 
 
 def pytest_configure(config):
@@ -51,6 +32,8 @@ def pytest_configure(config):
     from app.models import user  # noqa: F401
     from app.models import customer  # noqa: F401
     from app.models import note  # noqa: F401
+    from app.models import customer_deletion  # noqa: F401
+    from app.models import job  # noqa: F401
 
     # Add SQLite compatibility for PostgreSQL functions
     if str(database.engine.url).startswith("sqlite"):
@@ -64,9 +47,12 @@ def pytest_configure(config):
             cursor.execute("PRAGMA foreign_keys=ON")
             cursor.close()
 
-            # Add now() function
+            # Add now() function, in the format SQLAlchemy binds datetimes
+            # in so values compare correctly with query parameters
             dbapi_conn.create_function(
-                "now", 0, lambda: datetime.now(timezone.utc).isoformat()
+                "now",
+                0,
+                lambda: datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f"),
             )
             # Add true/false for boolean defaults
             dbapi_conn.create_function("true", 0, lambda: 1)
@@ -107,12 +93,20 @@ def cleanup_test_database():
 def clean_database():
     """Clean all data from tables before each test."""
     from app import database
-    from app.models import note, customer, user
+    from app.auth_cache import clear_auth_caches
+    from app.models import note, customer, customer_deletion, job, user
+    from app.response_cache import clear_response_cache
 
     yield  # Run the test first
 
+    # SQLite reuses ids, so cached users and responses must not outlive their rows
+    clear_auth_caches()
+    clear_response_cache()
+
     # Clean up after test
     with database.SessionLocal() as db:
+        db.query(job.Job).delete()
+        db.query(customer_deletion.CustomerDeletion).delete()
         db.query(note.Note).delete()
         db.query(customer.Customer).delete()
         db.query(user.User).delete()
@@ -127,3 +121,57 @@ def client():
 
     with TestClient(app) as test_client:
         yield test_client
+
+
+@pytest.fixture
+def auth_headers(client) -> dict:
+    """Authorization header of a freshly signed-up and logged-in user."""
+    user = {"email": f"user_{uuid.uuid4().hex[:12]}@test.com", "password": "pw123456"}
+    assert client.post("/api/auth/signup", json=user).status_code == 201
+    r = client.post(
+        "/api/auth/login",
+        data={"username": user["email"], "password": user["password"]},
+    )
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+@pytest.fixture
+def customer_id(client) -> int:
+    """Id of a freshly created customer named "Test Customer"."""
+    r = client.post(
+        "/api/customers",
+        json={
+            "name": "Test Customer",
+            "email": f"cust_{uuid.uuid4().hex[:12]}@test.com",
+        },
+    )
+    assert r.status_code == 201
+    return r.json()["id"]
+
+
+@pytest.fixture
+def sql_statements():
+    """
+    Record the SQL run on the engine:
+
+        with sql_statements() as statements:
+            client.get(...)
+    """
+    from sqlalchemy import event
+
+    from app import database
+
+    @contextmanager
+    def record_statements():
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(database.engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(database.engine, "before_cursor_execute", record)
+
+    return record_statements
@@ -6,5 +6,5 @@ if [ "$SKIP_MIGRATIONS" != "1" ]; then
   alembic upgrade head
 fi
 
-# start API
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000
+# start API: one worker per available CPU (override with WEB_CONCURRENCY)
+exec python -m app.server
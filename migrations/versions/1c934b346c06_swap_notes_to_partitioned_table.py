@@ -0,0 +1,159 @@
+"""swap notes to the partitioned table (optional notes_partitioning branch)
+
+Revision ID: 1c934b346c06
+Revises: 626cb009e73e
+Create Date: 2026-10-19 11:30:00.000000
+
+Run only after ``python -m scripts.partition_notes backfill`` has finished
+(it marks notes_p as complete); the upgrade refuses to run otherwise. The
+swap is a handful of renames under a brief ACCESS EXCLUSIVE lock. The old
+table is kept as ``notes_unpartitioned`` for rollback and can be dropped
+once the new layout has been verified.
+
+After the swap, lookups by note id alone (``GET/PUT/DELETE /api/notes/{id}``)
+cannot be pruned and probe every partition's primary key; see
+``app.query_audit.UNPRUNED_NOTE_QUERIES``.
+
+    alembic upgrade notes_partitioning@head
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1c934b346c06"
+down_revision: Union[str, Sequence[str], None] = "626cb009e73e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_COMPLETE = "backfill complete"
+
+# (old name, name while parked) for objects whose names must move over
+_RENAMES = [
+    ("INDEX", "pk_notes", "pk_notes_unpartitioned"),
+    (
+        "INDEX",
+        "ix_notes_customer_created_id",
+        "ix_notes_unpartitioned_customer_created_id",
+    ),
+    ("INDEX", "ix_notes_user_id", "ix_notes_unpartitioned_user_id"),
+]
+_PROMOTE = [
+    ("INDEX", "pk_notes_p", "pk_notes"),
+    ("INDEX", "ix_notes_p_customer_created_id", "ix_notes_customer_created_id"),
+    ("INDEX", "ix_notes_p_user_id", "ix_notes_user_id"),
+]
+
+# Same function as revision 626cb009e73e, recreated on downgrade
+_MIRROR_FUNCTION = """
+CREATE FUNCTION notes_mirror_to_partitioned() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        DELETE FROM notes_p
+        WHERE id = OLD.id AND customer_id = OLD.customer_id;
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+    INSERT INTO notes_p
+        (id, customer_id, user_id, content, created_at, updated_at)
+    VALUES
+        (NEW.id, NEW.customer_id, NEW.user_id, NEW.content,
+         NEW.created_at, NEW.updated_at);
+    RETURN NEW;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    """Swap notes_p in as notes, keeping the old table as notes_unpartitioned."""
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF coalesce(obj_description('notes_p'::regclass, 'pg_class'), '')
+                    <> '{BACKFILL_COMPLETE}' THEN
+                RAISE EXCEPTION 'notes_p is not backfilled; run '
+                    'python -m scripts.partition_notes backfill first';
+            END IF;
+        END
+        $$
+        """
+    )
+    op.execute("LOCK TABLE notes, notes_p IN ACCESS EXCLUSIVE MODE")
+    op.execute("DROP TRIGGER notes_mirror ON notes")
+    op.execute("DROP FUNCTION notes_mirror_to_partitioned()")
+
+    op.execute("ALTER TABLE notes RENAME TO notes_unpartitioned")
+    for kind, old, new in _RENAMES:
+        op.execute(f"ALTER {kind} IF EXISTS {old} RENAME TO {new}")
+
+    op.execute("ALTER TABLE notes_p RENAME TO notes")
+    for kind, old, new in _PROMOTE:
+        op.execute(f"ALTER {kind} {old} RENAME TO {new}")
+    op.execute(
+        "ALTER TABLE notes RENAME CONSTRAINT fk_notes_p_customer_id_customers "
+        "TO fk_notes_customer_id_customers"
+    )
+    op.execute(
+        "ALTER TABLE notes RENAME CONSTRAINT fk_notes_p_user_id_users "
+        "TO fk_notes_user_id_users"
+    )
+    op.execute("ALTER SEQUENCE notes_id_seq OWNED BY notes.id")
+
+
+def downgrade() -> None:
+    """
+    Swap the unpartitioned table back in.
+
+    Rows written since the swap are copied back first, under the same lock,
+    so this takes as long as the delta since the upgrade.
+    """
+    op.execute("LOCK TABLE notes, notes_unpartitioned IN ACCESS EXCLUSIVE MODE")
+    op.execute(
+        "DELETE FROM notes_unpartitioned u WHERE NOT EXISTS "
+        "(SELECT 1 FROM notes n WHERE n.id = u.id)"
+    )
+    op.execute(
+        """
+        INSERT INTO notes_unpartitioned
+            (id, customer_id, user_id, content, created_at, updated_at)
+        SELECT id, customer_id, user_id, content, created_at, updated_at
+        FROM notes
+        ON CONFLICT (id) DO UPDATE SET
+            customer_id = EXCLUDED.customer_id,
+            user_id = EXCLUDED.user_id,
+            content = EXCLUDED.content,
+            created_at = EXCLUDED.created_at,
+            updated_at = EXCLUDED.updated_at
+        """
+    )
+
+    op.execute(
+        "ALTER TABLE notes RENAME CONSTRAINT fk_notes_customer_id_customers "
+        "TO fk_notes_p_customer_id_customers"
+    )
+    op.execute(
+        "ALTER TABLE notes RENAME CONSTRAINT fk_notes_user_id_users "
+        "TO fk_notes_p_user_id_users"
+    )
+    for kind, old, new in reversed(_PROMOTE):
+        op.execute(f"ALTER {kind} {new} RENAME TO {old}")
+    op.execute("ALTER TABLE notes RENAME TO notes_p")
+
+    for kind, old, new in reversed(_RENAMES):
+        op.execute(f"ALTER {kind} IF EXISTS {new} RENAME TO {old}")
+    op.execute("ALTER TABLE notes_unpartitioned RENAME TO notes")
+    op.execute("ALTER SEQUENCE notes_id_seq OWNED BY notes.id")
+
+    # Both tables now hold the same rows: restore the mirror trigger so
+    # notes_p stays a complete copy (the state revision 626cb009e73e leaves)
+    op.execute(_MIRROR_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER notes_mirror AFTER INSERT OR UPDATE OR DELETE ON notes "
+        "FOR EACH ROW EXECUTE FUNCTION notes_mirror_to_partitioned()"
+    )
@@ -0,0 +1,61 @@
+"""add async customer deletion
+
+Revision ID: 2f2ca1e2c49d
+Revises: 3109fc97f4cb
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2f2ca1e2c49d"
+down_revision: Union[str, Sequence[str], None] = "3109fc97f4cb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nullable with no default: a metadata-only change, no table rewrite
+    op.add_column(
+        "customers",
+        sa.Column("delete_requested_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_table(
+        "customer_deletions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("customer_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "status", sa.String(length=16), server_default="pending", nullable=False
+        ),
+        sa.Column("notes_total", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("notes_deleted", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_customer_deletions")),
+        sa.UniqueConstraint(
+            "customer_id", name=op.f("uq_customer_deletions_customer_id")
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("customer_deletions")
+    op.drop_column("customers", "delete_requested_at")
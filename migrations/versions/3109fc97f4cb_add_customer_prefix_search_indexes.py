@@ -0,0 +1,48 @@
+"""add customer prefix search indexes
+
+Revision ID: 3109fc97f4cb
+Revises: 524823069020
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3109fc97f4cb"
+down_revision: Union[str, Sequence[str], None] = "524823069020"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serve case-insensitive LIKE 'prefix%' filters on the customer listing;
+    # built without blocking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_customers_name_lower",
+            "customers",
+            [sa.text("lower(name) text_pattern_ops")],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_customers_email_lower",
+            "customers",
+            [sa.text("lower(email) text_pattern_ops")],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_customers_email_lower", table_name="customers")
+    op.drop_index("ix_customers_name_lower", table_name="customers")
@@ -0,0 +1,58 @@
+"""audit notes and customers indexes
+
+Revision ID: 524823069020
+Revises: 2f387382491d
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "524823069020"
+down_revision: Union[str, Sequence[str], None] = "2f387382491d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Covering index for the per-customer listing, which orders by
+    # (created_at DESC, id DESC); built without blocking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_notes_customer_created_id",
+            "notes",
+            ["customer_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+    # Superseded by ix_notes_customer_created_id
+    op.drop_index("ix_notes_customer_created", table_name="notes", if_exists=True)
+    # Leading prefix of the composite index
+    op.drop_index("ix_notes_customer_id", table_name="notes", if_exists=True)
+    # No query filters or sorts on created_at without customer_id
+    op.drop_index("ix_notes_created_at", table_name="notes", if_exists=True)
+    # Duplicates of the primary keys
+    op.drop_index("ix_notes_id", table_name="notes", if_exists=True)
+    op.drop_index("ix_customers_id", table_name="customers", if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_customers_id", "customers", ["id"], unique=False)
+    op.create_index("ix_notes_id", "notes", ["id"], unique=False)
+    op.create_index("ix_notes_created_at", "notes", ["created_at"], unique=False)
+    op.create_index("ix_notes_customer_id", "notes", ["customer_id"], unique=False)
+    op.create_index(
+        "ix_notes_customer_created",
+        "notes",
+        ["customer_id", "created_at"],
+        unique=False,
+    )
+    op.drop_index("ix_notes_customer_created_id", table_name="notes")
@@ -0,0 +1,39 @@
+"""add customers updated_at
+
+Revision ID: 5d3c9a7e1f20
+Revises: 8b1e6f3d2a47
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d3c9a7e1f20"
+down_revision: Union[str, Sequence[str], None] = "8b1e6f3d2a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # now() is evaluated once for the ALTER, so existing rows get the
+    # migration time without a table rewrite (Postgres 11+)
+    op.add_column(
+        "customers",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("customers", "updated_at")
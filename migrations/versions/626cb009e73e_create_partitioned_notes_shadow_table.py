@@ -0,0 +1,103 @@
+"""create partitioned notes shadow table (optional notes_partitioning branch)
+
+Revision ID: 626cb009e73e
+Revises:
+Create Date: 2026-10-19 11:00:00.000000
+
+Optional, Postgres only. Creates ``notes_p``, a copy of ``notes`` that is
+declaratively partitioned by HASH (customer_id), plus a trigger mirroring
+every write on ``notes`` into it. Existing rows are then copied in small
+batches with ``python -m scripts.partition_notes backfill`` and the tables
+are swapped by the next revision in this branch. Apply with:
+
+    alembic upgrade notes_partitioning@626cb009e73e
+
+Hash on customer_id is used (rather than range on created_at) because every
+list/count/export query filters on customer_id, so they prune to a single
+partition. The partition count is read from NOTES_PARTITIONS (default 16).
+"""
+
+import os
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "626cb009e73e"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = ("notes_partitioning",)
+depends_on: Union[str, Sequence[str], None] = "524823069020"
+
+PARTITIONS = int(os.getenv("NOTES_PARTITIONS", "16"))
+
+
+def upgrade() -> None:
+    """Create notes_p, its partitions and the mirroring trigger."""
+    if op.get_context().dialect.name != "postgresql":
+        raise RuntimeError("notes partitioning is only supported on PostgreSQL")
+
+    # The partition key must be part of the primary key; ids still come from
+    # the shared notes_id_seq so they stay unique across partitions
+    op.execute(
+        """
+        CREATE TABLE notes_p (
+            id integer NOT NULL DEFAULT nextval('notes_id_seq'),
+            customer_id integer NOT NULL,
+            user_id integer NOT NULL,
+            content text NOT NULL,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            updated_at timestamptz NOT NULL DEFAULT now(),
+            CONSTRAINT pk_notes_p PRIMARY KEY (id, customer_id),
+            CONSTRAINT fk_notes_p_customer_id_customers FOREIGN KEY (customer_id)
+                REFERENCES customers (id) ON DELETE CASCADE,
+            CONSTRAINT fk_notes_p_user_id_users FOREIGN KEY (user_id)
+                REFERENCES users (id) ON DELETE CASCADE
+        ) PARTITION BY HASH (customer_id)
+        """
+    )
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f"CREATE TABLE notes_p_{remainder:02d} PARTITION OF notes_p "
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+        )
+    op.execute(
+        "CREATE INDEX ix_notes_p_customer_created_id "
+        "ON notes_p (customer_id, created_at, id) INCLUDE (updated_at)"
+    )
+    op.execute("CREATE INDEX ix_notes_p_user_id ON notes_p (user_id)")
+
+    # Keep notes_p in sync with writes made while the backfill runs
+    op.execute(
+        """
+        CREATE FUNCTION notes_mirror_to_partitioned() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                DELETE FROM notes_p
+                WHERE id = OLD.id AND customer_id = OLD.customer_id;
+            END IF;
+            IF TG_OP = 'DELETE' THEN
+                RETURN OLD;
+            END IF;
+            INSERT INTO notes_p
+                (id, customer_id, user_id, content, created_at, updated_at)
+            VALUES
+                (NEW.id, NEW.customer_id, NEW.user_id, NEW.content,
+                 NEW.created_at, NEW.updated_at);
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER notes_mirror AFTER INSERT OR UPDATE OR DELETE ON notes "
+        "FOR EACH ROW EXECUTE FUNCTION notes_mirror_to_partitioned()"
+    )
+
+
+def downgrade() -> None:
+    """Drop the mirroring trigger and the shadow table."""
+    op.execute("DROP TRIGGER IF EXISTS notes_mirror ON notes")
+    op.execute("DROP FUNCTION IF EXISTS notes_mirror_to_partitioned()")
+    op.execute("DROP TABLE IF EXISTS notes_p")
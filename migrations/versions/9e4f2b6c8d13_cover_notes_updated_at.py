@@ -0,0 +1,104 @@
+"""cover notes updated_at in the customer listing index
+
+Revision ID: 9e4f2b6c8d13
+Revises: 5d3c9a7e1f20
+Create Date: 2026-10-19 17:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e4f2b6c8d13"
+down_revision: Union[str, Sequence[str], None] = "5d3c9a7e1f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ix_notes_customer_created_id"
+
+
+def _partitions() -> list[str] | None:
+    """Partition names if notes is partitioned (notes_partitioning), else None."""
+    if op.get_context().as_sql:
+        return None
+    bind = op.get_bind()
+    if (
+        bind.scalar(
+            sa.text("SELECT relkind FROM pg_class WHERE oid = 'notes'::regclass")
+        )
+        != "p"
+    ):
+        return None
+    return list(
+        bind.scalars(
+            sa.text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'notes'::regclass ORDER BY c.relname"
+            )
+        )
+    )
+
+
+def _rebuild(include: str) -> None:
+    """
+    Rebuild INDEX (customer_id, created_at, id) with ``include`` columns.
+
+    The replacement is built under a ``_new`` name and renamed into place,
+    per partition too, so upgrade and downgrade use the same names. A
+    ``_new`` index left behind by an interrupted run (possibly INVALID) is
+    dropped first rather than reused.
+    """
+    columns = f"(customer_id, created_at, id){include}"
+    partitions = _partitions()
+    with op.get_context().autocommit_block():
+        if partitions is None:
+            # Build the replacement without blocking writes, then swap names
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX}_new")
+            op.execute(f"CREATE INDEX CONCURRENTLY {INDEX}_new ON notes {columns}")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX}")
+            op.execute(f"ALTER INDEX {INDEX}_new RENAME TO {INDEX}")
+            return
+
+        # Partitioned parents cannot build CONCURRENTLY: create the parent
+        # index ON ONLY, build each partition's concurrently and attach it
+        op.execute(f"DROP INDEX IF EXISTS {INDEX}_new")
+        for partition in partitions:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {partition}_{INDEX}_new")
+        op.execute(f"CREATE INDEX {INDEX}_new ON ONLY notes {columns}")
+        for partition in partitions:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY {partition}_{INDEX}_new "
+                f"ON {partition} {columns}"
+            )
+            op.execute(
+                f"ALTER INDEX {INDEX}_new ATTACH PARTITION {partition}_{INDEX}_new"
+            )
+        # Metadata-only on a partitioned table; takes a brief lock. Drops the
+        # old partition indexes with it, freeing their names
+        op.execute(f"DROP INDEX IF EXISTS {INDEX}")
+        op.execute(f"ALTER INDEX {INDEX}_new RENAME TO {INDEX}")
+        for partition in partitions:
+            op.execute(
+                f"ALTER INDEX {partition}_{INDEX}_new RENAME TO {partition}_{INDEX}"
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name != "postgresql":
+        return
+    # Lets count(*) + max(updated_at) per customer (the notes list's total
+    # and conditional-GET version) run as an index-only scan
+    _rebuild(" INCLUDE (updated_at)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != "postgresql":
+        return
+    _rebuild("")
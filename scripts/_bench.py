@@ -0,0 +1,86 @@
+"""Shared helpers for the ``scripts/bench_*.py`` benchmarks.
+
+Benchmarks run in-process against the API routers (without the rate limiter)
+using whatever database ``app.database`` is configured for. For a throwaway
+local run use SQLite:
+
+    TESTING=true python -m scripts.bench_bulk_notes
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import database
+import app.models  # noqa: F401 - registers models on Base.metadata
+from app.api import router as api_router
+
+
+def _install_sqlite_functions() -> None:
+    """Register the Postgres functions the models rely on (mirrors conftest)."""
+
+    @event.listens_for(database.engine, "connect")
+    def _sqlite_compat(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+        # Stored in the format SQLAlchemy binds datetimes in, so values
+        # compare correctly with query parameters (e.g. keyset cursors)
+        dbapi_conn.create_function(
+            "now",
+            0,
+            lambda: datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f"),
+        )
+        dbapi_conn.create_function("true", 0, lambda: 1)
+        dbapi_conn.create_function("false", 0, lambda: 0)
+
+
+def prepare_database() -> None:
+    """On SQLite, register the Postgres functions and create the tables."""
+    if database.engine.dialect.name == "sqlite":
+        _install_sqlite_functions()
+        database.Base.metadata.create_all(bind=database.engine)
+
+
+def make_client() -> TestClient:
+    """Build a TestClient for the API routers, preparing SQLite if needed."""
+    prepare_database()
+    bench_app = FastAPI()
+    bench_app.include_router(api_router, prefix="/api")
+    return TestClient(bench_app)
+
+
+def auth_headers(client: TestClient) -> dict:
+    """Sign up a throwaway user and return bearer auth headers."""
+    email = f"bench_{uuid.uuid4().hex[:10]}@example.com"
+    r = client.post("/api/auth/signup", json={"email": email, "password": "bench-pw"})
+    r.raise_for_status()
+    r = client.post("/api/auth/login", data={"username": email, "password": "bench-pw"})
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def create_customer(client: TestClient) -> int:
+    """Create a throwaway customer and return its id."""
+    email = f"benchcust_{uuid.uuid4().hex[:10]}@example.com"
+    r = client.post("/api/customers", json={"name": "Bench", "email": email})
+    r.raise_for_status()
+    return r.json()["id"]
+
+
+def timed(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Return the median wall time (seconds) of ``repeat`` calls to ``fn``."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
@@ -0,0 +1,141 @@
+"""Load-test admission control (see ``app.admission``) against a slow database.
+
+Drives the full app (lifespan included) for ``--seconds``:
+- ``--heavy`` threads hammer the note list with distinct offsets, so none is
+  served from the response cache
+- one thread reads a single customer in a loop, standing in for cheap
+  traffic
+
+Every query is slowed by ``--query-delay``. The run is repeated in fresh
+processes with admission control on and off. The report shows heavy calls
+served and shed, and the cheap reads' latency. With admission on, heavy
+calls should be shed with 503 while cheap reads stay fast.
+
+Usage:
+    TESTING=true python -m scripts.bench_admission [--heavy 80]
+        [--seconds 5] [--query-delay 0.05]
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _child(heavy: int, seconds: float, query_delay: float) -> None:
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    import app.main
+    from app.database import engine
+    from app.response_cache import clear_response_cache
+    from scripts._bench import prepare_database
+
+    prepare_database()
+    client = TestClient(app.main.app)
+    email = f"admission_{uuid.uuid4().hex[:10]}@example.com"
+    with client:
+        r = client.post("/api/customers", json={"name": "Load", "email": email})
+        r.raise_for_status()
+        customer_id = r.json()["id"]
+        event.listen(
+            engine, "before_cursor_execute", lambda *args: time.sleep(query_delay)
+        )
+
+        lock = threading.Lock()
+        counts = {"heavy_ok": 0, "heavy_shed": 0, "heavy_errors": 0, "cheap_errors": 0}
+        cheap: list[float] = []
+        offsets = itertools.count()
+        deadline = time.perf_counter() + seconds
+
+        def get(path: str):
+            ip = f"10.0.{random.randint(0, 255)}.{random.randint(1, 254)}"
+            return client.get(path, headers={"X-Forwarded-For": ip})
+
+        def drive_heavy(_: int) -> None:
+            while time.perf_counter() < deadline:
+                r = get(f"/api/customers/{customer_id}/notes?offset={next(offsets)}")
+                key = {200: "heavy_ok", 503: "heavy_shed"}.get(r.status_code)
+                with lock:
+                    counts[key or "heavy_errors"] += 1
+
+        def drive_cheap(_: int) -> None:
+            while time.perf_counter() < deadline:
+                clear_response_cache()
+                start = time.perf_counter()
+                r = get(f"/api/customers/{customer_id}")
+                with lock:
+                    cheap.append(time.perf_counter() - start)
+                    if r.status_code != 200:
+                        counts["cheap_errors"] += 1
+
+        with ThreadPoolExecutor(heavy + 1) as pool:
+            pool.submit(drive_cheap, 0)
+            list(pool.map(drive_heavy, range(heavy)))
+
+    cheap.sort()
+    print(
+        json.dumps(
+            dict(
+                counts,
+                cheap_p50=statistics.median(cheap),
+                cheap_p99=cheap[int(len(cheap) * 0.99) - 1],
+            )
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--heavy", type=int, default=80)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--query-delay", type=float, default=0.05)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.heavy, args.seconds, args.query_delay)
+        return
+
+    print(
+        f"{'admission':<10} {'heavy ok':>9} {'shed':>6} {'errors':>7}"
+        f" {'cheap p50':>10} {'cheap p99':>10}"
+    )
+    for enabled in (True, False):
+        env = dict(os.environ, ADMISSION_ENABLED=str(enabled).lower())
+        env["WARMUP_ENABLED"] = "false"
+        out = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "scripts.bench_admission",
+                "--child",
+                f"--heavy={args.heavy}",
+                f"--seconds={args.seconds}",
+                f"--query-delay={args.query_delay}",
+            ],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        print(
+            f"{'on' if enabled else 'off':<10} {r['heavy_ok']:>9} {r['heavy_shed']:>6}"
+            f" {r['heavy_errors'] + r['cheap_errors']:>7}"
+            f" {r['cheap_p50'] * 1000:>8.0f}ms {r['cheap_p99'] * 1000:>8.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark bulk note creation against the single-note endpoint.
+
+Usage:
+    TESTING=true python -m scripts.bench_bulk_notes [--notes 500] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from scripts._bench import auth_headers, create_customer, make_client, timed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    client = make_client()
+    headers = auth_headers(client)
+    customer_id = create_customer(client)
+
+    def single():
+        for i in range(args.notes):
+            r = client.post(
+                f"/api/customers/{customer_id}/notes",
+                json={"content": f"single {i}"},
+                headers=headers,
+            )
+            r.raise_for_status()
+
+    def bulk():
+        items = [
+            {"customer_id": customer_id, "content": f"bulk {i}"}
+            for i in range(args.notes)
+        ]
+        r = client.post("/api/notes/bulk", json={"items": items}, headers=headers)
+        r.raise_for_status()
+
+    single_s = timed(single, args.repeat)
+    bulk_s = timed(bulk, args.repeat)
+
+    print(f"notes per run: {args.notes}")
+    print(f"single-note path: {single_s:.3f}s  ({args.notes / single_s:,.0f} notes/s)")
+    print(f"bulk endpoint:    {bulk_s:.3f}s  ({args.notes / bulk_s:,.0f} notes/s)")
+    print(f"speedup:          {single_s / bulk_s:.1f}x")
+
+    client.delete(f"/api/customers/{customer_id}")
+
+
+if __name__ == "__main__":
+    main()
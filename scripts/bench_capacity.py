@@ -0,0 +1,151 @@
+"""Load-test the threadpool / connection-pool alignment (see ``app.capacity``).
+
+Drives the full app (lifespan included) with ``--concurrency`` threads for
+``--seconds``. Each request is a note-list read with a distinct ``offset``, so
+nothing is served from the response cache. Every query is slowed by
+``--query-delay`` to stand in for a loaded database. ``DB_POOL_TIMEOUT`` is
+set to ``--pool-timeout``, so any request that queues for a connection
+rather than for a thread fails quickly. It is counted under ``timeouts``;
+``errors`` counts every non-200 response.
+
+The run is repeated in fresh processes with the aligned plan and with
+AnyIO's stock 40 threads (``THREADPOOL_TOKENS=40``). The aligned run should
+report zero checkout timeouts.
+
+Usage:
+    TESTING=true python -m scripts.bench_capacity [--concurrency 60]
+        [--seconds 5] [--query-delay 0.1] [--pool-timeout 0.25]
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _child(concurrency: int, seconds: float, query_delay: float) -> None:
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from sqlalchemy.exc import TimeoutError as CheckoutTimeout
+
+    import app.main
+    from app.capacity import current_capacity
+    from app.database import engine
+    from scripts._bench import prepare_database
+
+    prepare_database()
+    client = TestClient(app.main.app)
+    email = f"capacity_{uuid.uuid4().hex[:10]}@example.com"
+    with client:
+        r = client.post("/api/customers", json={"name": "Load", "email": email})
+        r.raise_for_status()
+        path = f"/api/customers/{r.json()['id']}/notes"
+        event.listen(
+            engine, "before_cursor_execute", lambda *args: time.sleep(query_delay)
+        )
+
+        lock = threading.Lock()
+        latencies: list[float] = []
+        counts = {"ok": 0, "timeouts": 0, "errors": 0}
+        deadline = time.perf_counter() + seconds
+
+        class CountCheckoutTimeouts(logging.Handler):
+            # Timeouts reach the client as 500s; the error middleware logs them
+            def emit(self, record: logging.LogRecord) -> None:
+                if record.exc_info and isinstance(record.exc_info[1], CheckoutTimeout):
+                    with lock:
+                        counts["timeouts"] += 1
+
+        logging.getLogger().addHandler(CountCheckoutTimeouts())
+        offsets = itertools.count()
+
+        def drive(_: int) -> None:
+            while time.perf_counter() < deadline:
+                ip = f"10.0.{random.randint(0, 255)}.{random.randint(1, 254)}"
+                start = time.perf_counter()
+                r = client.get(
+                    f"{path}?offset={next(offsets)}", headers={"X-Forwarded-For": ip}
+                )
+                outcome = "ok" if r.status_code == 200 else "errors"
+                with lock:
+                    counts[outcome] += 1
+                    latencies.append(time.perf_counter() - start)
+
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(drive, range(1, concurrency + 1)))
+        tokens = current_capacity().threadpool_tokens
+
+    latencies.sort()
+    print(
+        json.dumps(
+            dict(
+                counts,
+                tokens=tokens,
+                rps=counts["ok"] / seconds,
+                p50=statistics.median(latencies),
+                p99=latencies[int(len(latencies) * 0.99) - 1],
+            )
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=60)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--query-delay", type=float, default=0.1)
+    parser.add_argument("--pool-timeout", type=float, default=0.25)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.concurrency, args.seconds, args.query_delay)
+        return
+
+    print(
+        f"{'plan':<8} {'tokens':>6} {'req/s':>7} {'p50':>8} {'p99':>8} {'timeouts':>9} {'errors':>7}"
+    )
+    for label, tokens in (("aligned", None), ("stock", "40")):
+        env = dict(
+            os.environ,
+            DB_POOL_TIMEOUT=str(args.pool_timeout),
+            WARMUP_ENABLED="false",
+        )
+        env.pop("THREADPOOL_TOKENS", None)
+        if tokens:
+            env["THREADPOOL_TOKENS"] = tokens
+        out = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "scripts.bench_capacity",
+                "--child",
+                f"--concurrency={args.concurrency}",
+                f"--seconds={args.seconds}",
+                f"--query-delay={args.query_delay}",
+            ],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        print(
+            f"{label:<8} {r['tokens']:>6} {r['rps']:>7.0f} {r['p50'] * 1000:>6.0f}ms"
+            f" {r['p99'] * 1000:>6.0f}ms {r['timeouts']:>9} {r['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
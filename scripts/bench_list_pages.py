@@ -0,0 +1,76 @@
+"""Benchmark large list pages: ORM entities vs. column projection.
+
+Compares loading a page of notes as ORM entities (the previous read path)
+with the projected rows returned by ``get_notes_by_customer``, each followed
+by ``NoteOut`` validation, and times the full ``GET .../notes`` request.
+
+Usage:
+    TESTING=true python -m scripts.bench_list_pages [--page 1000] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from app.database import SessionLocal
+from app.models.note import Note
+from app.repositories.note_repo import get_notes_by_customer
+from app.schemas.note import NoteListResponse
+from scripts._bench import auth_headers, create_customer, make_client, timed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    client = make_client()
+    headers = auth_headers(client)
+    customer_id = create_customer(client)
+    for start in range(0, args.page, 1000):
+        items = [
+            {"customer_id": customer_id, "content": f"bench note {i} " * 8}
+            for i in range(start, min(start + 1000, args.page))
+        ]
+        client.post("/api/notes/bulk", json={"items": items}, headers=headers)
+
+    def as_page(notes):
+        return NoteListResponse(
+            items=notes, total=len(notes), limit=args.page, offset=0, has_more=False
+        )
+
+    def orm_entities():
+        with SessionLocal() as db:
+            notes = (
+                db.query(Note)
+                .filter(Note.customer_id == customer_id)
+                .order_by(Note.created_at.desc(), Note.id.desc())
+                .limit(args.page)
+                .all()
+            )
+            as_page(notes)
+
+    def projected_rows():
+        with SessionLocal() as db:
+            as_page(get_notes_by_customer(db, customer_id, limit=args.page))
+
+    def endpoint():
+        r = client.get(f"/api/customers/{customer_id}/notes?limit={args.page}")
+        r.raise_for_status()
+
+    orm_s = timed(orm_entities, args.repeat)
+    rows_s = timed(projected_rows, args.repeat)
+    endpoint_s = timed(endpoint, args.repeat)
+
+    print(f"page size: {args.page}")
+    print(f"ORM entities + validation:  {orm_s * 1000:8.2f} ms")
+    print(f"projected rows + validation:{rows_s * 1000:8.2f} ms")
+    print(f"speedup:                    {orm_s / rows_s:8.1f}x")
+    print(f"GET /notes end to end:      {endpoint_s * 1000:8.2f} ms")
+
+    client.delete(f"/api/customers/{customer_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark response serialization of a 1000-item note page.
+
+Loads one page of rows once, then times only the serialization step:
+
+- the previous path: validate rows into ``NoteListResponse`` (as
+  ``response_model`` does), dump to Python and encode with stdlib ``json``;
+- the same validation, encoded with orjson (the new default response class);
+- the fast path: rows as plain dicts dumped by the precompiled
+  ``TypeAdapter`` in ``app.serializers`` (no re-validation).
+
+Usage:
+    TESTING=true python -m scripts.bench_serialization [--page 1000] [--repeat 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+import orjson
+
+from app.database import SessionLocal
+from app.repositories.note_repo import get_notes_by_customer
+from app.schemas.note import NoteListResponse, NoteOut
+from app.serializers import NOTE_LIST, as_dict
+from scripts._bench import auth_headers, create_customer, make_client, timed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    client = make_client()
+    headers = auth_headers(client)
+    customer_id = create_customer(client)
+    for start in range(0, args.page, 1000):
+        items = [
+            {"customer_id": customer_id, "content": f"bench note {i} " * 8}
+            for i in range(start, min(start + 1000, args.page))
+        ]
+        client.post("/api/notes/bulk", json={"items": items}, headers=headers)
+
+    with SessionLocal() as db:
+        rows = get_notes_by_customer(db, customer_id, limit=args.page)
+    meta = {"total": len(rows), "limit": args.page, "offset": 0, "has_more": False}
+
+    def validated_stdlib_json():
+        page = NoteListResponse(items=rows, **meta)
+        json.dumps(page.model_dump(mode="json")).encode()
+
+    def validated_orjson():
+        page = NoteListResponse(items=rows, **meta)
+        orjson.dumps(page.model_dump(mode="json"))
+
+    def row_dicts_adapter():
+        page = dict(items=[as_dict(NoteOut, row) for row in rows], **meta)
+        NOTE_LIST.dump_json(page)
+
+    # All three paths must produce the same document
+    expected = json.loads(NoteListResponse(items=rows, **meta).model_dump_json())
+    fast = dict(items=[as_dict(NoteOut, row) for row in rows], **meta)
+    assert json.loads(NOTE_LIST.dump_json(fast)) == expected
+
+    stdlib_s = timed(validated_stdlib_json, args.repeat)
+    orjson_s = timed(validated_orjson, args.repeat)
+    fast_s = timed(row_dicts_adapter, args.repeat)
+
+    print(f"page size: {len(rows)}")
+    print(f"validate + stdlib json:       {stdlib_s * 1000:8.2f} ms")
+    print(f"validate + orjson:            {orjson_s * 1000:8.2f} ms")
+    print(f"row dicts + TypeAdapter:      {fast_s * 1000:8.2f} ms")
+    print(f"speedup vs previous path:     {stdlib_s / fast_s:8.1f}x")
+
+    client.delete(f"/api/customers/{customer_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark requests/sec of the production launcher against worker count.
+
+For each worker count, starts ``python -m app.server`` on a local port,
+drives it with ``--clients`` load-generator processes (one keep-alive
+connection each) for ``--seconds`` per endpoint, then stops it with SIGTERM
+and prints requests/sec. Endpoints are the health check (framework
+overhead only) and a customer GET (routing, middleware and the response
+cache). The first row is the previous entrypoint, a single
+``uvicorn app.main:app`` process, for comparison. Requests carry random
+``X-Forwarded-For`` addresses so the per-client rate limiter does not cap
+the result.
+
+The load generator shares the machine, so numbers are only comparable
+between runs on the same host; scaling stops at the CPUs available.
+
+Usage:
+    TESTING=true python -m scripts.bench_workers [--workers 1,2,4] [--clients 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from multiprocessing import Pool
+
+from app.capacity import available_cpus
+from scripts._bench import create_customer, make_client
+
+
+def _wait_ready(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not become ready")
+
+
+def _drive(job: tuple[int, str, float]) -> tuple[int, int]:
+    port, path, seconds = job
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    ok = errors = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        ip = f"10.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}"
+        conn.request("GET", path, headers={"X-Forwarded-For": ip})
+        response = conn.getresponse()
+        response.read()
+        if response.status == 200:
+            ok += 1
+        else:
+            errors += 1
+    conn.close()
+    return ok, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    customer_id = create_customer(make_client())
+    paths = ["/api/health", f"/api/customers/{customer_id}"]
+
+    print(f"CPUs available: {available_cpus()}, load generators: {args.clients}")
+    print(f"{'workers':>8}  {'endpoint':<28} {'req/s':>9} {'errors':>7}")
+    uvicorn_cmd = ["-m", "uvicorn", "app.main:app", "--port", str(args.port)]
+    runs = [("uvicorn", uvicorn_cmd, 1)] + [
+        (str(w), ["-m", "app.server"], int(w)) for w in args.workers.split(",")
+    ]
+    for label, command, workers in runs:
+        env = dict(
+            os.environ,
+            WEB_CONCURRENCY=str(workers),
+            PORT=str(args.port),
+            SERVER_MAX_REQUESTS="0",
+        )
+        server = subprocess.Popen(
+            [sys.executable, *command],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            _wait_ready(args.port)
+            for path in paths:
+                jobs = [(args.port, path, args.seconds)] * args.clients
+                with Pool(args.clients) as pool:
+                    results = pool.map(_drive, jobs)
+                ok = sum(r[0] for r in results)
+                errors = sum(r[1] for r in results)
+                print(f"{label:>8}  {path:<28} {ok / args.seconds:>9.0f} {errors:>7}")
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Bulk import customers or notes from a CSV or NDJSON file.
+
+Streams the input in chunks (COPY + set-based upsert on Postgres, chunked
+executemany on SQLite), so arbitrarily large files can be loaded.
+
+Usage:
+    python -m scripts.import_data customers customers.csv
+    python -m scripts.import_data notes notes.ndjson --user-id 1
+    cat notes.ndjson | python -m scripts.import_data notes - --format ndjson --user-id 1
+"""
+
+import argparse
+import sys
+
+from app.database import SessionLocal
+from app.importer import (
+    DEFAULT_CHUNK_SIZE,
+    IMPORT_FORMATS,
+    IMPORT_KINDS,
+    ImportFormatError,
+    detect_format,
+    run_import,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk import CRM data")
+    parser.add_argument("kind", choices=IMPORT_KINDS)
+    parser.add_argument("path", help="Input file, or '-' for stdin")
+    parser.add_argument("--format", choices=IMPORT_FORMATS)
+    parser.add_argument("--user-id", type=int, help="Owner of imported notes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    try:
+        fmt = args.format or detect_format(args.path)
+    except ImportFormatError as exc:
+        parser.error(str(exc))
+
+    stream = (
+        sys.stdin if args.path == "-" else open(args.path, encoding="utf-8", newline="")
+    )
+    db = SessionLocal()
+    try:
+        result = run_import(
+            db,
+            args.kind,
+            stream,
+            fmt,
+            user_id=args.user_id,
+            chunk_size=args.chunk_size,
+        )
+    except ImportFormatError as exc:
+        parser.error(str(exc))
+    finally:
+        db.close()
+        if stream is not sys.stdin:
+            stream.close()
+
+    print(
+        f"{result.kind}: processed={result.processed} "
+        f"imported={result.imported} errors={result.error_count}"
+    )
+    for err in result.errors:
+        print(f"  line {err.line}: {err.detail}", file=sys.stderr)
+    return 1 if result.error_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
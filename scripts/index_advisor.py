@@ -0,0 +1,75 @@
+"""Compare the database's indexes against the queries the repositories issue.
+
+Runs every read query in ``app.query_audit.REPOSITORY_QUERIES`` (reads only,
+safe against a live database), EXPLAINs it and reports:
+
+- queries that fall back to a sequential scan (candidates for an index),
+- indexes made redundant by another index or constraint,
+- indexes that no repository query uses.
+
+Run it against a database holding realistic data: on near-empty tables
+Postgres prefers sequential scans regardless of the available indexes.
+
+Usage:
+    DATABASE_URL=postgresql+psycopg://... python -m scripts.index_advisor [-v]
+"""
+
+import argparse
+import sys
+
+from app.database import Base, SessionLocal, engine
+from app.query_audit import (
+    ALLOWED_FULL_SCANS,
+    collect_plans,
+    find_redundant_indexes,
+    full_scans,
+    unused_indexes,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Repository index advisor")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print plans")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        plans = collect_plans(db)
+
+    tables = set(Base.metadata.tables)
+    problems = 0
+
+    if args.verbose:
+        print("Plans:")
+        for name, plan in plans.items():
+            print(f"  {name}")
+            for line in plan:
+                print(f"      {line}")
+
+    print("Sequential scans:")
+    for name, plan in plans.items():
+        scans = full_scans(plan, tables)
+        if not scans:
+            continue
+        if name in ALLOWED_FULL_SCANS:
+            print(f"  {name}: allowed ({ALLOWED_FULL_SCANS[name]})")
+            continue
+        problems += 1
+        for line in scans:
+            print(f"  {name}: {line}")
+
+    print("Redundant indexes:")
+    for table, index, covered_by in find_redundant_indexes(engine):
+        problems += 1
+        print(f"  {table}.{index}: covered by {covered_by}")
+
+    print("Indexes unused by repository queries:")
+    for index in unused_indexes(engine, plans):
+        problems += 1
+        print(f"  {index}")
+
+    print(f"{problems} issue(s) found")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Backfill the partitioned notes table in small batches (Postgres only).
+
+Part of the optional ``notes_partitioning`` migration branch:
+
+    alembic upgrade notes_partitioning@626cb009e73e   # create notes_p + trigger
+    python -m scripts.partition_notes backfill        # copy existing rows
+    alembic upgrade notes_partitioning@head           # swap the tables
+
+New writes reach notes_p through the mirror trigger; this tool copies the
+rows that existed before, walking ``notes.id`` in ranges. Each batch is its
+own short transaction and locks only the rows it copies (FOR SHARE), so
+concurrent writes are never blocked for long. The backfill is idempotent and
+can be resumed with ``--from-id``.
+
+Usage:
+    python -m scripts.partition_notes backfill [--batch-size 10000] [--sleep 0.05]
+    python -m scripts.partition_notes status
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import text
+
+from app.database import engine
+
+BACKFILL_COMPLETE = "backfill complete"
+
+_COPY_BATCH = text(
+    """
+    INSERT INTO notes_p (id, customer_id, user_id, content, created_at, updated_at)
+    SELECT id, customer_id, user_id, content, created_at, updated_at
+    FROM notes
+    WHERE id > :low AND id <= :high
+    FOR SHARE
+    ON CONFLICT (id, customer_id) DO NOTHING
+    """
+)
+
+
+def backfill(batch_size: int, sleep: float, from_id: int | None) -> None:
+    with engine.connect() as conn:
+        low, high = conn.execute(
+            text("SELECT coalesce(min(id), 1) - 1, coalesce(max(id), 0) FROM notes")
+        ).one()
+    if from_id is not None:
+        low = from_id
+
+    copied = 0
+    started = time.monotonic()
+    while low < high:
+        upper = min(low + batch_size, high)
+        with engine.begin() as conn:
+            copied += conn.execute(_COPY_BATCH, {"low": low, "high": upper}).rowcount
+        low = upper
+        print(f"copied through id {low} / {high} ({copied} rows)", flush=True)
+        if sleep:
+            time.sleep(sleep)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"COMMENT ON TABLE notes_p IS '{BACKFILL_COMPLETE}'"))
+    print(f"backfill complete: {copied} rows in {time.monotonic() - started:.1f}s")
+
+
+def status() -> None:
+    with engine.connect() as conn:
+        notes = conn.execute(text("SELECT count(*) FROM notes")).scalar_one()
+        shadow = conn.execute(text("SELECT count(*) FROM notes_p")).scalar_one()
+        marker = conn.execute(
+            text("SELECT obj_description('notes_p'::regclass, 'pg_class')")
+        ).scalar_one()
+    print(f"notes: {notes} rows, notes_p: {shadow} rows, marker: {marker or '-'}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Backfill partitioned notes")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("backfill", help="Copy existing notes into notes_p")
+    run.add_argument("--batch-size", type=int, default=10000)
+    run.add_argument(
+        "--sleep", type=float, default=0.05, help="Pause between batches (seconds)"
+    )
+    run.add_argument("--from-id", type=int, help="Resume after this note id")
+    sub.add_parser("status", help="Compare row counts")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        parser.error("notes partitioning is only supported on PostgreSQL")
+
+    if args.command == "backfill":
+        backfill(args.batch_size, args.sleep, args.from_id)
+    else:
+        status()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""Measure cold-start cost: import time, warm-up time and first requests.
+
+Each run is a fresh interpreter that imports ``app.main``, runs the app
+lifespan (warm-up included) and then times two note-list requests for
+different customers: the first request a user would hit after a deploy,
+and one on an already-warm path (a response-cache miss either way). Runs
+are repeated with ``WARMUP_ENABLED`` on and off to show what warm-up moves
+out of the first request.
+
+Exits with status 1 when the median import time, or import plus startup
+time with warm-up on, exceeds its budget, so CI can catch regressions.
+
+``--profile`` instead prints the slowest imports under ``import app.main``
+(from ``python -X importtime``), cumulative and self time.
+
+Usage:
+    TESTING=true python -m scripts.startup_time [--runs 3]
+        [--import-budget 2.0] [--startup-budget 4.0]
+    TESTING=true python -m scripts.startup_time --profile [--top 25]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+
+def _child() -> None:
+    start = time.perf_counter()
+    import app.main
+
+    imported = time.perf_counter() - start
+
+    from fastapi.testclient import TestClient
+
+    from app.database import SessionLocal
+    from app.models.customer import Customer
+    from app.models.note import Note
+    from app.models.user import User
+    from scripts._bench import prepare_database
+
+    prepare_database()
+    tag = uuid.uuid4().hex[:10]
+    with SessionLocal() as db:
+        user = User(email=f"startup_{tag}@example.com", password_hash="x")
+        customers = [
+            Customer(name="Startup", email=f"startup{i}_{tag}@example.com")
+            for i in range(2)
+        ]
+        db.add_all([user, *customers])
+        db.flush()
+        db.add_all(
+            Note(customer_id=c.id, user_id=user.id, content="startup")
+            for c in customers
+        )
+        db.commit()
+        customer_ids = [c.id for c in customers]
+
+    client = TestClient(app.main.app)
+    start = time.perf_counter()
+    client.__enter__()
+    startup = time.perf_counter() - start
+
+    latencies = []
+    for customer_id in customer_ids:
+        start = time.perf_counter()
+        client.get(f"/api/customers/{customer_id}/notes").raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    client.__exit__(None, None, None)
+
+    print(
+        json.dumps(
+            {
+                "import": imported,
+                "startup": startup,
+                "first_request": latencies[0],
+                "warm_request": latencies[1],
+            }
+        )
+    )
+
+
+def _profile(top: int) -> None:
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        if own.strip().isdigit():
+            rows.append((int(cumulative), int(own), name.rstrip()))
+    print(f"{'cumulative':>10} {'self':>8}  module")
+    for cumulative, own, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1000:>8.1f}ms {own / 1000:>6.1f}ms {name}")
+
+
+def _measure(runs: int, warmup: bool) -> dict[str, float]:
+    env = dict(os.environ, WARMUP_ENABLED=str(warmup).lower())
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-m", "scripts.startup_time", "--child"],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    return {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--import-budget", type=float, default=2.0)
+    parser.add_argument("--startup-budget", type=float, default=4.0)
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child()
+        return
+    if args.profile:
+        _profile(args.top)
+        return
+
+    print(f"{'warm-up':<8} {'import':>8} {'startup':>8} {'1st req':>8} {'warm req':>8}")
+    results = {}
+    for warmup in (True, False):
+        r = results[warmup] = _measure(args.runs, warmup)
+        print(
+            f"{'on' if warmup else 'off':<8} {r['import'] * 1000:>6.0f}ms"
+            f" {r['startup'] * 1000:>6.0f}ms {r['first_request'] * 1000:>6.1f}ms"
+            f" {r['warm_request'] * 1000:>6.1f}ms"
+        )
+
+    warm = results[True]
+    failures = []
+    if warm["import"] > args.import_budget:
+        failures.append(
+            f"import {warm['import']:.2f}s > budget {args.import_budget:.2f}s"
+        )
+    if warm["import"] + warm["startup"] > args.startup_budget:
+        failures.append(
+            f"import+startup {warm['import'] + warm['startup']:.2f}s"
+            f" > budget {args.startup_budget:.2f}s"
+        )
+    for failure in failures:
+        print(f"OVER BUDGET: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
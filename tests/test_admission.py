@@ -0,0 +1,180 @@
+"""Test adaptive admission control and load shedding."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.admission import (
+    ROUTE_CLASSES,
+    AdmissionControlMiddleware,
+    AdmissionController,
+    classify,
+)
+from app.metrics import metrics
+
+AUTH, READ, HEAVY = ROUTE_CLASSES["auth"], ROUTE_CLASSES["read"], ROUTE_CLASSES["heavy"]
+
+
+def _counter(name: str) -> int:
+    return metrics.get_metrics()["counters"].get(name, 0)
+
+
+def test_classify_routes():
+    """Cheap endpoints are exempt or favoured; list/bulk/import calls are heavy."""
+    assert classify("GET", "/api/health") is None
+    assert classify("GET", "/api/metrics") is None
+    assert classify("POST", "/api/auth/login") is AUTH
+    assert classify("GET", "/api/customers") is HEAVY
+    assert classify("GET", "/api/customers/7/notes") is HEAVY
+    assert classify("GET", "/api/customers/7/notes/export") is HEAVY
+    assert classify("POST", "/api/import/notes") is HEAVY
+    assert classify("GET", "/api/customers/7") is READ
+    assert classify("POST", "/api/customers") is ROUTE_CLASSES["write"]
+
+
+def test_limit_grows_when_fast_and_backs_off_when_slow():
+    """Additive increase under load; one multiplicative decrease per target."""
+    controller = AdmissionController(
+        initial_limit=10, min_limit=2, max_limit=12, latency_target=0.5
+    )
+
+    async def fill(n):
+        return [await controller.acquire(READ) for _ in range(n)]
+
+    assert all(asyncio.run(fill(8)))
+    controller.release(READ, 0.01, failed=False)
+    assert controller.limit == 10.1
+
+    decreases = _counter("admission_limit_decreases_total")
+    controller.release(READ, 2.0, failed=False)
+    controller.release(READ, 0.01, failed=True)
+    assert round(controller.limit, 2) == 9.09
+    assert _counter("admission_limit_decreases_total") == decreases + 1
+
+    # Without a cooldown every slow request backs off, down to the minimum
+    controller.latency_target = 0
+    controller.backoff = 0.5
+    for _ in range(5):
+        controller.release(READ, 1.0, failed=False)
+    assert controller.limit == 2
+    assert controller.in_flight == 0
+
+
+def test_cheap_requests_are_admitted_before_heavy_ones():
+    """Heavy calls fill only their share; freed slots go to auth first."""
+    controller = AdmissionController(initial_limit=4, min_limit=1, max_limit=4)
+
+    async def scenario():
+        # Heavy may fill 60% of the limit: three in flight, the fourth is shed
+        assert [await controller.acquire(HEAVY) for _ in range(3)] == [True] * 3
+        assert await controller.acquire(HEAVY) is False
+        assert await controller.acquire(AUTH) is True
+
+        heavy = asyncio.create_task(controller.acquire(HEAVY))
+        auth = asyncio.create_task(controller.acquire(AUTH))
+        await asyncio.sleep(0.01)
+        controller.release(HEAVY, 0.01, failed=False)
+        return await auth, await heavy
+
+    shed = _counter("admission_shed_heavy_total")
+    assert asyncio.run(scenario()) == (True, False)
+    assert _counter("admission_shed_heavy_total") == shed + 2
+    assert controller.in_flight == 4
+
+
+def test_middleware_sheds_with_retry_after():
+    """Over the limit: 503 + Retry-After, while exempt endpoints still answer."""
+    controller = AdmissionController(initial_limit=1, min_limit=1, max_limit=1)
+    app = FastAPI()
+    app.add_middleware(AdmissionControlMiddleware, controller=controller)
+
+    @app.get("/api/health")
+    def health():
+        return {"status": "ok"}
+
+    @app.get("/api/customers")
+    def customers():
+        return []
+
+    client = TestClient(app)
+    assert client.get("/api/customers").status_code == 200
+    assert controller.in_flight == 0
+
+    # Occupy the only slot
+    assert asyncio.run(controller.acquire(READ))
+    r = client.get("/api/customers")
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+    assert client.get("/api/health").status_code == 200
+    gauges = metrics.get_metrics()["gauges"]
+    assert gauges["admission_in_flight"] == 1
+    assert gauges["admission_limit"] == 1
+
+
+def test_streaming_response_holds_its_slot_until_sent():
+    """The slot is released after the last chunk, not when headers go out."""
+    controller = AdmissionController(
+        initial_limit=4, min_limit=1, max_limit=4, latency_target=0.1, backoff=0.5
+    )
+    app = FastAPI()
+    app.add_middleware(AdmissionControlMiddleware, controller=controller)
+    in_flight = []
+
+    @app.get("/api/notes/7/stream")
+    def stream():
+        async def body():
+            for _ in range(3):
+                await asyncio.sleep(0.05)
+                in_flight.append(controller.in_flight)
+                yield b"chunk\n"
+
+        return StreamingResponse(body())
+
+    r = TestClient(app).get("/api/notes/7/stream")
+    assert r.text == "chunk\n" * 3
+    assert in_flight == [1, 1, 1]
+    assert controller.in_flight == 0
+    # Latency is measured to the headers: a slow download is not congestion
+    assert controller.limit == 4
+
+
+def test_slow_heavy_calls_do_not_back_off():
+    """Heavy calls are expected to be slow; only their failures back off."""
+    controller = AdmissionController(
+        initial_limit=4, min_limit=1, max_limit=4, latency_target=0.1, backoff=0.5
+    )
+
+    async def fill():
+        return [await controller.acquire(HEAVY) for _ in range(2)]
+
+    assert all(asyncio.run(fill()))
+    controller.release(HEAVY, 5.0, failed=False)
+    assert controller.limit == 4
+    controller.release(HEAVY, 5.0, failed=True)
+    assert controller.limit == 2
+
+
+def test_slot_is_released_when_sending_fails():
+    """A response that never reaches the client still gives its slot back."""
+    controller = AdmissionController(initial_limit=2, min_limit=1, max_limit=2)
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        raise OSError("client went away")
+
+    middleware = AdmissionControlMiddleware(app, controller=controller)
+    scope = {"type": "http", "method": "GET", "path": "/api/customers/7"}
+    for _ in range(3):
+        with pytest.raises(OSError):
+            asyncio.run(middleware(scope, receive, send))
+        assert controller.in_flight == 0
+    assert controller.limit == 2
@@ -0,0 +1,127 @@
+"""Test signup/login with password hashing offloaded to the process pool."""
+
+import time
+
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+
+from app import database, password_pool
+from app.main import app
+from app.metrics import metrics
+from app.models.user import User
+from app.security import BCRYPT_ROUNDS
+
+client = TestClient(app)
+
+
+def _signup(email: str, password: str = "password123"):
+    return client.post("/api/auth/signup", json={"email": email, "password": password})
+
+
+def _login(email: str, password: str = "password123"):
+    return client.post(
+        "/api/auth/login", data={"username": email, "password": password}
+    )
+
+
+def test_signup_and_login_record_hash_metrics():
+    """Hashing goes through the pool and reports queue and run times."""
+    email = f"pooluser_{int(time.time() * 1000)}@test.com"
+    assert _signup(email).status_code == 201
+    assert _login(email).status_code == 200
+    assert _login(email, "wrong-password").status_code == 401
+
+    durations = metrics.get_metrics()["durations"]
+    assert durations["password_hash_queue_seconds_count"] >= 3
+    assert durations["password_hash_seconds_count"] >= 3
+
+
+def test_login_rehashes_password_with_outdated_cost():
+    """A hash made with a different bcrypt cost is upgraded on login."""
+    email = f"rehash_{int(time.time() * 1000)}@test.com"
+    assert _signup(email).status_code == 201
+
+    old_rounds = BCRYPT_ROUNDS + 1
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=old_rounds).hash(
+        "password123"
+    )
+    with database.SessionLocal() as db:
+        user = db.query(User).filter(User.email == email).one()
+        user.password_hash = old_hash
+        db.commit()
+
+    assert _login(email).status_code == 200
+
+    with database.SessionLocal() as db:
+        new_hash = db.query(User).filter(User.email == email).one().password_hash
+    assert new_hash != old_hash
+    assert new_hash.startswith(f"$2b${BCRYPT_ROUNDS:02d}$")
+    # The upgraded hash still verifies
+    assert _login(email).status_code == 200
+
+
+def test_login_rejected_with_503_when_hash_queue_full(monkeypatch):
+    """Past the admission limit, logins fail fast with Retry-After."""
+    email = f"busy_{int(time.time() * 1000)}@test.com"
+    assert _signup(email).status_code == 201
+
+    monkeypatch.setattr(password_pool, "PASSWORD_HASH_MAX_PENDING", 0)
+    r = _login(email)
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+
+
+def _token(email: str) -> dict:
+    assert _signup(email).status_code == 201
+    r = _login(email)
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def test_current_user_is_cached_between_requests():
+    """Repeat requests with the same token skip the users lookup."""
+    from sqlalchemy import event
+
+    headers = _token(f"cached_{int(time.time() * 1000)}@test.com")
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        before = metrics.get_metrics()["counters"].get("auth_user_cache_hits", 0)
+        r = client.get("/api/auth/me", headers=headers)
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
+
+    assert r.status_code == 200
+    assert not [s for s in statements if "FROM users" in s]
+    assert metrics.get_metrics()["counters"]["auth_user_cache_hits"] == before + 1
+    assert 0 < metrics.get_metrics()["gauges"]["auth_user_cache_hit_rate"] <= 1
+
+
+def test_deactivated_user_is_rejected_despite_cache():
+    """Deactivating a user invalidates the cached entry."""
+    from app.repositories.user_repo import set_user_active
+
+    email = f"deactivated_{int(time.time() * 1000)}@test.com"
+    headers = _token(email)
+    r = client.get("/api/auth/me", headers=headers)
+    assert r.status_code == 200
+
+    with database.SessionLocal() as db:
+        assert set_user_active(db, r.json()["id"], False)
+
+    r = client.get("/api/auth/me", headers=headers)
+    assert r.status_code == 401
+    assert r.json()["detail"] == "User is inactive"
+
+
+def test_expired_token_payload_is_not_cached():
+    """Token payloads are cached only until the token expires."""
+    from app.auth_cache import cache_token_payload, get_cached_token_payload
+
+    cache_token_payload("expired", {"sub": "1", "exp": int(time.time()) - 1})
+    assert get_cached_token_payload("expired") is None
@@ -0,0 +1,135 @@
+"""Test the threadpool / connection-pool capacity plan."""
+
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import anyio.to_thread
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+
+from app import capacity, database
+from app.exporter import iter_notes_ndjson
+from app.main import app
+from app.metrics import metrics
+from app.models.user import User
+from app.repositories.note_repo import create_notes_bulk
+
+client = TestClient(app)
+
+
+def test_threadpool_matches_pool_connections(monkeypatch):
+    """Tokens = pool size + overflow, minus connections reserved elsewhere."""
+    monkeypatch.setattr(capacity, "DB_POOL_SIZE", 5)
+    monkeypatch.setattr(capacity, "DB_MAX_OVERFLOW", 10)
+    monkeypatch.setattr(capacity, "THREADPOOL_TOKENS", None)
+    monkeypatch.setenv("WEB_CONCURRENCY", "2")
+
+    plan = capacity.plan_capacity()
+    assert plan.threadpool_tokens == 15
+    assert plan.total_db_connections == 30
+    assert capacity.plan_capacity(reserved_db_connections=3).threadpool_tokens == 12
+
+    monkeypatch.setattr(capacity, "THREADPOOL_TOKENS", "8")
+    assert capacity.plan_capacity().threadpool_tokens == 8
+
+
+def test_password_hash_workers_share_cpus_between_api_workers(monkeypatch):
+    """Hash processes across all API workers add up to the CPUs, at least 1 each."""
+    monkeypatch.setattr(capacity, "PASSWORD_HASH_WORKERS", None)
+    monkeypatch.setattr(capacity, "available_cpus", lambda: 8)
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    assert capacity.plan_capacity().password_hash_workers == 2
+    monkeypatch.setenv("WEB_CONCURRENCY", "16")
+    assert capacity.plan_capacity().password_hash_workers == 1
+
+    monkeypatch.setattr(capacity, "PASSWORD_HASH_WORKERS", "0")
+    assert capacity.plan_capacity().password_hash_workers == 0
+
+
+def test_lifespan_applies_and_reports_plan(caplog):
+    """The running loop's limiter is resized and the envelope is exported."""
+    caplog.set_level(logging.INFO, logger="app.capacity")
+    with TestClient(app) as live:
+        tokens = live.portal.call(
+            lambda: anyio.to_thread.current_default_thread_limiter().total_tokens
+        )
+        envelope = live.get("/api/version").json()["capacity"]
+
+    expected = capacity.plan_capacity()
+    assert tokens == expected.threadpool_tokens
+    assert envelope == expected.as_dict()
+    gauges = metrics.get_metrics()["gauges"]
+    assert gauges["capacity_threadpool_tokens"] == expected.threadpool_tokens
+    assert f"password_hash_workers={expected.password_hash_workers}" in caplog.text
+
+
+def test_no_checkout_timeouts_at_configured_concurrency(monkeypatch):
+    """8x more concurrent requests than connections: they queue for threads."""
+    email = f"capacity_{uuid.uuid4().hex[:8]}@example.com"
+    r = client.post("/api/customers", json={"name": "Capacity", "email": email})
+    customer_id = r.json()["id"]
+
+    # A 3-connection pool over slow queries that gives up on checkout quickly
+    small = create_engine(
+        database.DATABASE_URL,
+        pool_size=2,
+        max_overflow=1,
+        pool_timeout=0.2,
+        connect_args={"check_same_thread": False},
+    )
+    event.listen(small, "before_cursor_execute", lambda *args: time.sleep(0.02))
+    monkeypatch.setitem(database.SessionLocal.kw, "bind", small)
+    monkeypatch.setattr(capacity, "DB_POOL_SIZE", 2)
+    monkeypatch.setattr(capacity, "DB_MAX_OVERFLOW", 1)
+
+    # Distinct limits: no response-cache hits or coalescing
+    paths = [f"/api/customers/{customer_id}/notes?limit={n}" for n in range(1, 25)]
+    try:
+        with TestClient(app) as live, ThreadPoolExecutor(len(paths)) as pool:
+            statuses = list(pool.map(lambda p: live.get(p).status_code, paths))
+    finally:
+        small.dispose()
+
+    assert statuses == [200] * len(paths)
+
+
+def test_concurrent_exports_hold_no_connection_between_chunks(monkeypatch):
+    """Twice as many slow-client exports as connections all run to the end."""
+    email = f"capacity_{uuid.uuid4().hex[:8]}@example.com"
+    customer_id = client.post(
+        "/api/customers", json={"name": "Export", "email": email}
+    ).json()["id"]
+    with database.SessionLocal() as db:
+        user = User(email=email, password_hash="x")
+        db.add(user)
+        db.commit()
+        items = [{"customer_id": customer_id, "content": f"n{i}"} for i in range(9)]
+        create_notes_bulk(db, user.id, items)
+
+    small = create_engine(
+        database.DATABASE_URL,
+        pool_size=2,
+        max_overflow=1,
+        pool_timeout=0.2,
+        connect_args={"check_same_thread": False},
+    )
+    monkeypatch.setitem(database.SessionLocal.kw, "bind", small)
+
+    # Interleave chunks as six clients reading in lockstep would
+    exports = [iter_notes_ndjson(customer_id, batch_size=2) for _ in range(6)]
+    lines = [0] * len(exports)
+    try:
+        while exports:
+            for i, export in enumerate(list(exports)):
+                chunk = next(export, None)
+                if chunk is None:
+                    exports.remove(export)
+                    continue
+                lines[i] += chunk.count(b"\n")
+                assert small.pool.checkedout() == 0
+    finally:
+        small.dispose()
+
+    assert lines == [9] * 6
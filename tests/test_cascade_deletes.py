@@ -211,3 +211,169 @@ def test_notes_remain_when_other_customer_deleted():
 
     # Cleanup
     client.delete(f"/api/customers/{customer2_id}")
+
+
+def test_async_customer_delete_purges_notes_in_batches(monkeypatch):
+    """mode=async hides the customer at once and deletes notes in batches."""
+    import time
+    from app import customer_purge
+    from app.worker import Worker
+
+    monkeypatch.setattr(customer_purge, "PURGE_BATCH_SIZE", 2)
+    monkeypatch.setattr(customer_purge, "PURGE_PAUSE_SECONDS", 0)
+    timestamp = int(time.time() * 1000)
+
+    user_payload = {
+        "email": f"asyncdelete_{timestamp}@test.com",
+        "password": "password123",
+    }
+    client.post("/api/auth/signup", json=user_payload)
+    r = client.post(
+        "/api/auth/login",
+        data={"username": user_payload["email"], "password": user_payload["password"]},
+    )
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    customer_payload = {
+        "name": "Async Delete",
+        "email": f"asyncdeletecust_{timestamp}@test.com",
+    }
+    r = client.post("/api/customers", json=customer_payload)
+    customer_id = r.json()["id"]
+    items = [{"customer_id": customer_id, "content": f"Note {i}"} for i in range(5)]
+    r = client.post("/api/notes/bulk", json={"items": items}, headers=headers)
+    assert r.status_code == 201
+
+    r = client.delete(f"/api/customers/{customer_id}?mode=async")
+    assert r.status_code == 202
+    assert r.json()["customer_id"] == customer_id
+    assert r.json()["notes_total"] == 5
+    assert r.json()["status"] == "pending"
+
+    # The purge runs as a queued job
+    assert Worker().run_pending() == 1
+    r = client.get(f"/api/customers/{customer_id}/deletion")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["status"] == "done"
+    assert data["notes_deleted"] == data["notes_total"] == 5
+
+    assert client.get(f"/api/customers/{customer_id}").status_code == 404
+    assert client.get(f"/api/customers/{customer_id}/notes").status_code == 404
+
+
+def test_customer_being_deleted_is_hidden_and_email_reserved():
+    """A pending async delete hides the customer and blocks reuse of its email."""
+    import time
+    from app import database
+    from app.repositories.customer_deletion_repo import request_customer_deletion
+
+    timestamp = int(time.time() * 1000)
+    customer_payload = {
+        "name": "Pending Delete",
+        "email": f"pendingdelete_{timestamp}@test.com",
+    }
+    r = client.post("/api/customers", json=customer_payload)
+    customer_id = r.json()["id"]
+
+    # Request the delete without running the purge job
+    with database.SessionLocal() as db:
+        deletion = request_customer_deletion(db, customer_id)
+        assert deletion.status == "pending"
+
+    assert client.get(f"/api/customers/{customer_id}").status_code == 404
+    r = client.get("/api/customers")
+    assert customer_id not in [c["id"] for c in r.json()["items"]]
+
+    r = client.post("/api/customers", json=customer_payload)
+    assert r.status_code == 409
+
+    # A second async request reports the existing record
+    r = client.delete(f"/api/customers/{customer_id}?mode=async")
+    assert r.status_code == 202
+    assert r.json()["status"] == "pending"
+
+
+def test_customer_being_deleted_rejects_new_notes():
+    """Single-note create agrees with bulk create: the customer is gone."""
+    import time
+    from app import database
+    from app.repositories.customer_deletion_repo import request_customer_deletion
+
+    timestamp = int(time.time() * 1000)
+    user_payload = {
+        "email": f"pendingnotes_{timestamp}@test.com",
+        "password": "password123",
+    }
+    client.post("/api/auth/signup", json=user_payload)
+    r = client.post(
+        "/api/auth/login",
+        data={"username": user_payload["email"], "password": user_payload["password"]},
+    )
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    r = client.post(
+        "/api/customers",
+        json={"name": "Pending", "email": f"pendingnotescust_{timestamp}@test.com"},
+    )
+    customer_id = r.json()["id"]
+    with database.SessionLocal() as db:
+        request_customer_deletion(db, customer_id)
+
+    r = client.post(
+        f"/api/customers/{customer_id}/notes",
+        json={"content": "Too late"},
+        headers=headers,
+    )
+    assert r.status_code == 404
+    assert r.json()["detail"] == "Customer not found"
+
+    r = client.post(
+        "/api/notes/bulk",
+        json={"items": [{"customer_id": customer_id, "content": "Too late"}]},
+        headers=headers,
+    )
+    assert r.json()["errors"][0]["detail"] == "Customer not found"
+
+
+def test_notes_of_customer_being_deleted_are_hidden():
+    """Pending delete: the customer's notes 404 on read, update and delete."""
+    import time
+    from app import database
+    from app.repositories.customer_deletion_repo import request_customer_deletion
+
+    timestamp = int(time.time() * 1000)
+    user_payload = {
+        "email": f"pendinghidden_{timestamp}@test.com",
+        "password": "password123",
+    }
+    client.post("/api/auth/signup", json=user_payload)
+    r = client.post(
+        "/api/auth/login",
+        data={"username": user_payload["email"], "password": user_payload["password"]},
+    )
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    r = client.post(
+        "/api/customers",
+        json={"name": "Pending", "email": f"pendinghiddencust_{timestamp}@test.com"},
+    )
+    customer_id = r.json()["id"]
+    r = client.post(
+        f"/api/customers/{customer_id}/notes",
+        json={"content": "Soon gone"},
+        headers=headers,
+    )
+    note_id = r.json()["id"]
+    # Cached before the delete request
+    assert client.get(f"/api/notes/{note_id}").status_code == 200
+
+    with database.SessionLocal() as db:
+        request_customer_deletion(db, customer_id)
+
+    assert client.get(f"/api/notes/{note_id}").status_code == 404
+    assert client.get(f"/api/notes/{note_id}?fields=id").status_code == 404
+    r = client.put(f"/api/notes/{note_id}", json={"content": "Edited"}, headers=headers)
+    assert r.status_code == 404
+    r = client.delete(f"/api/notes/{note_id}", headers=headers)
+    assert r.status_code == 404
@@ -0,0 +1,75 @@
+"""Test ETag / Last-Modified conditional GETs on customers and note lists."""
+
+import time
+
+from app.response_cache import clear_response_cache
+
+
+def test_customer_etag_and_last_modified(client, customer_id):
+    """A customer GET revalidates to 304 until the customer changes."""
+    url = f"/api/customers/{customer_id}"
+
+    r = client.get(url)
+    assert r.status_code == 200
+    etag = r.headers["ETag"]
+    last_modified = r.headers["Last-Modified"]
+    assert etag.startswith('"') and last_modified.endswith("GMT")
+
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["ETag"] == etag
+
+    r = client.get(url, headers={"If-Modified-Since": last_modified})
+    assert r.status_code == 304
+
+    r = client.patch(url, json={"email": f"etagnew_{time.time_ns()}@test.com"})
+    assert r.status_code == 200
+
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+
+
+def test_note_list_etag_changes_with_notes(client, auth_headers, customer_id):
+    """The note list ETag tracks inserts, updates, deletes and query params."""
+    headers = auth_headers
+    url = f"/api/customers/{customer_id}/notes"
+
+    note_id = client.post(url, json={"content": "first"}, headers=headers).json()["id"]
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    # Different parameters are a different representation
+    other = client.get(f"{url}?limit=5")
+    assert other.headers["ETag"] != etag
+
+    seen = {etag}
+    client.post(url, json={"content": "second"}, headers=headers)
+    seen.add(client.get(url).headers["ETag"])
+    client.put(f"/api/notes/{note_id}", json={"content": "edited"}, headers=headers)
+    seen.add(client.get(url).headers["ETag"])
+    client.delete(f"/api/notes/{note_id}", headers=headers)
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    seen.add(r.headers["ETag"])
+    assert len(seen) == 4
+
+
+def test_unchanged_note_list_skips_page_query(
+    client, auth_headers, customer_id, sql_statements
+):
+    """A matching If-None-Match answers 304 before the page is read."""
+    url = f"/api/customers/{customer_id}/notes"
+    client.post(url, json={"content": "cached"}, headers=auth_headers)
+    etag = client.get(url).headers["ETag"]
+    # Exercise revalidation itself, not a response cache hit
+    clear_response_cache()
+
+    with sql_statements() as statements:
+        r = client.get(url, headers={"If-None-Match": f'W/{etag}, "other"'})
+
+    assert r.status_code == 304
+    # Customer lookup + count/max(updated_at); no SELECT of note content
+    assert len(statements) == 2
+    assert not any("notes.content" in s for s in statements)
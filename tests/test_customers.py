@@ -14,7 +14,7 @@ def test_customers_crud_flow(client):
     # 2) list (should contain our user)
     r = client.get("/api/customers")
     assert r.status_code == 200
-    rows = r.json()
+    rows = r.json()["items"]
     assert any(row["id"] == cid for row in rows)
 
     # 3) get one
@@ -36,3 +36,106 @@ def test_customers_crud_flow(client):
     # 6) verify gone
     r = client.get(f"/api/customers/{cid}")
     assert r.status_code == 404
+
+
+def test_customers_keyset_pagination_and_filters(client):
+    created = []
+    for i in range(5):
+        r = client.post(
+            "/api/customers",
+            json={"name": f"Keyset {i}", "email": f"keyset{i}@example.com"},
+        )
+        assert r.status_code == 201
+        created.append(r.json()["id"])
+    r = client.post(
+        "/api/customers", json={"name": "Other_Name", "email": "other@example.com"}
+    )
+    other_id = r.json()["id"]
+
+    # Walk all pages with the cursor
+    seen = []
+    cursor = None
+    while True:
+        url = "/api/customers?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        r = client.get(url)
+        assert r.status_code == 200
+        page = r.json()
+        assert page["limit"] == 2
+        assert len(page["items"]) <= 2
+        seen += [row["id"] for row in page["items"]]
+        if not page["has_more"]:
+            assert page["next_cursor"] is None
+            break
+        cursor = page["next_cursor"]
+    assert seen == sorted(seen)
+    assert set(created + [other_id]) <= set(seen)
+
+    # Case-insensitive prefix filters
+    r = client.get("/api/customers?name=keyset")
+    assert [row["id"] for row in r.json()["items"]] == created
+    r = client.get("/api/customers?email=KEYSET3")
+    assert [row["id"] for row in r.json()["items"]] == [created[3]]
+
+    # LIKE wildcards in the prefix are matched literally
+    r = client.get("/api/customers?name=other_")
+    assert [row["id"] for row in r.json()["items"]] == [other_id]
+    r = client.get("/api/customers?name=%25")
+    assert r.json()["items"] == []
+
+    r = client.get("/api/customers?cursor=not-a-cursor")
+    assert r.status_code == 400
+
+
+def test_create_customer_duplicate_email_returns_existing(client):
+    from sqlalchemy import event
+    from app.database import engine
+
+    payload = {"name": "Upsert User", "email": "upsert.user@example.com"}
+    r = client.post("/api/customers", json=payload)
+    assert r.status_code == 201
+    cid = r.json()["id"]
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        r = client.post(
+            "/api/customers", json={"name": "Someone Else", "email": payload["email"]}
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert r.status_code == 201
+    assert r.json() == {"id": cid, "name": "Upsert User", "email": payload["email"]}
+    assert len(statements) == 1
+
+
+def test_bulk_upsert_customers(client):
+    r = client.post(
+        "/api/customers", json={"name": "Before", "email": "bulk0@example.com"}
+    )
+    existing_id = r.json()["id"]
+
+    items = [{"name": f"Bulk {i}", "email": f"bulk{i}@example.com"} for i in range(50)]
+    items.append({"name": "Bulk 1 again", "email": "bulk1@example.com"})
+    r = client.post("/api/customers/bulk", json={"items": items})
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["count"] == 50
+    assert [row["email"] for row in data["items"]] == [
+        f"bulk{i}@example.com" for i in range(50)
+    ]
+    assert data["items"][0] == {
+        "id": existing_id,
+        "name": "Bulk 0",
+        "email": "bulk0@example.com",
+    }
+    assert data["items"][1]["name"] == "Bulk 1 again"
+
+    r = client.get(f"/api/customers/{existing_id}")
+    assert r.json()["name"] == "Bulk 0"
+
+    r = client.post("/api/customers/bulk", json={"items": []})
+    assert r.status_code == 422
@@ -0,0 +1,143 @@
+"""Test streaming bulk import of customers and notes."""
+
+import io
+import json
+
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def _login(prefix: str) -> dict:
+    """Register a fresh user and return auth headers."""
+    import time
+
+    timestamp = int(time.time() * 1000)
+    user_payload = {
+        "email": f"{prefix}_{timestamp}@test.com",
+        "password": "password123",
+    }
+    r = client.post("/api/auth/signup", json=user_payload)
+    assert r.status_code == 201
+
+    r = client.post(
+        "/api/auth/login",
+        data={"username": user_payload["email"], "password": user_payload["password"]},
+    )
+    assert r.status_code == 200
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def test_import_requires_auth():
+    """Importing requires authentication."""
+    files = {"file": ("c.csv", b"name,email\n", "text/csv")}
+    r = client.post("/api/import/customers", files=files)
+    assert r.status_code == 401
+
+
+def test_import_customers_csv_upserts_by_email():
+    """CSV customers are upserted by email in chunks and bad rows reported."""
+    headers = _login("importuser1")
+
+    r = client.post(
+        "/api/customers", json={"name": "Old Name", "email": "imp0@example.com"}
+    )
+    existing_id = r.json()["id"]
+
+    lines = ["name,email", "New Name,imp0@example.com", "Broken,not-an-email"]
+    lines += [f"Imported {i},imp{i}@example.com" for i in range(1, 6)]
+    body = ("\n".join(lines) + "\n").encode()
+
+    r = client.post(
+        "/api/import/customers?chunk_size=2",
+        files={"file": ("customers.csv", body, "text/csv")},
+        headers=headers,
+    )
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["processed"] == 7
+    assert data["imported"] == 6
+    assert data["error_count"] == 1
+    assert data["errors"][0]["line"] == 3
+    assert "email" in data["errors"][0]["detail"]
+
+    r = client.get(f"/api/customers/{existing_id}")
+    assert r.json()["name"] == "New Name"
+    r = client.get("/api/customers?email=imp")
+    emails = {c["email"] for c in r.json()["items"]}
+    assert {f"imp{i}@example.com" for i in range(6)} <= emails
+
+
+def test_import_customers_skips_customers_being_deleted():
+    """Emails of customers being deleted are row errors, not imported rows."""
+    from app import database
+    from app.repositories.customer_deletion_repo import request_customer_deletion
+
+    headers = _login("importuser4")
+    r = client.post(
+        "/api/customers", json={"name": "Leaving", "email": "impgone@example.com"}
+    )
+    customer_id = r.json()["id"]
+    with database.SessionLocal() as db:
+        request_customer_deletion(db, customer_id)
+
+    body = b"name,email\nBack,impgone@example.com\nFresh,impfresh@example.com\n"
+    r = client.post(
+        "/api/import/customers",
+        files={"file": ("customers.csv", body, "text/csv")},
+        headers=headers,
+    )
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["processed"] == 2
+    assert data["imported"] == 1
+    assert data["errors"] == [
+        {"line": 2, "detail": "Customer impgone@example.com is being deleted"}
+    ]
+
+
+def test_import_notes_ndjson():
+    """NDJSON notes are imported for the current user; bad lines reported."""
+    import time
+
+    timestamp = int(time.time() * 1000)
+    headers = _login("importuser2")
+
+    r = client.post(
+        "/api/customers",
+        json={"name": "Import Notes", "email": f"impnotes_{timestamp}@test.com"},
+    )
+    customer_id = r.json()["id"]
+
+    rows = [
+        json.dumps({"customer_id": customer_id, "content": f"n{i}"}) for i in range(4)
+    ]
+    rows.insert(1, "{not json")
+    rows.insert(3, json.dumps({"customer_id": 999999, "content": "ghost"}))
+    body = io.BytesIO(("\n".join(rows) + "\n").encode())
+
+    r = client.post(
+        "/api/import/notes",
+        files={"file": ("notes.ndjson", body, "application/x-ndjson")},
+        headers=headers,
+    )
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["processed"] == 6
+    assert data["imported"] == 4
+    assert sorted(e["line"] for e in data["errors"]) == [2, 4]
+
+    r = client.get(f"/api/customers/{customer_id}/notes")
+    assert r.json()["total"] == 4
+
+
+def test_import_rejects_unknown_format():
+    """Files whose format cannot be detected are rejected."""
+    headers = _login("importuser3")
+    r = client.post(
+        "/api/import/customers",
+        files={"file": ("customers.txt", b"name,email\n", "text/plain")},
+        headers=headers,
+    )
+    assert r.status_code == 400
@@ -0,0 +1,44 @@
+"""Test that importing the app stays fast and skips modules it does not need."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Seconds for `import app.main` in a fresh interpreter (best of three runs)
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "2.0"))
+
+# Only needed once a password is hashed or the hash pool starts
+LAZY_MODULES = ["passlib", "multiprocessing", "concurrent.futures.process"]
+
+_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [m for m in {LAZY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def _probe() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=Path(__file__).resolve().parents[1],
+        env=dict(os.environ, TESTING="true"),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(out)
+
+
+def test_import_app_main_within_budget():
+    """`import app.main` stays under budget and leaves heavy modules unloaded."""
+    runs = [_probe() for _ in range(3)]
+    assert runs[0]["loaded"] == []
+    best = min(run["seconds"] for run in runs)
+    assert best < IMPORT_BUDGET_SECONDS, f"import app.main took {best:.2f}s"
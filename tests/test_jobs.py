@@ -0,0 +1,167 @@
+"""Test the background job queue and worker."""
+
+import threading
+from datetime import datetime, timezone
+
+from app import database
+from app.jobs import JOB_TYPES, JobType
+from app.models.job import Job
+from app.repositories.job_repo import (
+    claim_jobs,
+    complete_job,
+    enqueue_job,
+    fail_job,
+    requeue_stale_jobs,
+)
+from app.worker import Worker
+
+
+def _register(monkeypatch, name, handler, concurrency=1, backoff=0.0):
+    monkeypatch.setitem(JOB_TYPES, name, JobType(name, handler, concurrency, backoff))
+
+
+def _enqueue(job_type, payload=None, max_attempts=None) -> int:
+    with database.SessionLocal() as db:
+        return enqueue_job(db, job_type, payload, max_attempts=max_attempts).id
+
+
+def _job(job_id) -> Job:
+    with database.SessionLocal() as db:
+        return db.get(Job, job_id)
+
+
+def test_job_runs_with_payload(monkeypatch):
+    """A queued job is claimed, run with its payload and marked done."""
+    seen = []
+    _register(monkeypatch, "test_echo", seen.append)
+    job_id = _enqueue("test_echo", {"value": 42})
+
+    assert Worker().run_pending() == 1
+    assert seen == [{"value": 42}]
+    job = _job(job_id)
+    assert job.status == "done"
+    assert job.attempts == 1
+    assert job.finished_at is not None
+
+
+def test_failed_job_is_retried_until_it_succeeds(monkeypatch):
+    """Failures re-queue the job until it succeeds within max_attempts."""
+    calls = []
+
+    def flaky(payload):
+        calls.append(payload)
+        if len(calls) < 3:
+            raise RuntimeError(f"boom {len(calls)}")
+
+    _register(monkeypatch, "test_flaky", flaky)
+    job_id = _enqueue("test_flaky", max_attempts=3)
+
+    Worker().run_pending()
+    job = _job(job_id)
+    assert len(calls) == 3
+    assert job.status == "done"
+    assert job.attempts == 3
+    assert job.last_error == "boom 2"
+
+
+def test_job_fails_after_max_attempts(monkeypatch):
+    """A job that keeps failing ends up failed with its last error."""
+
+    def broken(payload):
+        raise ValueError("always")
+
+    _register(monkeypatch, "test_broken", broken)
+    job_id = _enqueue("test_broken", max_attempts=2)
+
+    assert Worker().run_pending() == 2
+    job = _job(job_id)
+    assert job.status == "failed"
+    assert job.attempts == 2
+    assert job.last_error == "always"
+
+
+def test_job_that_keeps_losing_its_lease_fails(monkeypatch):
+    """A job whose worker dies every time is failed once out of attempts."""
+    _register(monkeypatch, "test_crashing", lambda payload: None)
+    job_id = _enqueue("test_crashing", max_attempts=2)
+
+    with database.SessionLocal() as db:
+        # Each claim stands in for a worker that crashes mid-job
+        assert [job.id for job in claim_jobs(db, "test_crashing", 1, "w1")] == [job_id]
+        assert requeue_stale_jobs(db, timeout=-1) == (1, 0)
+        assert [job.id for job in claim_jobs(db, "test_crashing", 1, "w2")] == [job_id]
+        assert requeue_stale_jobs(db, timeout=-1) == (0, 1)
+        assert claim_jobs(db, "test_crashing", 1, "w3") == []
+
+    job = _job(job_id)
+    assert job.status == "failed"
+    assert job.attempts == 2
+    assert job.last_error == "Worker lease expired"
+    assert job.locked_by is None
+
+
+def test_finishing_after_lease_loss_leaves_new_owner_alone():
+    """A worker whose job was re-queued and re-claimed cannot finish it."""
+    job_id = _enqueue("test_lease")
+
+    with database.SessionLocal() as db:
+        (stale,) = claim_jobs(db, "test_lease", 1, "w1")
+        assert requeue_stale_jobs(db, timeout=-1) == (1, 0)
+        (current,) = claim_jobs(db, "test_lease", 1, "w2")
+
+        assert complete_job(db, stale) is False
+        assert fail_job(db, stale, "late", backoff_base=0.0) is None
+        job = _job(job_id)
+        assert (job.status, job.locked_by, job.last_error) == ("running", "w2", None)
+
+        assert complete_job(db, current) is True
+    assert _job(job_id).status == "done"
+
+
+def test_retry_waits_for_backoff(monkeypatch):
+    """A retried job is not runnable again until its backoff has passed."""
+    calls = []
+
+    def failing(payload):
+        calls.append(payload)
+        raise RuntimeError("later")
+
+    _register(monkeypatch, "test_backoff", failing, backoff=60.0)
+    job_id = _enqueue("test_backoff")
+
+    assert Worker().run_pending() == 1
+    job = _job(job_id)
+    assert job.status == "queued"
+    run_at = job.run_at.replace(tzinfo=job.run_at.tzinfo or timezone.utc)
+    assert (run_at - datetime.now(timezone.utc)).total_seconds() > 50
+    assert Worker().run_pending() == 0
+    assert len(calls) == 1
+
+
+def test_worker_respects_concurrency_limit(monkeypatch):
+    """A worker runs at most `concurrency` jobs of a type at once."""
+    release = threading.Event()
+    started = threading.Semaphore(0)
+
+    def blocking(payload):
+        started.release()
+        release.wait(10)
+
+    _register(monkeypatch, "test_blocking", blocking, concurrency=2)
+    job_ids = [_enqueue("test_blocking") for _ in range(3)]
+
+    worker = Worker()
+    try:
+        assert worker.poll_once() == 2
+        assert started.acquire(timeout=5) and started.acquire(timeout=5)
+        # Both slots are busy: nothing more is claimed
+        assert worker.poll_once() == 0
+        statuses = sorted(_job(job_id).status for job_id in job_ids)
+        assert statuses == ["queued", "running", "running"]
+    finally:
+        release.set()
+        worker.wait_idle()
+
+    assert worker.poll_once() == 1
+    worker.wait_idle()
+    assert [_job(job_id).status for job_id in job_ids] == ["done"] * 3
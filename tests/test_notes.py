@@ -241,3 +241,74 @@ def test_multiple_notes_ordering():
     for note_id in note_ids:
         client.delete(f"/api/notes/{note_id}", headers=headers)
     client.delete(f"/api/customers/{customer_id}")
+
+
+def test_note_writes_are_single_statement():
+    """Note create and owner update/delete each issue exactly one statement."""
+    import time
+    from sqlalchemy import event
+    from app.database import engine
+
+    timestamp = int(time.time() * 1000)
+
+    user_payload = {
+        "email": f"noteuser6_{timestamp}@test.com",
+        "password": "password123",
+    }
+    r = client.post("/api/auth/signup", json=user_payload)
+    assert r.status_code == 201
+    r = client.post(
+        "/api/auth/login",
+        data={"username": user_payload["email"], "password": user_payload["password"]},
+    )
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    r = client.post(
+        "/api/customers",
+        json={"name": "Single Statement", "email": f"singlestmt_{timestamp}@test.com"},
+    )
+    customer_id = r.json()["id"]
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "notes" in statement or "customers" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        r = client.post(
+            f"/api/customers/{customer_id}/notes",
+            json={"content": "before"},
+            headers=headers,
+        )
+        assert r.status_code == 201
+        note = r.json()
+        assert note["created_at"] and note["updated_at"]
+        assert len(statements) == 1
+        assert statements[0].lstrip().upper().startswith("INSERT")
+
+        statements.clear()
+        r = client.put(
+            f"/api/notes/{note['id']}", json={"content": "after"}, headers=headers
+        )
+        assert r.status_code == 200
+        assert r.json()["content"] == "after"
+        assert r.json()["created_at"] == note["created_at"]
+        assert r.json()["updated_at"] >= note["updated_at"]
+        assert len(statements) == 1
+        assert statements[0].lstrip().upper().startswith("UPDATE")
+
+        statements.clear()
+        r = client.delete(f"/api/notes/{note['id']}", headers=headers)
+        assert r.status_code == 204
+        assert len(statements) == 1
+        assert statements[0].lstrip().upper().startswith("DELETE")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    # A second delete misses and reports not found
+    r = client.delete(f"/api/notes/{note['id']}", headers=headers)
+    assert r.status_code == 404
+
+    client.delete(f"/api/customers/{customer_id}")
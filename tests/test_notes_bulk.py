@@ -0,0 +1,105 @@
+"""Test bulk note creation endpoint."""
+
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def _login(prefix: str) -> dict:
+    """Register a fresh user and return auth headers."""
+    import time
+
+    timestamp = int(time.time() * 1000)
+    user_payload = {
+        "email": f"{prefix}_{timestamp}@test.com",
+        "password": "password123",
+    }
+    r = client.post("/api/auth/signup", json=user_payload)
+    assert r.status_code == 201
+
+    r = client.post(
+        "/api/auth/login",
+        data={"username": user_payload["email"], "password": user_payload["password"]},
+    )
+    assert r.status_code == 200
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def test_bulk_create_requires_auth():
+    """Bulk note creation requires authentication."""
+    r = client.post(
+        "/api/notes/bulk", json={"items": [{"customer_id": 1, "content": "x"}]}
+    )
+    assert r.status_code == 401
+
+
+def test_bulk_create_notes_multiple_customers():
+    """Notes for several customers are created in one request, in order."""
+    import time
+
+    timestamp = int(time.time() * 1000)
+    headers = _login("bulkuser1")
+
+    customer_ids = []
+    for i in range(2):
+        r = client.post(
+            "/api/customers",
+            json={"name": f"Bulk {i}", "email": f"bulkcust{i}_{timestamp}@test.com"},
+        )
+        assert r.status_code == 201
+        customer_ids.append(r.json()["id"])
+
+    items = [
+        {"customer_id": customer_ids[i % 2], "content": f"Bulk note {i}"}
+        for i in range(10)
+    ]
+    r = client.post("/api/notes/bulk", json={"items": items}, headers=headers)
+    assert r.status_code == 201, r.text
+    data = r.json()
+    assert data["errors"] == []
+    assert len(data["created"]) == 10
+    assert [n["content"] for n in data["created"]] == [i["content"] for i in items]
+    assert [n["customer_id"] for n in data["created"]] == [
+        i["customer_id"] for i in items
+    ]
+    assert all(n["created_at"] and n["updated_at"] for n in data["created"])
+
+    # Notes are visible through the regular list endpoint
+    r = client.get(f"/api/customers/{customer_ids[0]}/notes")
+    assert r.status_code == 200
+    assert r.json()["total"] == 5
+
+
+def test_bulk_create_reports_missing_customers():
+    """Items for unknown customers are reported without failing the batch."""
+    import time
+
+    timestamp = int(time.time() * 1000)
+    headers = _login("bulkuser2")
+
+    r = client.post(
+        "/api/customers",
+        json={"name": "Bulk Partial", "email": f"bulkpartial_{timestamp}@test.com"},
+    )
+    customer_id = r.json()["id"]
+
+    items = [
+        {"customer_id": customer_id, "content": "ok 1"},
+        {"customer_id": 999999, "content": "ghost"},
+        {"customer_id": customer_id, "content": "ok 2"},
+    ]
+    r = client.post("/api/notes/bulk", json={"items": items}, headers=headers)
+    assert r.status_code == 201
+    data = r.json()
+    assert [n["content"] for n in data["created"]] == ["ok 1", "ok 2"]
+    assert data["errors"] == [
+        {"index": 1, "customer_id": 999999, "detail": "Customer not found"}
+    ]
+
+
+def test_bulk_create_rejects_empty_batch():
+    """An empty batch is a validation error."""
+    headers = _login("bulkuser3")
+    r = client.post("/api/notes/bulk", json={"items": []}, headers=headers)
+    assert r.status_code == 422
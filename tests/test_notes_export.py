@@ -0,0 +1,91 @@
+"""Test streaming NDJSON/CSV export of a customer's notes."""
+
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def _customer_with_notes(prefix: str, count: int) -> int:
+    """Create a user, a customer and ``count`` notes; return the customer id."""
+    import time
+
+    timestamp = int(time.time() * 1000)
+    user_payload = {
+        "email": f"{prefix}_{timestamp}@test.com",
+        "password": "password123",
+    }
+    r = client.post("/api/auth/signup", json=user_payload)
+    assert r.status_code == 201
+    r = client.post(
+        "/api/auth/login",
+        data={"username": user_payload["email"], "password": user_payload["password"]},
+    )
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    r = client.post(
+        "/api/customers",
+        json={"name": "Export Customer", "email": f"{prefix}cust_{timestamp}@test.com"},
+    )
+    customer_id = r.json()["id"]
+
+    items = [
+        {"customer_id": customer_id, "content": f"Export note {i}"}
+        for i in range(count)
+    ]
+    r = client.post("/api/notes/bulk", json={"items": items}, headers=headers)
+    assert r.status_code == 201
+    return customer_id
+
+
+def test_export_notes_ndjson():
+    """NDJSON export streams every note, matching the list endpoint."""
+    customer_id = _customer_with_notes("exportuser1", 25)
+
+    r = client.get(f"/api/customers/{customer_id}/notes/export")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    assert "attachment" in r.headers["content-disposition"]
+
+    exported = [json.loads(line) for line in r.text.splitlines()]
+    assert len(exported) == 25
+
+    listed = client.get(f"/api/customers/{customer_id}/notes?limit=100").json()
+    assert exported == listed["items"]
+
+
+def test_export_notes_csv_with_search():
+    """CSV export has a header row and honours the search filter."""
+    customer_id = _customer_with_notes("exportuser2", 12)
+
+    r = client.get(
+        f"/api/customers/{customer_id}/notes/export?format=csv&search=note 1"
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    # "Export note 1", "Export note 10", "Export note 11"
+    assert sorted(row["content"] for row in rows) == [
+        "Export note 1",
+        "Export note 10",
+        "Export note 11",
+    ]
+    assert set(rows[0]) == {
+        "id",
+        "customer_id",
+        "user_id",
+        "content",
+        "created_at",
+        "updated_at",
+    }
+
+
+def test_export_notes_nonexistent_customer():
+    """Exporting notes for a missing customer returns 404."""
+    r = client.get("/api/customers/999999/notes/export")
+    assert r.status_code == 404
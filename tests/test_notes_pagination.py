@@ -296,3 +296,69 @@ def test_default_pagination_values():
 
     # Cleanup
     client.delete(f"/api/customers/{customer_id}")
+
+
+def test_notes_preview_view():
+    """Preview view returns truncated content computed in SQL."""
+    import time
+
+    timestamp = int(time.time() * 1000)
+
+    user_payload = {
+        "email": f"previewtest_{timestamp}@test.com",
+        "password": "password123",
+    }
+    r = client.post("/api/auth/signup", json=user_payload)
+    assert r.status_code == 201
+    r = client.post(
+        "/api/auth/login",
+        data={"username": user_payload["email"], "password": user_payload["password"]},
+    )
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    r = client.post(
+        "/api/customers",
+        json={"name": "Preview Customer", "email": f"previewcust_{timestamp}@test.com"},
+    )
+    customer_id = r.json()["id"]
+
+    long_content = "x" * 50 + "y" * 50
+    r = client.post(
+        f"/api/customers/{customer_id}/notes",
+        json={"content": long_content},
+        headers=headers,
+    )
+    long_id = r.json()["id"]
+    r = client.post(
+        f"/api/customers/{customer_id}/notes",
+        json={"content": "short"},
+        headers=headers,
+    )
+    assert r.status_code == 201
+
+    # Preview view cuts long content and flags it
+    r = client.get(f"/api/customers/{customer_id}/notes?view=preview&preview_length=50")
+    assert r.status_code == 200
+    items = {item["id"]: item for item in r.json()["items"]}
+    assert items[long_id]["content"] == "x" * 50
+    assert items[long_id]["truncated"] is True
+    short = next(item for item in items.values() if item["id"] != long_id)
+    assert short["content"] == "short"
+    assert short["truncated"] is False
+
+    # Full view (default) is unchanged
+    r = client.get(f"/api/customers/{customer_id}/notes")
+    items = {item["id"]: item for item in r.json()["items"]}
+    assert items[long_id]["content"] == long_content
+    assert items[long_id]["truncated"] is False
+
+    # Single-note read returns the full body
+    r = client.get(f"/api/notes/{long_id}")
+    assert r.status_code == 200
+    assert r.json()["content"] == long_content
+
+    r = client.get("/api/notes/999999")
+    assert r.status_code == 404
+
+    # Cleanup
+    client.delete(f"/api/customers/{customer_id}")
@@ -0,0 +1,85 @@
+"""Query-plan regression tests for repository queries.
+
+Plans are snapshotted in tests/query_plans.json. After an intentional change
+(new query shape or index), regenerate the snapshot with:
+
+    UPDATE_QUERY_PLANS=1 pytest tests/test_query_plans.py
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from app.database import Base, SessionLocal, engine
+from app.query_audit import (
+    ALLOWED_FULL_SCANS,
+    REPOSITORY_QUERIES,
+    UNPRUNED_NOTE_QUERIES,
+    collect_plans,
+    find_redundant_indexes,
+    full_scans,
+    notes_partitions,
+    scanned_relations,
+    unused_indexes,
+)
+
+SNAPSHOT = Path(__file__).with_name("query_plans.json")
+
+
+@pytest.fixture(scope="module")
+def plans():
+    with SessionLocal() as db:
+        return collect_plans(db)
+
+
+def test_every_catalog_query_is_explained(plans):
+    """Every catalogued repository query produced a plan."""
+    assert set(plans) == set(REPOSITORY_QUERIES)
+    assert all(plans.values())
+
+
+def test_no_query_regresses_to_full_scan(plans):
+    """Only explicitly allowed queries may read a whole table."""
+    tables = set(Base.metadata.tables)
+    offenders = {
+        name: full_scans(plan, tables)
+        for name, plan in plans.items()
+        if name not in ALLOWED_FULL_SCANS and full_scans(plan, tables)
+    }
+    assert offenders == {}
+
+
+def test_note_queries_prune_partitions(plans):
+    """On a partitioned notes table, note queries read a single partition."""
+    partitions = notes_partitions(engine)
+    if not partitions:
+        pytest.skip("notes is not partitioned")
+    for name, plan in plans.items():
+        scanned = scanned_relations(plan, partitions)
+        if name in UNPRUNED_NOTE_QUERIES:
+            # Known cost: one index probe per partition
+            assert scanned == partitions, name
+        elif scanned:
+            assert len(scanned) == 1, (name, sorted(scanned))
+
+
+def test_plans_match_snapshot(plans):
+    """Plans match the committed snapshot for this dialect."""
+    dialect = engine.dialect.name
+    snapshot = json.loads(SNAPSHOT.read_text()) if SNAPSHOT.exists() else {}
+
+    if os.getenv("UPDATE_QUERY_PLANS") == "1":
+        snapshot[dialect] = plans
+        SNAPSHOT.write_text(json.dumps(snapshot, indent=2, sort_keys=True) + "\n")
+
+    if dialect not in snapshot:
+        pytest.skip(f"No plan snapshot recorded for {dialect}")
+    assert plans == snapshot[dialect]
+
+
+def test_no_redundant_or_unused_indexes(plans):
+    """Every declared index is needed and used by some repository query."""
+    assert find_redundant_indexes(engine) == []
+    assert unused_indexes(engine, plans) == []
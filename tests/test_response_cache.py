@@ -0,0 +1,127 @@
+"""Test the in-process response cache and its write-through invalidation."""
+
+import os
+import subprocess
+import sys
+import time
+
+from app.metrics import metrics
+from app.response_cache import ResponseCache, _Entry
+
+
+def test_cache_hit_skips_database(client, auth_headers, customer_id, sql_statements):
+    """A repeated GET is served from memory, including its validators."""
+    url = f"/api/customers/{customer_id}/notes"
+    client.post(url, json={"content": "hello"}, headers=auth_headers)
+
+    first = client.get(url, params={"limit": 10})
+    hits = metrics.get_metrics()["counters"].get("response_cache_hits", 0)
+
+    with sql_statements() as statements:
+        second = client.get(url, params={"limit": 10})
+    assert statements == []
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert metrics.get_metrics()["counters"]["response_cache_hits"] == hits + 1
+
+    with sql_statements() as statements:
+        r = client.get(
+            url, params={"limit": 10}, headers={"If-None-Match": first.headers["ETag"]}
+        )
+    assert statements == []
+    assert r.status_code == 304
+
+    # Different query parameters are a different entry
+    r = client.get(url, params={"limit": 5})
+    assert r.status_code == 200
+
+
+def test_note_writes_invalidate_lists_and_notes(client, auth_headers, customer_id):
+    """Creating, editing and deleting a note are visible on the next GET."""
+    headers = auth_headers
+    url = f"/api/customers/{customer_id}/notes"
+    note_id = client.post(url, json={"content": "v1"}, headers=headers).json()["id"]
+
+    assert client.get(url).json()["total"] == 1
+    assert client.get(f"/api/notes/{note_id}").json()["content"] == "v1"
+
+    client.post(url, json={"content": "second"}, headers=headers)
+    assert client.get(url).json()["total"] == 2
+
+    client.put(f"/api/notes/{note_id}", json={"content": "v2"}, headers=headers)
+    assert client.get(f"/api/notes/{note_id}").json()["content"] == "v2"
+    assert "v2" in [n["content"] for n in client.get(url).json()["items"]]
+
+    client.delete(f"/api/notes/{note_id}", headers=headers)
+    assert client.get(f"/api/notes/{note_id}").status_code == 404
+    assert client.get(url).json()["total"] == 1
+
+
+def test_customer_writes_invalidate(client, auth_headers, customer_id):
+    """Email changes and deletes drop the customer, its list and its notes."""
+    headers = auth_headers
+    url = f"/api/customers/{customer_id}"
+    note_id = client.post(
+        f"{url}/notes", json={"content": "n"}, headers=headers
+    ).json()["id"]
+
+    assert client.get(url).status_code == 200
+    client.get("/api/customers")
+    client.get(f"/api/notes/{note_id}")
+
+    new_email = f"rcachenew_{time.time_ns()}@test.com"
+    client.patch(url, json={"email": new_email})
+    assert client.get(url).json()["email"] == new_email
+    assert new_email in [
+        c["email"] for c in client.get("/api/customers").json()["items"]
+    ]
+
+    assert client.delete(url).status_code == 204
+    assert client.get(url).status_code == 404
+    assert client.get(f"{url}/notes").status_code == 404
+    assert client.get(f"/api/notes/{note_id}").status_code == 404
+    assert customer_id not in [
+        c["id"] for c in client.get("/api/customers").json()["items"]
+    ]
+
+
+def test_data_layer_does_not_import_the_response_cache():
+    """Repositories fire change hooks; only the API connects the cache to them."""
+    code = (
+        "import sys, app.worker, app.importer\n"
+        "from app.repositories import customer_repo, customer_deletion_repo,"
+        " import_repo, note_repo\n"
+        "assert 'app.response_cache' not in sys.modules\n"
+        "customer_repo.change_hooks.customer_changed(1)\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code],
+        env=dict(os.environ, TESTING="true"),
+        check=True,
+    )
+
+
+def test_eviction_by_bytes_and_ttl():
+    """The cache evicts least recently used entries and expires old ones."""
+
+    def entry(size: int, ttl: float = 60) -> _Entry:
+        return _Entry(b"x" * size, {}, None, None, ("t",), time.monotonic() + ttl, size)
+
+    cache = ResponseCache(max_bytes=250, ttl=60)
+    cache.put("a", entry(100), cache.generation)
+    cache.put("b", entry(100), cache.generation)
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.put("c", entry(100), cache.generation)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+    cache.put("d", entry(10, ttl=-1), cache.generation)
+    assert cache.get("d") is None
+
+    # A store that raced an invalidation is dropped
+    generation = cache.generation
+    cache.invalidate("t")
+    cache.put("e", entry(10), generation)
+    assert cache.get("e") is None
+    assert cache.get("a") is None
@@ -0,0 +1,70 @@
+"""Test that the fast serializers match response_model validation."""
+
+import json
+from datetime import datetime
+
+from app.database import SessionLocal
+from app.models.customer import Customer
+from app.models.note import Note
+from app.repositories.customer_repo import get_customers
+from app.schemas.customer import CustomerListResponse, CustomerOut
+from app.schemas.note import NoteListResponse, NoteOut
+from app.serializers import (
+    CUSTOMER_LIST,
+    CUSTOMER_OUT,
+    NOTE_LIST,
+    NOTE_OUT,
+    as_dict,
+)
+
+
+def _seed(db) -> tuple[Customer, Note]:
+    from app.models.user import User
+
+    user = User(email="serializer@test.com", password_hash="x")
+    customer = Customer(name="Serializer", email="serializer-cust@test.com")
+    db.add_all([user, customer])
+    db.flush()
+    note = Note(customer_id=customer.id, user_id=user.id, content='héllo "json"')
+    db.add(note)
+    db.commit()
+    return customer, note
+
+
+def test_note_serializers_match_models():
+    """Rows and entities dump to the same JSON as validated models."""
+    with SessionLocal() as db:
+        _, note = _seed(db)
+        assert isinstance(note.created_at, datetime)
+        expected = NoteOut.model_validate(note).model_dump_json()
+        assert json.loads(NOTE_OUT.dump_json(as_dict(NoteOut, note))) == json.loads(
+            expected
+        )
+
+        from app.repositories.note_repo import get_notes_by_customer
+
+        for preview in (None, 3):
+            rows = get_notes_by_customer(db, note.customer_id, preview_length=preview)
+            meta = {"total": 1, "limit": 10, "offset": 0, "has_more": False}
+            validated = NoteListResponse(items=rows, **meta).model_dump_json()
+            fast = NOTE_LIST.dump_json(
+                dict(items=[as_dict(NoteOut, r) for r in rows], **meta)
+            )
+            assert json.loads(fast) == json.loads(validated)
+
+
+def test_customer_serializers_match_models():
+    """Customer rows and entities dump to the same JSON as validated models."""
+    with SessionLocal() as db:
+        customer, _ = _seed(db)
+        expected = CustomerOut.model_validate(customer).model_dump_json()
+        fast = CUSTOMER_OUT.dump_json(as_dict(CustomerOut, customer))
+        assert json.loads(fast) == json.loads(expected)
+
+        rows = get_customers(db)
+        meta = {"limit": 10, "next_cursor": None, "has_more": False}
+        validated = CustomerListResponse(items=rows, **meta).model_dump_json()
+        fast = CUSTOMER_LIST.dump_json(
+            dict(items=[as_dict(CustomerOut, r) for r in rows], **meta)
+        )
+        assert json.loads(fast) == json.loads(validated)
@@ -0,0 +1,29 @@
+"""Test the production launcher's worker sizing and listening socket."""
+
+import socket
+
+from app import capacity, server
+
+
+def test_workers_follow_cgroup_quota(monkeypatch):
+    """The CPU quota caps the worker count; WEB_CONCURRENCY overrides it."""
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    monkeypatch.setattr(capacity.os, "sched_getaffinity", lambda pid: set(range(8)))
+    monkeypatch.setattr(capacity, "_cgroup_cpu_quota", lambda: 1.5)
+    assert capacity.default_workers() == 2
+
+    monkeypatch.setattr(capacity, "_cgroup_cpu_quota", lambda: None)
+    assert capacity.default_workers() == 8
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    assert capacity.default_workers() == 3
+
+
+def test_listening_socket_is_tcp():
+    """Accepted connections must be IPPROTO_TCP so asyncio sets TCP_NODELAY."""
+    sock = server.bind_socket("127.0.0.1", 0, backlog=8)
+    try:
+        assert sock.proto == socket.IPPROTO_TCP
+        assert sock.get_inheritable()
+    finally:
+        sock.close()
@@ -0,0 +1,144 @@
+"""Test coalescing of identical concurrent GET requests."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import anyio.to_thread
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.metrics import metrics
+from app.routers import notes as notes_router
+from app.single_flight import SingleFlight
+
+client = TestClient(app)
+
+
+def _counter(name: str) -> int:
+    return metrics.get_metrics()["counters"].get(name, 0)
+
+
+def test_concurrent_calls_share_one_run():
+    """Callers arriving while a call is in flight get its result."""
+    flight = SingleFlight(wait_timeout=5)
+    runs = []
+
+    async def slow():
+        runs.append(1)
+        await asyncio.sleep(0.1)
+        return "value"
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("k", slow) for _ in range(5)))
+
+    coalesced = _counter("single_flight_coalesced_total")
+    results = asyncio.run(scenario())
+
+    assert len(runs) == 1
+    assert [value for value, _ in results] == ["value"] * 5
+    assert sorted(shared for _, shared in results) == [False] + [True] * 4
+    assert _counter("single_flight_coalesced_total") == coalesced + 4
+
+    # Once finished, the next call runs again
+    async def again():
+        return "again"
+
+    assert asyncio.run(flight.do("k", again)) == ("again", False)
+
+
+def test_wait_is_bounded_and_errors_are_shared():
+    """Followers give up after the timeout; a leader's exception is re-raised."""
+
+    async def value(result, delay=0.0):
+        await asyncio.sleep(delay)
+        return result
+
+    async def bounded():
+        flight = SingleFlight(wait_timeout=0.05)
+        leader = asyncio.create_task(flight.do("k", lambda: value("slow", 0.3)))
+        await asyncio.sleep(0.01)
+        assert await flight.do("k", lambda: value("own")) == ("own", False)
+        assert await leader == ("slow", False)
+
+    asyncio.run(bounded())
+
+    async def fail():
+        await asyncio.sleep(0.1)
+        raise ValueError("boom")
+
+    async def shared_error():
+        flight = SingleFlight(wait_timeout=5)
+        calls = [flight.do("k", fail) for _ in range(3)]
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    errors = asyncio.run(shared_error())
+    assert [str(e) for e in errors] == ["boom"] * 3
+    assert all(isinstance(e, ValueError) for e in errors)
+
+
+def test_identical_requests_run_the_page_query_once(monkeypatch):
+    """Concurrent identical note-list GETs share one set of queries."""
+    timestamp = int(time.time() * 1000)
+    r = client.post(
+        "/api/customers",
+        json={"name": "Flight", "email": f"flight_{timestamp}@test.com"},
+    )
+    url = f"/api/customers/{r.json()['id']}/notes"
+
+    calls = []
+    original = notes_router.get_notes_by_customer
+
+    def slow_page(*args, **kwargs):
+        calls.append(1)
+        time.sleep(0.3)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(notes_router, "get_notes_by_customer", slow_page)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        responses = list(pool.map(lambda _: client.get(url), range(4)))
+
+    assert [r.status_code for r in responses] == [200] * 4
+    assert len({r.headers["ETag"] for r in responses}) == 1
+    assert len(calls) == 1
+
+    # Different parameters are not coalesced
+    calls.clear()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(lambda limit: client.get(url, params={"limit": limit}), (1, 2)))
+    assert len(calls) == 2
+
+
+def test_followers_hold_no_threadpool_token(monkeypatch):
+    """Only the leader runs in the threadpool while identical requests wait."""
+    timestamp = int(time.time() * 1000)
+    r = client.post(
+        "/api/customers",
+        json={"name": "Tokens", "email": f"tokens_{timestamp}@test.com"},
+    )
+    url = f"/api/customers/{r.json()['id']}/notes"
+
+    entered = threading.Event()
+    release = threading.Event()
+    original = notes_router.get_notes_by_customer
+
+    def blocked_page(*args, **kwargs):
+        entered.set()
+        release.wait(5)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(notes_router, "get_notes_by_customer", blocked_page)
+
+    with TestClient(app) as live, ThreadPoolExecutor(max_workers=6) as pool:
+        limiter = live.portal.call(anyio.to_thread.current_default_thread_limiter)
+        futures = [pool.submit(live.get, url) for _ in range(6)]
+        assert entered.wait(5)
+        time.sleep(0.2)
+        borrowed = live.portal.call(lambda: limiter.borrowed_tokens)
+        release.set()
+        statuses = [f.result().status_code for f in futures]
+
+    assert statuses == [200] * 6
+    assert borrowed == 1
@@ -0,0 +1,80 @@
+"""Test ?fields= sparse fieldsets on customer and note reads."""
+
+import pytest
+
+
+@pytest.fixture
+def note_id(client, auth_headers, customer_id) -> int:
+    """Id of a note long enough to be truncated in previews."""
+    r = client.post(
+        f"/api/customers/{customer_id}/notes",
+        json={"content": "a long note body " * 20},
+        headers=auth_headers,
+    )
+    return r.json()["id"]
+
+
+def test_note_list_fields_limit_columns_and_output(
+    client, customer_id, note_id, sql_statements
+):
+    """Only the requested fields are read and returned."""
+    url = f"/api/customers/{customer_id}/notes"
+
+    with sql_statements() as statements:
+        r = client.get(url, params={"fields": "created_at, id"})
+    assert r.status_code == 200
+    item = r.json()["items"][0]
+    assert list(item) == ["id", "created_at"]
+    page_query = statements[-1]
+    assert "notes.content" not in page_query
+    assert "notes.user_id" not in page_query
+
+    # Different fieldsets are different representations
+    full = client.get(url)
+    assert full.headers["ETag"] != r.headers["ETag"]
+    assert "content" in full.json()["items"][0]
+
+
+def test_note_list_preview_fields(client, customer_id, note_id):
+    """Preview view honours fields, including the computed truncated flag."""
+    url = f"/api/customers/{customer_id}/notes"
+
+    r = client.get(
+        url, params={"view": "preview", "preview_length": 5, "fields": "truncated"}
+    )
+    assert r.json()["items"] == [{"truncated": True}]
+
+    r = client.get(url, params={"fields": "id,truncated"})
+    assert r.json()["items"][0]["truncated"] is False
+
+
+def test_detail_fields(client, customer_id, note_id):
+    """Single note and customer reads accept fields too."""
+
+    r = client.get(f"/api/notes/{note_id}", params={"fields": "id,created_at"})
+    assert r.status_code == 200
+    assert list(r.json()) == ["id", "created_at"]
+
+    r = client.get(f"/api/customers/{customer_id}", params={"fields": "name"})
+    assert r.json() == {"name": "Test Customer"}
+    assert (
+        r.headers["ETag"] != client.get(f"/api/customers/{customer_id}").headers["ETag"]
+    )
+
+    r = client.get("/api/customers", params={"fields": "email"})
+    assert r.status_code == 200
+    assert all(list(c) == ["email"] for c in r.json()["items"])
+
+
+def test_unknown_fields_are_rejected(client, customer_id, note_id):
+    """Fields are validated against the response schema."""
+
+    r = client.get(f"/api/notes/{note_id}", params={"fields": "id,password"})
+    assert r.status_code == 400
+    assert "password" in r.json()["detail"]
+
+    r = client.get("/api/customers", params={"fields": "updated_at"})
+    assert r.status_code == 400
+
+    r = client.get(f"/api/customers/{customer_id}/notes", params={"fields": ","})
+    assert r.status_code == 400
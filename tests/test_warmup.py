@@ -0,0 +1,38 @@
+"""Test startup warm-up and the readiness endpoint."""
+
+from fastapi.testclient import TestClient
+
+from app import warmup
+from app.main import app
+from app.metrics import metrics
+
+
+def test_ready_only_while_lifespan_runs(monkeypatch):
+    """/api/ready is 503 until warm-up finishes and again after shutdown."""
+    # Spawning hash processes is covered by the auth tests
+    monkeypatch.setitem(warmup.WARMUP_STEPS, "password_pool", lambda: None)
+    client = TestClient(app)
+    assert client.get("/api/ready").status_code == 503
+
+    with client:
+        r = client.get("/api/ready")
+        assert r.status_code == 200
+        assert r.json() == {"status": "ready"}
+        durations = metrics.get_metrics()["durations"]
+        for step in ("pool", "statements", "serializers", "total"):
+            assert f"warmup_{step}_seconds_avg" in durations
+
+    assert client.get("/api/ready").status_code == 503
+
+
+def test_failed_step_does_not_block_startup(monkeypatch):
+    """A failing warm-up step is skipped; the worker still becomes ready."""
+
+    def broken():
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(
+        warmup, "WARMUP_STEPS", {"pool": broken, "serializers": lambda: None}
+    )
+    with TestClient(app) as client:
+        assert client.get("/api/ready").status_code == 200